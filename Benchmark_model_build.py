@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Build-time benchmark of the NLP initialization model
+
+Times the build of the NLP initialization model (no solver is needed) on the data of Example 1 and
+Example 2 and on a synthetic 30 x 30 problem, and compares the stream data lookups made by the constraint
+rules done through pandas .at calls with the precompiled StreamData dictionaries.
+
+The build is timed with the library next to this script. To time another revision, copy this script into
+a checkout of that revision (e.g. git worktree add ../baseline <revision>) and run it there. The lookup
+comparison is skipped for revisions without StreamData.
+
+@author: mchlshort
+"""
+from __future__ import division
+from pyomo.environ import *
+import pandas as pd
+import numpy as np
+import os
+import inspect
+import time
+from library.MENS_MINLP import *
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+dataDirectory = os.path.abspath(
+    os.path.join( os.path.dirname(os.path.abspath(inspect.getfile(
+        inspect.currentframe() ) ) ),'example_data'))
+
+nrich = 30
+nlean = 30
+stages = 30
+repeats = 3
+
+#synthetic streams with the same ranges as Example 1
+rng = np.random.RandomState(0)
+rich_Cin = rng.uniform(0.02, 0.08, nrich)
+Rich_data = pd.DataFrame({'Cin': rich_Cin, 'Cout': rich_Cin*rng.uniform(0.001, 0.05, nrich), 'F': rng.uniform(0.1, 1.0, nrich)},
+                         index = ['R' + str(i+1) for i in range(nrich)])
+lean_Cin = rng.uniform(0.00001, 0.001, nlean)
+Lean_data = pd.DataFrame({'Cin': lean_Cin, 'Cout': lean_Cin + rng.uniform(0.01, 0.05, nlean), 'F': rng.uniform(0.5, 2.0, nlean)},
+                         index = ['L' + str(j+1) for j in range(nlean)])
+problem_parameters = read_stream_data(os.path.join(dataDirectory, 'problem_parameters.csv'))
+props = []
+for i in Rich_data.index:
+    props.append(('RHOG', i, 1.2))
+    props.append(('visRich', i, 1.8e-5))
+for j in Lean_data.index:
+    props.append(('RHOL', j, 900.0))
+    props.append(('aci', j, 117360.0))
+    props.append(('surften', j, 0.07))
+    props.append(('vis', j, 0.001))
+stream_properties = pd.DataFrame({'stream': [p[1] for p in props], 'value': [p[2] for p in props]}, index = [p[0] for p in props])
+
+indices = [(i, j, k) for i in Rich_data.index for j in Lean_data.index for k in range(1, stages + 2)]
+
+def pandas_lookups():
+    for i, j, k in indices:
+        c = Rich_data.at[i,'F']*(Rich_data.at[i,'Cin'] - Rich_data.at[i,'Cout'])
+        d = Lean_data.at[j,'Cout'] - Lean_data.at[j,'Cin']
+        c = Rich_data.at[i,'Cin'] - Lean_data.at[j,'Cin']
+
+def dict_lookups(streams):
+    for i, j, k in indices:
+        c = streams.rich_load[i]
+        d = streams.lean_dC[j]
+        c = streams.rich_Cin[i] - streams.lean_Cin[j]
+
+def build_time(rich, lean, parameters, properties, stages, superstruct):
+    """Best time of building the NLP initialization model over the repeats.
+    """
+    times = []
+    for r in range(repeats):
+        start = time.perf_counter()
+        mens = MENS(rich, lean, parameters, properties, stages = stages, superstruct = superstruct)
+        #the build method was called _build_NLP_model before the NLP and MINLP shared it
+        build = getattr(mens, '_build_model', None) or getattr(mens, '_build_NLP_model')
+        build()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+example_files = {'Example1': ('Rich_Ex_1.csv', 'Lean_Ex_1.csv', 'problem_parameters.csv', 'stream_properties.csv'),
+                 'Example2': ('Rich_Ex_2.csv', 'Lean_Ex_2.csv', 'problem_parameters2.csv', 'stream_properties2.csv')}
+cases = []
+for name, ex_stages in [('Example1', 3), ('Example2', 2)]:
+    data = [read_stream_data(os.path.join(dataDirectory, f)) for f in example_files[name]]
+    for superstruct in ['SBS', 'SWS']:
+        cases.append((name + ' ' + superstruct, (data[0], data[1], data[2], data[3], ex_stages, superstruct)))
+cases.append(('Synthetic ' + str(nrich) + 'x' + str(nlean) + 'x' + str(stages + 1) + ' SWS',
+              (Rich_data, Lean_data, problem_parameters, stream_properties, stages, 'SWS')))
+
+timings = []
+for name, args in cases:
+    try:
+        timings.append((name, "%.4f s (best of %d)" % (build_time(*args), repeats)))
+    except Exception as e:
+        #older revisions may not build some cases with the installed Pyomo
+        timings.append((name, "failed: " + type(e).__name__))
+for name, result in timings:
+    print("NLP initialization model build, %-26s %s" % (name + ":", result))
+
+if 'StreamData' in globals():
+    start = time.perf_counter()
+    streams = StreamData(Rich_data, Lean_data)
+    t_compile = time.perf_counter() - start
+    t_pandas = []
+    t_dict = []
+    for r in range(repeats):
+        start = time.perf_counter()
+        pandas_lookups()
+        t_pandas.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        dict_lookups(streams)
+        t_dict.append(time.perf_counter() - start)
+    print("Synthetic problem: ", nrich, " rich x ", nlean, " lean x ", stages + 1, " stages = ", len(indices), " (i,j,k)")
+    print("StreamData compilation:          %.4f s" % t_compile)
+    print("Rule lookups with pandas .at:     %.4f s (best of %d)" % (min(t_pandas), repeats))
+    print("Rule lookups with StreamData:     %.4f s (best of %d)" % (min(t_dict), repeats))
+    print("Speed-up of the lookups:          %.1fx" % (min(t_pandas)/min(t_dict)))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Comparison of the fixed and adaptive correction factor filters on the bundled examples
+
+Runs Example 1 and Example 2 with the same settings as Example1.py and Example2.py, once with the
+fixed filter band and once with the adaptive band, and records the number of iterations, the best
+real TAC and the wall-clock time of each run in cor_filter_comparison.csv.
+
+The comparison needs GAMS with DICOPT and CONOPT. Without GAMS, bonmin fails on the root relaxation of
+the Example 1 MINLP. Some exchanger NLPs of Example 2 have one redundant equality, which CONOPT accepts
+and ipopt rejects as having too few degrees of freedom. There are no results for the adaptive filter yet.
+
+@author: mchlshort
+"""
+from __future__ import division
+from pyomo.environ import *
+import pandas as pd
+import os
+import inspect
+import time
+import sys
+from library.HybridStrategy import *
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+dataDirectory = os.path.abspath(
+    os.path.join( os.path.dirname(os.path.abspath(inspect.getfile(
+        inspect.currentframe() ) ) ),'example_data'))
+
+# data files and run_hybrid_strategy settings of the bundled examples
+examples = dict()
+examples['Example1'] = {'files': ('Rich_Ex_1.csv', 'Lean_Ex_1.csv', 'problem_parameters.csv', 'stream_properties.csv'),
+                        'settings': dict(cor_filter_size=0.05, max_iter=50, tol = 0.000001, non_iso = True, stages = 3, superstruct = 'SBS', bin_cuts = False)}
+examples['Example2'] = {'files': ('Rich_Ex_2.csv', 'Lean_Ex_2.csv', 'problem_parameters2.csv', 'stream_properties2.csv'),
+                        'settings': dict(cor_filter_size=0.05, max_iter=100, tol = 0.01, stages = 2, bin_cuts = True)}
+
+console = sys.stdout
+comparison = dict()
+for example_name, example in examples.items():
+    filenameR, filenameL, filenameP, filenameSP = [os.path.join(dataDirectory, f) for f in example['files']]
+    Rich_data = read_stream_data(filenameR)
+    Lean_data = read_stream_data(filenameL)
+    problem_parameters = read_stream_data(filenameP)
+    stream_properties = read_stream_data(filenameSP)
+    for cor_filter in ['fixed', 'adaptive']:
+        run_name = example_name + '_' + cor_filter
+        sys.stdout = open(run_name + '.txt', 'w')
+        start = time.perf_counter()
+        run = HybridStrategy()
+        run.run_hybrid_strategy(rich_data=Rich_data, lean_data=Lean_data, correction_factors = None, parameter_data=problem_parameters,
+                                stream_properties = stream_properties, exname = run_name, cor_filter = cor_filter, verbosity = 'quiet',
+                                **example['settings'])
+        ex_time = time.perf_counter() - start
+        sys.stdout.close()
+        sys.stdout = console
+        comparison[run_name] = {'example': example_name, 'cor_filter': cor_filter, 'iterations': run.iter_count + 1,
+                                'best_iteration': run.best_net_iter, 'best_TAC': run.best_objective_real, 'time': ex_time}
+        print(run_name, comparison[run_name])
+
+write_to_csv('cor_filter_comparison.csv', comparison)
+print(pd.DataFrame.from_dict(comparison, orient="index"))
@@ -34,7 +34,7 @@ __status__ = "Development"
 example_name = 'Example1'
 
 # These do not need to be changed
-start = time.clock()   
+start = time.perf_counter()   
     
 sys.stdout = open(example_name+'.txt','w')
 
@@ -67,7 +67,7 @@ Example1 = HybridStrategy()
 Example1.run_hybrid_strategy(cor_filter_size=0.05, max_iter=50,rich_data=Rich_data,lean_data=Lean_data, correction_factors = None, parameter_data=problem_parameters,\
                              stream_properties = stream_properties, exname = example_name, tol = 0.000001, non_iso = True, stages = stages, superstruct = ss, bin_cuts = False)
 
-stop = time.clock()
+stop = time.perf_counter()
 ex_time = stop - start 
 
 print("Total time: ", ex_time )
@@ -31,7 +31,7 @@ __maintainer__ =  "Michael Short"
 __email__ = "m.short@surrey.ac.uk"
 __status__ = "Development"
 
-start = time.clock()    
+start = time.perf_counter()    
 
 # This is the name that will be displayed in any of the outputs 
 example_name = 'Example2'
@@ -59,7 +59,7 @@ Example1 = HybridStrategy()
 
 Example1.run_hybrid_strategy(cor_filter_size=0.05, max_iter=100,rich_data=Rich_data,lean_data=Lean_data, correction_factors = None, parameter_data=problem_parameters, \
                              stream_properties = stream_properties, exname = example_name, tol = 0.01, stages = 2, bin_cuts = True)
-stop = time.clock()
+stop = time.perf_counter()
 ex_time = stop - start 
 
 print("Total time: ", ex_time )
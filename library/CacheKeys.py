@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Helpers for the keys of the in-run caches (DesignCache and TopologyCache).
+
+@author: mchlshort
+"""
+from __future__ import division
+from math import log10
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+def round_to_tolerance(x, rel_tol):
+    """Rounds a number to a bin of relative width rel_tol.
+
+    The bins are spaced geometrically, the bin of x being the nearest integer to log10(|x|)/log10(1 + rel_tol), so
+    values in the same bin agree to within about rel_tol and the bins do not depend on the decade of x (0.99999 and
+    1.00001 share a bin). Values that agree to within rel_tol can still fall on either side of a bin edge, so two
+    equal keys mean close values but close values do not always give equal keys.
+
+    Args:
+        x (float): value to be rounded
+        rel_tol (float): relative tolerance of the rounding
+
+    returns:
+        tuple: (sign, bin) pair that identifies the rounded value, (0, 0) for zero
+    """
+    x = float(x)
+    if x == 0:
+        return (0, 0)
+    sign = 1 if x > 0 else -1
+    return (sign, int(round(log10(abs(x))/log10(1 + rel_tol))))
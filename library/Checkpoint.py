@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Checkpointing of the HybridStrategy iterations.
+
+The state of the hybrid strategy (corrections, cut pool, best solution and logs) is written
+to a JSON file after each iteration so that a long run can be resumed. Only numeric values are
+stored, no Pyomo models are pickled.
+
+The history of the correction acceleration and the bands of the adaptive filter are stored, so
+that a resumed run continues the same correction updates. The warm starts, the design and
+topology caches, the last designs of the incremental mode and the exchangers still running in
+the asynchronous mode are not stored: they are rebuilt from the iterations after the resume.
+
+@author: mchlshort
+"""
+from __future__ import division
+import json
+import os
+import numpy
+from pyomo.environ import value
+from library.MassExchanger import *
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+#attributes of HybridStrategy that are written to the checkpoint
+checkpoint_attributes = ["iter_count", "corrections", "binary_cuts", "symmetry_cuts", "best_objective_real",
+                         "best_objective_MINLP", "best_net_iter", "MENval_log", "NLP_log", "diff_NLP_MINLP_log",
+                         "correction_log", "solution_log", "MINLP_TAC_log", "exchanger_log", "capcost_log_MINLP",
+                         "capcost_log_nlp", "failed_exchanger", "utility_cost", "acceleration_log", "reuse_log",
+                         "filter_bands", "cor_directions", "filter_band_log", "_cor_history"]
+
+def _encode(obj):
+    """Converts the state to JSON compatible objects. Dictionaries are stored as lists of key/value pairs
+    so that tuple keys are kept, and NumPy arrays as lists of floats.
+    """
+    if isinstance(obj, numpy.ndarray):
+        return {"__array__": [float(v) for v in obj.ravel()], "shape": list(obj.shape)}
+    elif isinstance(obj, dict):
+        return {"__dict__": [[_encode(k), _encode(v)] for k, v in obj.items()]}
+    elif isinstance(obj, tuple):
+        return {"__tuple__": [_encode(v) for v in obj]}
+    elif isinstance(obj, list):
+        return [_encode(v) for v in obj]
+    elif obj is None or isinstance(obj, (bool, str)):
+        return obj
+    elif isinstance(obj, int) and not isinstance(obj, bool):
+        return obj
+    else:
+        return float(value(obj))
+
+def _decode(obj):
+    """Inverse of _encode
+    """
+    if isinstance(obj, dict):
+        if "__dict__" in obj:
+            return dict((_decode(k), _decode(v)) for k, v in obj["__dict__"])
+        elif "__tuple__" in obj:
+            return tuple(_decode(v) for v in obj["__tuple__"])
+        elif "__array__" in obj:
+            return numpy.array(obj["__array__"], dtype = float).reshape(obj["shape"])
+    elif isinstance(obj, list):
+        return [_decode(v) for v in obj]
+    return obj
+
+def _encode_exchanger(ex):
+    """Stores the numeric design of an exchanger (model or ExchangerResult)
+    """
+    if ex is None:
+        return None
+    return {"success": bool(ex.success), "AF": float(value(ex.AF)), "koga": float(value(ex.koga)),
+            "diameter": float(value(ex.diameter)), "height": float(value(ex.height)),
+            "PackCost": float(value(ex.PackCost)), "SpecAreaPacking": float(value(ex.SpecAreaPacking)),
+            "nfe": getattr(ex, "nfe", None), "status": getattr(ex, "status", None),
+            "termination": getattr(ex, "termination", None)}
+
+def save_checkpoint(filename, strategy):
+    """Writes the state of the hybrid strategy to a JSON file.
+
+    The file is first written to a temporary file and then moved, so that a crash during the write
+    does not destroy the previous checkpoint.
+
+    Args:
+        filename (str): name of the checkpoint file
+        strategy (HybridStrategy): the hybrid strategy object being run
+
+    returns:
+        None
+    """
+    state = dict()
+    for name in checkpoint_attributes:
+        state[name] = _encode(getattr(strategy, name))
+    exchangers = dict()
+    for m in strategy.best_exchangers:
+        exchangers[m] = _encode_exchanger(strategy.best_exchangers[m])
+    state["best_exchangers"] = _encode(exchangers)
+    tmp = filename + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, filename)
+
+def load_checkpoint(filename, strategy):
+    """Restores the state of the hybrid strategy from a checkpoint file written by save_checkpoint.
+
+    The best exchangers are restored as ExchangerResult records. The best MINLP network is not stored
+    and is set to None.
+
+    Args:
+        filename (str): name of the checkpoint file
+        strategy (HybridStrategy): the hybrid strategy object to restore
+
+    returns:
+        int: the iteration number stored in the checkpoint
+    """
+    if not os.path.isfile(filename):
+        raise RuntimeError("Checkpoint file " + str(filename) + " does not exist")
+    with open(filename, "r") as f:
+        state = json.load(f)
+    for name in checkpoint_attributes:
+        #checkpoints written before an attribute was added keep its initial value
+        if name in state:
+            setattr(strategy, name, _decode(state[name]))
+    exchangers = dict()
+    for m, ex in _decode(state["best_exchangers"]).items():
+        if ex is None:
+            exchangers[m] = None
+        else:
+            exchangers[m] = ExchangerResult(**ex)
+    strategy.best_exchangers = exchangers
+    strategy.best_network_MINLP = None
+    return strategy.iter_count
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+In-run memoization of the detailed mass exchanger designs for the hybrid strategy.
+
+The MINLP often returns the same match with the same (or very nearly the same) boundary
+conditions in successive iterations. The designs are stored here so that those exchangers
+do not have to be rebuilt and re-solved.
+
+@author: mchlshort
+"""
+from __future__ import division
+from collections import OrderedDict
+from library.CacheKeys import round_to_tolerance
+from library.MassExchanger import *
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+class ExchangerDesignCache(object):
+    def __init__(self, rel_tol = 1e-4, max_size = 256):
+        """Least recently used cache of solved exchanger designs keyed on the match boundary conditions.
+
+        Args:
+            rel_tol (float, optional): relative tolerance used to round the concentrations and flows in the key.
+                                        Two matches whose values round to the same bins share a design, see
+                                        round_to_tolerance.
+                                        Default is 1e-4
+            max_size (int, optional): maximum number of designs kept. The least recently used design is
+                                        removed when the cache is full. Default is 256
+
+        """
+        if not isinstance(rel_tol, (int, float)) or rel_tol <= 0:
+            raise RuntimeError("rel_tol must be a positive number")
+        if not isinstance(max_size, int) or max_size < 1:
+            raise RuntimeError("max_size must be a positive integer")
+        self.rel_tol = rel_tol
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._designs = OrderedDict()
+
+    def make_key(self, match_spec):
+        """Builds the cache key for a match.
+
+        Only the correction-independent initializations are used, as the corrections do not enter the
+        exchanger design itself.
+
+        Args:
+            match_spec (dict): numeric specification of the match (see design_exchanger in HybridStrategy)
+
+        returns:
+            tuple: hashable key
+        """
+        i = match_spec['i']
+        j = match_spec['j']
+        inits = match_spec['me_inits']
+        values = [match_spec['rich_in_side'][i], match_spec['rich_in_side'][j],
+                  match_spec['rich_out_side'][i], match_spec['rich_out_side'][j],
+                  match_spec['flowrates'][i], match_spec['flowrates'][j],
+                  inits["kw"], inits["surfarea"], inits["diameter"], inits["packcost"]]
+        return (i, j) + tuple(round_to_tolerance(x, self.rel_tol) for x in values)
+
+    def get(self, match_spec):
+        """Returns the stored design for the match, or None if it has not been solved yet.
+
+        Args:
+            match_spec (dict): numeric specification of the match
+
+        returns:
+            ExchangerResult or None
+        """
+        key = self.make_key(match_spec)
+        if key in self._designs:
+            self._designs.move_to_end(key)
+            self.hits += 1
+            return self._designs[key]
+        self.misses += 1
+        return None
+
+    def put(self, match_spec, design):
+        """Stores a successfully solved design.
+
+        Args:
+            match_spec (dict): numeric specification of the match
+            design (Pyomo model or ExchangerResult): the solved exchanger
+
+        returns:
+            None
+        """
+        if design is None or design.success != True:
+            return
+        if not isinstance(design, ExchangerResult):
+            design = ExchangerResult.from_model(design)
+        key = self.make_key(match_spec)
+        self._designs[key] = design
+        self._designs.move_to_end(key)
+        while len(self._designs) > self.max_size:
+            self._designs.popitem(last = False)
+
+    def __len__(self):
+        return len(self._designs)
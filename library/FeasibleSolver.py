@@ -25,6 +25,55 @@ import os
 import inspect
 import numpy as np
 import sys
+import time
+
+#wall-clock deadline (time.time()) shared by all the solves, None when there is no deadline.
+#It is set by the time budget of the HybridStrategy so that no solve runs past the end of the budget.
+_solver_deadline = None
+
+def set_solver_deadline(deadline):
+    """Sets the wall-clock deadline used to cap the solver time limits.
+    
+    Args:
+        deadline (float): time.time() value at which all solves should stop, None to remove the deadline
+        
+    returns:
+        None
+    """
+    global _solver_deadline
+    _solver_deadline = deadline
+
+def solver_time_remaining():
+    """Returns the number of seconds left before the deadline, or None if no deadline is set
+    """
+    if _solver_deadline == None:
+        return None
+    return max(0, _solver_deadline - time.time())
+
+def _time_limit(limit):
+    """Caps the time limit of a solve by the time remaining before the deadline (at least one second)
+    
+    Args:
+        limit (float): time limit of the solve without a deadline
+        
+    returns:
+        float: time limit to pass to the solver
+    """
+    remaining = solver_time_remaining()
+    if remaining == None:
+        return limit
+    return max(min(limit, remaining), 1)
+
+def _gams_time_options():
+    """GAMS options limiting the solve to the time remaining before the deadline
+    
+    returns:
+        list: lines added to the GAMS input file, empty if no deadline is set
+    """
+    remaining = solver_time_remaining()
+    if remaining == None:
+        return []
+    return ['option reslim=%d;' % max(int(remaining), 1)]
 
 #should possibly include more solvers, solver options and user options to choose exe location and solver
 def solve_until_feas_NLP(m):
@@ -49,13 +98,13 @@ def solve_until_feas_NLP(m):
         solver=SolverFactory('gams')
         options={}
         m1 = m
-        results = solver.solve(m1,tee=False, solver = 'conopt')
+        results = solver.solve(m1,tee=False, solver = 'conopt', add_options = _gams_time_options())
     except:
         print("CONOPT assumed unsuccessful... IPOPT it is")
         solver= SolverFactory('ipopt')
         options={}
         try:
-            options['max_cpu_time'] = 1e+04
+            options['max_cpu_time'] = _time_limit(1e+04)
             results = solver.solve(m,tee=False, options=options)
             #m.load(results)
 
@@ -64,7 +113,7 @@ def solve_until_feas_NLP(m):
             elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                 print("First solve was infeasible")
                 options1 = {}
-                options1['max_cpu_time'] = 1e+03
+                options1['max_cpu_time'] = _time_limit(1e+03)
                 options1['mu_strategy'] = 'adaptive'
                 results = solver.solve(m,tee=False, options=options1)
                 if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -72,7 +121,7 @@ def solve_until_feas_NLP(m):
                 elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                     print("Second solve was infeasible")
                     options2 = {}
-                    options2['max_cpu_time'] = 1e+03
+                    options2['max_cpu_time'] = _time_limit(1e+03)
                     options2['linear_solver'] = 'ma57'
                     #CAN STILL ADD MORE OPTIONS SPECIFICALLY WITH ANOTHER LINEAR SOLVER
                     results = solver.solve(m,tee=False, options=options2) 
@@ -82,7 +131,7 @@ def solve_until_feas_NLP(m):
                         print("Second solve was infeasible")
                         options3 = {}
                         options3['mu_init'] = 1e-6
-                        options3['max_cpu_time'] = 1e+03
+                        options3['max_cpu_time'] = _time_limit(1e+03)
                         options3['bound_push'] =1e-6
                         results = solver.solve(m,tee=False, options=options3)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -118,7 +167,7 @@ def solve_until_feas_NLP(m):
                     print("Second solve was infeasible")
                     options2 = {}
                     options2['mu_init'] = 1e-6
-                    options2['max_cpu_time'] = 1e+03
+                    options2['max_cpu_time'] = _time_limit(1e+03)
                     options2['linear_solver'] = 'ma57'
                     #options['bound_push'] =1e-5
                     results = solver.solve(m,tee=False, options=options2) 
@@ -129,7 +178,7 @@ def solve_until_feas_NLP(m):
                         options3 = {}
                         options3['mu_init'] = 1e-6
                         options3['bound_push'] =1e-6
-                        options3['max_cpu_time'] = 1e+03
+                        options3['max_cpu_time'] = _time_limit(1e+03)
                         results = solver.solve(m,tee=False, options=options3)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                             print("successfully solved")
@@ -155,15 +204,15 @@ def solve_until_feas_NLP(m):
                     options4 = {}
                     options4['mu_init'] = 1e-6
                     options4['bound_push'] =1e-6
-                    options4['max_cpu_time'] = 1e+04
-                    results = solver.solve(m,tee=False, options=options3)
+                    options4['max_cpu_time'] = _time_limit(1e+04)
+                    results = solver.solve(m,tee=False, options=options4)
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                         print("successfully solved")
                     elif (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):
                         print("Second solve was infeasible")
                         options4 = {}
                         options4['mu_init'] = 1e-6
-                        options4['max_cpu_time'] = 1e+03
+                        options4['max_cpu_time'] = _time_limit(1e+03)
                         options4['linear_solver'] = 'ma57'
                         #options['bound_push'] =1e-5
                         results = solver.solve(m,tee=False, options=options4) 
@@ -173,7 +222,7 @@ def solve_until_feas_NLP(m):
                             print("Second solve was infeasible")
                             options4 = {}
                             options4['mu_init'] = 1e-5
-                            options4['max_cpu_time'] = 1e+03
+                            options4['max_cpu_time'] = _time_limit(1e+03)
                             options4['bound_push'] =1e-5
                             results = solver.solve(m,tee=False, options=options4)
                             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -199,7 +248,7 @@ def solve_until_feas_NLP(m):
                         print("Something failed again again during the solve")
                         options4 = {}
                         options4['mu_init'] = 1e-5
-                        options4['max_cpu_time'] =1e4
+                        options4['max_cpu_time'] =_time_limit(1e4)
                         options4['linear_solver'] = 'ma57'
                         results = solver.solve(m,tee=False, options=options4)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -228,7 +277,7 @@ def solve_until_feas_NLP(m):
                 print("First solve was infeasible")
                 options1 = {}
                 options1['mu_strategy'] = 'adaptive'
-                options1['max_cpu_time'] = 1e+03
+                options1['max_cpu_time'] = _time_limit(1e+03)
                 results = solver.solve(m,tee=False, options=options1)
                 if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                     print("successfully solved")
@@ -237,7 +286,7 @@ def solve_until_feas_NLP(m):
                     options2 = {}
                     options2['mu_init'] = 1e-6
                     options2['linear_solver'] = 'ma57'
-                    options2['max_cpu_time'] = 1e+03
+                    options2['max_cpu_time'] = _time_limit(1e+03)
                     #CAN STILL ADD MORE OPTIONS SPECIFICALLY WITH ANOTHER LINEAR SOLVER
                     results = solver.solve(m,tee=False, options=options2) 
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -248,7 +297,7 @@ def solve_until_feas_NLP(m):
                         options3['mu_init'] = 1e-6
                         options3['bound_push'] =1e-6
                         options3['linear_solver'] = 'ma57'
-                        options3['max_cpu_time'] = 1e+03
+                        options3['max_cpu_time'] = _time_limit(1e+03)
                         results = solver.solve(m,tee=False, options=options3)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                             print("successfully solved")
@@ -284,7 +333,7 @@ def solve_until_feas_NLP(m):
                     options2 = {}
                     options2['mu_init'] = 1e-6
                     options2['linear_solver'] = 'ma57'
-                    options2['max_cpu_time'] = 1e+03
+                    options2['max_cpu_time'] = _time_limit(1e+03)
                     
                     #options['bound_push'] =1e-5
                     results = solver.solve(m,tee=False, options=options2) 
@@ -295,7 +344,7 @@ def solve_until_feas_NLP(m):
                         options3 = {}
                         options3['mu_init'] = 1e-6
                         options3['bound_push'] =1e-6
-                        options3['max_cpu_time'] = 1e+03
+                        options3['max_cpu_time'] = _time_limit(1e+03)
                         results = solver.solve(m,tee=False, options=options3)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                             print("successfully solved")
@@ -321,7 +370,7 @@ def solve_until_feas_NLP(m):
                     options4 = {}
                     options4['mu_init'] = 1e-6
                     options4['bound_push'] =1e-6
-                    options4['max_cpu_time'] = 1e+03
+                    options4['max_cpu_time'] = _time_limit(1e+03)
                     results = solver.solve(m,tee=False, options=options4)
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                         print("successfully solved")
@@ -329,7 +378,7 @@ def solve_until_feas_NLP(m):
                         print("Second solve was infeasible")
                         options4 = {}
                         options4['mu_init'] = 1e-6
-                        options3['max_cpu_time'] = 1e+03
+                        options4['max_cpu_time'] = _time_limit(1e+03)
                         #options['bound_push'] =1e-5
                         results = solver.solve(m,tee=False, options=options4) 
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -339,7 +388,7 @@ def solve_until_feas_NLP(m):
                             options4 = {}
                             options4['mu_init'] = 1e-5
                             options4['bound_push'] =1e-5
-                            options3['max_cpu_time'] = 1e+03
+                            options4['max_cpu_time'] = _time_limit(1e+03)
                             results = solver.solve(m,tee=False, options=options4)
                             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                                 print("successfully solved")
@@ -365,7 +414,7 @@ def solve_until_feas_NLP(m):
                         options4 = {}
                         options4['mu_init'] = 1e-5
                         options4['bound_push'] =1e-5
-                        options3['max_cpu_time'] = 1e+03
+                        options4['max_cpu_time'] = _time_limit(1e+03)
                         results = solver.solve(m,tee=False, options=options4)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                             print("successfully solved")
@@ -394,14 +443,14 @@ def solve_until_feas_NLP(m):
                 print("First solve was infeasible")
                 options1 = {}
                 options1['mu_strategy'] = 'adaptive'
-                options1['max_cpu_time'] = 1e+03
+                options1['max_cpu_time'] = _time_limit(1e+03)
                 results = solver.solve(m,tee=False, options=options1)
                 if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                     print("successfully solved")
                 elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                     print("Second solve was infeasible")
                     options2 = {}
-                    options2['max_cpu_time'] = 1e+03
+                    options2['max_cpu_time'] = _time_limit(1e+03)
                     options2['linear_solver'] = 'ma57'
                     options2['mu_init'] = 1e-6
                     #CAN STILL ADD MORE OPTIONS SPECIFICALLY WITH ANOTHER LINEAR SOLVER
@@ -413,7 +462,7 @@ def solve_until_feas_NLP(m):
                         options3 = {}
                         options3['mu_init'] = 1e-6
                         options3['bound_push'] =1e-6
-                        options3['max_cpu_time'] = 1e+03
+                        options3['max_cpu_time'] = _time_limit(1e+03)
                         options3['linear_solver'] = 'ma57'
                         results = solver.solve(m,tee=False, options=options3)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -448,7 +497,7 @@ def solve_until_feas_NLP(m):
                 elif (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):
                     print("Second solve was infeasible")
                     options2 = {}
-                    options2['max_cpu_time'] = 1e+03
+                    options2['max_cpu_time'] = _time_limit(1e+03)
                     options2['linear_solver'] = 'ma57'
                     options2['mu_init'] = 1e-6
                     #options['bound_push'] =1e-5
@@ -460,7 +509,7 @@ def solve_until_feas_NLP(m):
                         options3 = {}
                         options3['mu_init'] = 1e-6
                         options3['bound_push'] =1e-6
-                        options3['max_cpu_time'] = 1e+03
+                        options3['max_cpu_time'] = _time_limit(1e+03)
                         options3['linear_solver'] = 'ma57'
                         results = solver.solve(m,tee=False, options=options3)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -487,7 +536,7 @@ def solve_until_feas_NLP(m):
                     options4 = {}
                     options4['mu_init'] = 1e-6
                     options4['bound_push'] =1e-6
-                    options4['max_cpu_time'] = 1e+03
+                    options4['max_cpu_time'] = _time_limit(1e+03)
                     options4['linear_solver'] = 'ma57'
                     results = solver.solve(m,tee=False, options=options4)
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -496,7 +545,7 @@ def solve_until_feas_NLP(m):
                         print("Second solve was infeasible")
                         options4 = {}
                         options4['mu_init'] = 1e-6
-                        options4['max_cpu_time'] = 1e+03
+                        options4['max_cpu_time'] = _time_limit(1e+03)
                         options4['linear_solver'] = 'ma57'
                         #options['bound_push'] =1e-5
                         results = solver.solve(m,tee=False, options=options4) 
@@ -507,7 +556,7 @@ def solve_until_feas_NLP(m):
                             options4 = {}
                             options4['mu_init'] = 1e-5
                             options4['bound_push'] =1e-5
-                            options4['max_cpu_time'] = 1e+03
+                            options4['max_cpu_time'] = _time_limit(1e+03)
                             options4['linear_solver'] = 'ma57'
                             results = solver.solve(m,tee=False, options=options4)
                             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -534,7 +583,7 @@ def solve_until_feas_NLP(m):
                         options4 = {}
                         options4['mu_init'] = 1e-5
                         options4['bound_push'] =1e-5
-                        options4['max_cpu_time'] = 1e+03
+                        options4['max_cpu_time'] = _time_limit(1e+03)
                         options4['linear_solver'] = 'ma57'
                         results = solver.solve(m,tee=False, options=options4)
                         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
@@ -576,7 +625,7 @@ def solve_until_feas_MINLP_BARON(m):
     globalsol = False
     print("==================ATTEMPTING TO SOLVE WITH BARON==========================")
     try:
-        options['MaxTime'] = 1000
+        options['MaxTime'] = _time_limit(1000)
         results = opt.solve(m,options = options,tee=False)
         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
             print("successfully solved")
@@ -623,7 +672,7 @@ def solve_until_feas_MINLP_BARON(m):
             solver=SolverFactory('gams')
             options={}
             m1 = m
-            results = solver.solve(m1,tee=False, solver = 'dicopt')
+            results = solver.solve(m1,tee=False, solver = 'dicopt', add_options = _gams_time_options())
             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                 print("successfully solved")
                 DICOPTsolved = True
@@ -631,7 +680,7 @@ def solve_until_feas_MINLP_BARON(m):
             elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                 print("First solve was infeasible, solving with feasibility pump")
                 options['feaspump']= 2
-                results = opt.solve(m,options = options,tee=False, solver = 'dicopt')
+                results = opt.solve(m,options = options,tee=False, solver = 'dicopt', add_options = _gams_time_options())
             
                 if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                     print("successfully solved")
@@ -641,7 +690,7 @@ def solve_until_feas_MINLP_BARON(m):
                     print("Second solve was infeasible, solving with changed match options")
                     options1 = {}
                     options1['optcr']= 0.05
-                    results = opt.solve(m,options = options1,tee=False, solver = 'dicopt')
+                    results = opt.solve(m,options = options1,tee=False, solver = 'dicopt', add_options = _gams_time_options())
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                         print("successfully solved")
                         DICOPTsolved = True
@@ -666,7 +715,7 @@ def solve_until_feas_MINLP_BARON(m):
             solver=SolverFactory('gams')
             options={}
             m1 = m
-            results = solver.solve(m1,tee=False, solver = 'baron')
+            results = solver.solve(m1,tee=False, solver = 'baron', add_options = _gams_time_options())
             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                 print("successfully solved")
                 BARONsolved = True
@@ -675,7 +724,7 @@ def solve_until_feas_MINLP_BARON(m):
             elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                 print("First solve was infeasible, solving with changed match options")
                 options['EpsR']= 0.02
-                results = opt.solve(m,options = options,tee=False, solver = 'baron')
+                results = opt.solve(m,options = options,tee=False, solver = 'baron', add_options = _gams_time_options())
                 
                 if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                     print("successfully solved")
@@ -684,7 +733,7 @@ def solve_until_feas_MINLP_BARON(m):
                 elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                     print("Second solve was infeasible, solving with changed match options")
                     options['EpsR']= 0.05
-                    results = opt.solve(m,options = options,tee=False, solver = 'baron')
+                    results = opt.solve(m,options = options,tee=False, solver = 'baron', add_options = _gams_time_options())
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                         print("successfully solved")
                         BARONsolved = True
@@ -709,7 +758,7 @@ def solve_until_feas_MINLP_BARON(m):
             print("==================ATTEMPTING TO SOLVE WITH BARON WITH BAD GAP==========================")
             solver=SolverFactory('baron')
             options={}
-            options['MaxTime'] = 1000
+            options['MaxTime'] = _time_limit(1000)
             options['EpsR']= 0.1
             m1 = m
             results = solver.solve(m1,tee=False, options = options)
@@ -887,7 +936,7 @@ def solve_until_feas_MINLP_DICOPT(m):
             solver=SolverFactory('gams')
             options={}
             m1 = m
-            results = solver.solve(m1,tee=False, solver = 'dicopt')
+            results = solver.solve(m1,tee=False, solver = 'dicopt', add_options = _gams_time_options())
             
             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                 print("successfully solved")
@@ -896,7 +945,7 @@ def solve_until_feas_MINLP_DICOPT(m):
             elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                 print("First solve was infeasible, solving with feasibility pump")
                 options['feaspump']= 2
-                results = opt.solve(m,options = options,tee=False, solver = 'dicopt')
+                results = opt.solve(m,options = options,tee=False, solver = 'dicopt', add_options = _gams_time_options())
             
                 if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                     print("successfully solved")
@@ -906,7 +955,7 @@ def solve_until_feas_MINLP_DICOPT(m):
                     print("Second solve was infeasible, solving with changed match options")
                     options1 = {}
                     options1['optcr']= 0.05
-                    results = opt.solve(m,options = options1,tee=False, solver = 'dicopt')
+                    results = opt.solve(m,options = options1,tee=False, solver = 'dicopt', add_options = _gams_time_options())
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                         print("successfully solved")
                         DICOPTsolved = True
@@ -928,7 +977,7 @@ def solve_until_feas_MINLP_DICOPT(m):
         if DICOPTsolved == True:
             print("Solved using DICOPT")
         else:
-            options['MaxTime'] = 10000
+            options['MaxTime'] = _time_limit(10000)
             results = opt.solve(m,options = options,tee=False)
             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                 print("successfully solved")
@@ -972,7 +1021,7 @@ def solve_until_feas_MINLP_DICOPT(m):
             solver=SolverFactory('gams')
             options={}
             m1 = m
-            results = solver.solve(m1,tee=False, solver = 'baron')
+            results = solver.solve(m1,tee=False, solver = 'baron', add_options = _gams_time_options())
             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                 print("successfully solved")
                 BARONsolved = True
@@ -981,7 +1030,7 @@ def solve_until_feas_MINLP_DICOPT(m):
             elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                 print("First solve was infeasible, solving with changed match options")
                 options['EpsR']= 0.02
-                results = opt.solve(m,options = options,tee=False, solver = 'baron')
+                results = opt.solve(m,options = options,tee=False, solver = 'baron', add_options = _gams_time_options())
                 
                 if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                     print("successfully solved")
@@ -990,7 +1039,7 @@ def solve_until_feas_MINLP_DICOPT(m):
                 elif (results.solver.termination_condition == TerminationCondition.infeasible) or  (results.solver.termination_condition == TerminationCondition.maxIterations):
                     print("Second solve was infeasible, solving with changed match options")
                     options['EpsR']= 0.05
-                    results = opt.solve(m,options = options,tee=False, solver = 'baron')
+                    results = opt.solve(m,options = options,tee=False, solver = 'baron', add_options = _gams_time_options())
                     if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                         print("successfully solved")
                         BARONsolved = True
@@ -1016,10 +1065,10 @@ def solve_until_feas_MINLP_DICOPT(m):
             print("==================ATTEMPTING TO SOLVE WITH BARON WITH BAD GAP==========================")
             solver=SolverFactory('baron')
             options={}
-            options['MaxTime'] = 1000
+            options['MaxTime'] = _time_limit(1000)
             options['EpsR']= 0.1
             m1 = m
-            results = solver.solve(m1,tee=False)
+            results = solver.solve(m1,tee=False, options = options)
             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
                 print("successfully solved")
                 BARONsolved = True
@@ -1183,7 +1232,7 @@ def simple_NLP_solve(m):
         solver=SolverFactory('gams')
         options={}
         m1 = m
-        results = solver.solve(m1,tee=False, solver = 'conopt')
+        results = solver.solve(m1,tee=False, solver = 'conopt', add_options = _gams_time_options())
         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
             print("successfully solved")
         elif (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.locallyOptimal):
@@ -1192,7 +1241,7 @@ def simple_NLP_solve(m):
             solver= SolverFactory('ipopt')
             options={}
             try:
-                options['max_cpu_time'] = 1e+04
+                options['max_cpu_time'] = _time_limit(1e+04)
                 results = solver.solve(m,tee=False, options=options)
             except:
                 print("Something failed during the solve process!")            
@@ -1203,7 +1252,7 @@ def simple_NLP_solve(m):
         solver= SolverFactory('ipopt')
         options={}
         try:
-            options['max_cpu_time'] = 1e+04
+            options['max_cpu_time'] = _time_limit(1e+04)
             results = solver.solve(m,tee=False, options=options)
             #m.load(results)
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Options of the hybrid strategy that change how the iterations are solved (worker pool, caches, acceleration,
+recovery, time budget, logging), grouped so that they can be built, checked and reused as one object.
+
+The options can still be given to run_hybrid_strategy as keyword arguments. A HybridOptions object is
+passed as run_hybrid_strategy(..., options = HybridOptions(parallel = True, evaluate_both = True)).
+
+@author: mchlshort
+"""
+from __future__ import division
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+class HybridOptions(object):
+    #name and default of every option, see run_hybrid_strategy for their meaning
+    defaults = {'parallel': False, 'max_workers': None, 'race_finite_elements': False, 'design_cache': False,
+                'design_cache_tol': 1e-4, 'design_cache_size': 256, 'warm_start': False, 'checkpoint_file': None,
+                'resume_from': None, 'trace_file': None, 'cor_acceleration': None, 'cor_acceleration_memory': 3,
+                'persistent_model': False, 'recovery_mode': None, 'recovery_window': 60, 'time_budget': None,
+                'log_store': None, 'verbosity': None, 'topology_cache': False, 'topology_cache_tol': 1e-2,
+                'incremental': False, 'incremental_tol': 1e-3, 'evaluate_both': False, 'async_fraction': None,
+                'cor_filter': 'fixed', 'cor_filter_bounds': None, 'auto_omega': False}
+
+    def __init__(self, **options):
+        """Options of run_hybrid_strategy. An option that is not given keeps its default.
+
+        Args:
+            options: any of the options in HybridOptions.defaults, with the meaning documented in
+                     run_hybrid_strategy
+
+        """
+        for name in options:
+            if name not in self.defaults:
+                raise RuntimeError("Unknown option of the hybrid strategy: " + str(name))
+        for name, default in self.defaults.items():
+            setattr(self, name, options.get(name, default))
+
+    def non_default(self):
+        """Returns the options that were changed from their defaults.
+
+        returns:
+            dict: option name and value
+        """
+        return dict((name, getattr(self, name)) for name in self.defaults if getattr(self, name) != self.defaults[name])
+
+    def validate(self, non_iso = True):
+        """Checks the type of every option and the combinations of options that are not supported.
+
+        Args:
+            non_iso (bool, optional): whether the non-isocompositional suboptimization is solved. Default is True
+
+        returns:
+            None
+        """
+        for name in ['parallel', 'race_finite_elements', 'design_cache', 'warm_start', 'persistent_model', 'auto_omega',
+                     'topology_cache', 'incremental', 'evaluate_both']:
+            if not isinstance(getattr(self, name), bool):
+                raise RuntimeError(name + " must be True or False")
+        if not (isinstance(self.max_workers, int) or self.max_workers == None):
+            raise RuntimeError("Must input an integer or leave to default for max_workers")
+        for name in ['checkpoint_file', 'resume_from', 'log_store']:
+            if getattr(self, name) != None and not isinstance(getattr(self, name), str):
+                raise RuntimeError(name + " must be a file name")
+        if self.cor_acceleration not in [None, 'aitken', 'anderson']:
+            raise RuntimeError("cor_acceleration must be None, 'aitken' or 'anderson'")
+        if not isinstance(self.cor_acceleration_memory, int) or self.cor_acceleration_memory < 1:
+            raise RuntimeError("cor_acceleration_memory must be a positive integer")
+        if self.recovery_mode not in [None, 'first', 'best']:
+            raise RuntimeError("recovery_mode must be None, 'first' or 'best'")
+        if not isinstance(self.recovery_window, (int, float)) or self.recovery_window < 0:
+            raise RuntimeError("recovery_window must be a non-negative number")
+        if self.time_budget != None and (not isinstance(self.time_budget, (int, float)) or self.time_budget <= 0):
+            raise RuntimeError("time_budget must be a positive number of seconds or left to default")
+        if self.async_fraction != None and (not isinstance(self.async_fraction, (int, float)) or self.async_fraction <= 0 or self.async_fraction > 1):
+            raise RuntimeError("async_fraction must be a number between 0 and 1 or left to default")
+        if not isinstance(self.incremental_tol, (int, float)) or self.incremental_tol < 0:
+            raise RuntimeError("incremental_tol must be a non-negative number")
+        if self.cor_filter not in ['fixed', 'adaptive']:
+            raise RuntimeError("cor_filter must be 'fixed' or 'adaptive'")
+        bounds = self.cor_filter_bounds
+        if bounds != None and (not isinstance(bounds, tuple) or len(bounds) != 2 or not 0 < bounds[0] <= bounds[1] < 1):
+            raise RuntimeError("cor_filter_bounds must be a tuple (smallest, largest) with 0 < smallest <= largest < 1")
+
+        #combinations of options
+        if self.async_fraction != None and self.race_finite_elements:
+            raise RuntimeError("async_fraction cannot be combined with race_finite_elements")
+        if self.evaluate_both:
+            if not non_iso:
+                raise RuntimeError("evaluate_both compares the MINLP and suboptimization networks and needs non_iso = True")
+            if not self.parallel:
+                raise RuntimeError("evaluate_both solves the exchangers of both networks in the worker pool and needs parallel = True")
+            if self.race_finite_elements or self.async_fraction != None:
+                raise RuntimeError("evaluate_both cannot be combined with race_finite_elements or async_fraction")
@@ -20,11 +20,20 @@ import inspect
 import numpy
 import time
 import sys
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
-from pyomo.opt import SolverFactory, ProblemFormat, TerminationCondition
+from pyomo.opt import SolverFactory, ProblemFormat, TerminationCondition, SolverResults
 from library.MassExchanger import *
 from library.MENS_MINLP import *
 from library.SubOptMENS import *
+from library.DesignCache import *
+from library.Checkpoint import *
+from library.Profiling import *
+from library.LogStore import *
+from library.Verbosity import *
+from library.TopologyCache import *
+from library.HybridOptions import *
+from library.FeasibleSolver import *
 
 __author__ = "Michael Short"
 __copyright__ = "Copyright 2020"
@@ -51,6 +60,114 @@ def write_to_csv(filename, data):
     df = pd.DataFrame.from_dict(data, orient="index")
     df.to_csv(filename)
 
+def design_exchanger(match_spec, finite_elements = None):
+    """Solves the detailed design of the exchanger for a single match of the network.
+
+    The number of finite elements is increased until the exchanger model solves. The design, solver status
+    and profiles are copied into an ExchangerResult right after each solve so that the Pyomo model of every
+    finite element level is freed. This is a module level function so that it can be sent to worker processes
+    when the exchangers are solved in parallel.
+
+    Args:
+        match_spec (dict): numeric specification of the match, with the rich and lean stream names ('i', 'j'),
+                                        the 'rich_in_side', 'rich_out_side', 'flowrates' and 'me_inits' dictionaries
+                                        and the 'stream_properties'. An optional 'warm_start' entry holds the profiles
+                                        of a previous solve of the same match (see extract_warm_start) and an optional
+                                        'deadline' entry the time.time() value by which all the solves must stop
+        finite_elements (list, optional): numbers of finite elements to try, in order. Default is [20,50,100,200]
+
+    returns:
+        the ExchangerResult to be stored for this match, with the time spent on each nfe and staged model attached
+        as 'timings'. None if no model could be stored
+
+    """
+    if finite_elements == None:
+        finite_elements = [20,50,100,200]
+    if 'deadline' in match_spec:
+        set_solver_deadline(match_spec['deadline'])
+    stored = None
+    timings = []
+    for nfe in finite_elements:
+        remaining = solver_time_remaining()
+        if remaining != None and remaining <= 0:
+            print("No time left in the time budget, the exchanger is not solved with ", nfe, " elements")
+            break
+        print("solving for ", nfe, "number of elements")
+        t0 = time.perf_counter()
+        mx = mass_exchanger(rich_stream_name = match_spec['i'], lean_stream_name = match_spec['j'], rich_in_side = match_spec['rich_in_side'],\
+                            rich_out_side = match_spec['rich_out_side'], flowrates = match_spec['flowrates'], me_inits = match_spec['me_inits'],\
+                            stream_properties = match_spec['stream_properties'], nfe = nfe, warm_start = match_spec.get('warm_start'))
+
+        ME5, ME5results = mx.find_detailed_exchanger_design()
+        timings.extend(ME5.timings)
+        timings.append({"phase": "exchanger_nfe", "nfe": nfe, "seconds": time.perf_counter() - t0, "success": bool(ME5.success)})
+        log_message(ME5results)
+        log_message("ME5 results type: ", type(ME5results))
+        log_message(ME5.success)
+        store = False
+        if ME5results == 'failed epically':
+            print("The exchanger could not be solved. This means that for this exchanger no model is stored. Could result in failure to produce correction factors.")
+            store = True
+        elif not isinstance(ME5results, str):
+            if isinstance(ME5results, pyomo.core.base.PyomoModel.ConcreteModel):
+                print("model did not solve correctly, so it is skipped")
+                store = True
+            elif (ME5results.solver.status == SolverStatus.ok) and (ME5results.solver.termination_condition == TerminationCondition.optimal):
+                store = True
+            elif (ME5results.solver.status == SolverStatus.ok) and (ME5results.solver.termination_condition == TerminationCondition.locallyOptimal):
+                store = True
+        else:
+            #Should add way to deal with unsolved NLPs (increase elements?)
+            print("The exchanger could not be solved. This means that for this exchanger no model is stored. Could result in failure to produce correction factors.")
+        if store:
+            warm_start = None
+            if ME5.success == True:
+                warm_start = extract_warm_start(ME5, match_spec['rich_in_side'], match_spec['rich_out_side'], match_spec['i'], match_spec['j'])
+            stored = ExchangerResult.from_model(ME5, nfe = nfe, warm_start = warm_start, results = ME5results)
+        success = ME5.success
+        #the model is not needed once the record is extracted
+        del mx, ME5, ME5results
+        if success == False:
+            print("try to increase number of FEs")
+        elif success == True:
+            break
+    if stored is not None:
+        stored.timings = timings
+    return stored
+
+def solve_recovery_candidate(mens_args, corrections, nlp_values, min_height, omega, bin_cuts, deadline = None):
+    """Solves the MINLP for one (min_height, omega) candidate of the recovery sweep.
+
+    This is a module level function so that it can be run in a worker process. A new MENS object is built from
+    mens_args in the worker and the NLP initialization solved in the main process is rebuilt from its variable
+    values, so only the MINLP is solved here. Only the numeric outcome is sent back.
+
+    Args:
+        mens_args (dict): keyword arguments used to build the MENS object
+        corrections (dict): correction factors of the current iteration
+        nlp_values (dict): values of the variables of the solved NLP initialization (see model_values)
+        min_height (float): smallest NLP height for a match to be kept in the MINLP, None for no filter
+        omega (float): big-M parameter, None for the value in the parameter data
+        bin_cuts (dict): binary cuts to be added to the MINLP
+        deadline (float, optional): time.time() value by which the solves must stop, None for no deadline
+
+    returns:
+        dict: the candidate, whether the MINLP solved to optimality, its objective and the values of its variables
+    """
+    set_solver_deadline(deadline)
+    MEN = MENS(**mens_args)
+    MEN_init = MEN.NLP_from_values(nlp_values, correction_factors = corrections)
+    MENS_solved, results = MEN.MINLP_MENS_full(MEN_init, min_height_from_nlp = min_height, omega = omega, bin_cuts = bin_cuts)
+    outcome = {'min_height': min_height, 'omega': omega, 'bin_cuts': bin_cuts, 'optimal': False, 'objective': None, 'values': None,
+               'solversolved': None, 'globalsol': None, 'termination': str(results.solver.termination_condition)}
+    if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
+        outcome['optimal'] = True
+        outcome['objective'] = value(MENS_solved.TACeqn)
+        outcome['values'] = model_values(MENS_solved)
+        outcome['solversolved'] = MENS_solved.solversolved
+        outcome['globalsol'] = MENS_solved.globalsol
+    return outcome
+
 class HybridStrategy(object):
     """Implements the hybrid strategy for MENS proposed by Short et al. (2018). 
     
@@ -87,7 +204,585 @@ class HybridStrategy(object):
         self.utility_cost = dict()
         self.binary_cuts = dict()
         self.symmetry_cuts = dict()
-        
+        self.max_workers = None
+        self._executor = None
+        self.finite_elements = [20,50,100,200]
+        self.race_width = 2
+        self.options = HybridOptions()
+        self.design_cache = None
+        self.warm_starts = dict()
+        self.trace = IterationTrace()
+        self.cor_acceleration = None
+        self.cor_acceleration_memory = 3
+        self._cor_history = []
+        self.acceleration_log = dict()
+        self.recovery_mode = None
+        self.recovery_window = 60
+        self.recovery_height_steps = 20
+        self.recovery_omega_steps = 50
+        self.auto_omega = False
+        self._deadline = None
+        self._iteration_times = []
+        self.log_store = None
+        self.topology_cache = None
+        self.incremental = False
+        self.incremental_tol = 1e-3
+        self.last_designs = dict()
+        self.reuse_log = dict()
+        self.shared_bound = None
+        self.portfolio_patience = None
+        self.stopped_by_portfolio = False
+        self.async_fraction = None
+        self._late_exchangers = dict()
+        self.cor_filter = 'fixed'
+        self.cor_filter_bounds = None
+        self.cor_filter_growth = 1.5
+        self.cor_filter_shrink = 0.5
+        self.filter_bands = dict()
+        self.cor_directions = dict()
+        self.filter_band_log = dict()
+        self._raw_corrections = dict()
+
+    def _out_of_time(self):
+        """Returns True if a time budget was given and the deadline has passed.
+        """
+        return self._deadline != None and time.time() >= self._deadline
+
+    def _portfolio_should_stop(self, ic):
+        """Shares the best real TAC with the other runs of a portfolio and decides whether this run should stop.
+
+        The run stops if its best solution is worse than the best known bound of the portfolio and has not improved
+        for portfolio_patience iterations.
+
+        Args:
+            ic (int): iteration number
+
+        returns:
+            bool: True if this run cannot be expected to improve on the portfolio bound
+        """
+        bound, lock = self.shared_bound
+        with lock:
+            if self.best_objective_real != None and self.best_objective_real < bound.value:
+                bound.value = self.best_objective_real
+            best_known = bound.value
+        if self.portfolio_patience == None:
+            return False
+        if self.best_objective_real != None and self.best_objective_real <= best_known:
+            return False
+        return ic - self.best_net_iter >= self.portfolio_patience
+
+    def _get_executor(self):
+        """Returns the pool of worker processes used for the parallel solves, starting it if needed.
+
+        Args:
+            None
+
+        returns:
+            ProcessPoolExecutor
+        """
+        if self._executor == None:
+            self._executor = ProcessPoolExecutor(max_workers = self.max_workers, initializer = set_verbosity, initargs = (get_verbosity(),))
+        return self._executor
+
+    def _shutdown_executor(self):
+        """Stops the worker processes once the iterations are finished.
+        """
+        for m in self._late_exchangers:
+            self._late_exchangers[m]['future'].cancel()
+        self._late_exchangers = dict()
+        if self._executor != None:
+            self._executor.shutdown(wait = True)
+            self._executor = None
+
+    def _design_exchangers_parallel(self, match_specs):
+        """Solves the detailed exchanger designs for all the selected matches in worker processes.
+
+        The matches are independent once the network is fixed. Each worker receives only the numeric
+        specification of the match and sends back an ExchangerResult, not the Pyomo model.
+
+        Args:
+            match_specs (dict): dictionary of match specifications (see design_exchanger) indexed by the match number
+
+        returns:
+            dict: ExchangerResult for each match that could be stored, indexed by the match number
+        """
+        executor = self._get_executor()
+        futures = dict()
+        for m in match_specs:
+            futures[m] = executor.submit(design_exchanger, match_specs[m])
+
+        designs = dict()
+        for m in futures:
+            try:
+                result = futures[m].result()
+            except Exception as e:
+                print("The exchanger worker for match ", m, " failed: ", e)
+                result = None
+            if result is not None:
+                designs[m] = result
+        return designs
+
+    def _design_exchangers_async(self, match_specs, MENS_model):
+        """Solves the detailed exchanger designs in worker processes and returns as soon as async_fraction of them are done.
+
+        The matches that are still running are kept in _late_exchangers with the values of the network model their
+        corrections are computed from, and are folded into the corrections when they finish (see _fold_late_exchangers).
+        A match that is submitted again replaces its older late solve.
+
+        Args:
+            match_specs (dict): dictionary of match specifications (see design_exchanger) indexed by the match number
+            MENS_model (pyomo model): the network model the matches were taken from
+
+        returns:
+            tuple: (dict of the ExchangerResults that are done, indexed by the match number, list of the late match numbers)
+        """
+        executor = self._get_executor()
+        futures = dict()
+        for m in match_specs:
+            if m in self._late_exchangers:
+                self._late_exchangers.pop(m)['future'].cancel()
+            futures[m] = executor.submit(design_exchanger, match_specs[m])
+        needed = int(numpy.ceil(self.async_fraction*len(futures)))
+        pending = set(futures.values())
+        while pending and len(futures) - len(pending) < needed:
+            done, pending = wait(pending, return_when = FIRST_COMPLETED)
+
+        designs = dict()
+        late = []
+        for m in futures:
+            if not futures[m].done():
+                spec = match_specs[m]
+                self._late_exchangers[m] = {'future': futures[m], 'match_spec': spec,
+                                            'inputs': self._correction_inputs(MENS_model, spec['i'], spec['j'], spec['k'])}
+                late.append(m)
+                continue
+            try:
+                result = futures[m].result()
+            except Exception as e:
+                print("The exchanger worker for match ", m, " failed: ", e)
+                result = None
+            if result is not None:
+                designs[m] = result
+        return designs, late
+
+    def _fold_late_exchangers(self, warm_start = False):
+        """Folds the exchangers of earlier iterations that have finished since into the current corrections.
+
+        The corrections of a late match are computed against the network model values stored when it was submitted.
+        Late exchangers that are still running are left in _late_exchangers.
+
+        Args:
+            warm_start (bool, optional): if True the profiles of the finished exchangers are stored for warm starting
+
+        returns:
+            int: number of late exchangers folded into the corrections
+        """
+        folded = 0
+        for m in list(self._late_exchangers):
+            entry = self._late_exchangers[m]
+            if not entry['future'].done():
+                continue
+            del self._late_exchangers[m]
+            try:
+                design = entry['future'].result()
+            except Exception as e:
+                print("The late exchanger worker for match ", m, " failed: ", e)
+                continue
+            if design is None or design.success != True:
+                continue
+            for name, cor in self._design_corrections(entry['inputs'], design, m).items():
+                self.corrections[m,name] = cor
+            spec = entry['match_spec']
+            self._store_designs({m: spec}, {m: design}, warm_start)
+            print("Late exchanger of match ", spec['i'], spec['j'], spec['k'], " folded into the corrections")
+            folded += 1
+        return folded
+
+    def _design_exchangers_race(self, match_specs):
+        """Solves the detailed exchanger designs with several finite element variants of each match at once.
+
+        At most race_width variants of each match are in the pool at the same time, starting from the coarsest. When a
+        variant fails the next finer one is submitted. For each match the coarsest variant that succeeds is kept and
+        its finer variants still waiting in the queue are cancelled. Variants that are already running cannot be
+        stopped: their results are ignored, so each match costs at most race_width - 1 solves more than the serial
+        ladder. If no variant succeeds, the finest stored result is kept, as in the serial ladder.
+
+        Args:
+            match_specs (dict): dictionary of match specifications (see design_exchanger) indexed by the match number
+
+        returns:
+            dict: ExchangerResult for each match that could be stored, indexed by the match number
+        """
+        executor = self._get_executor()
+        levels = len(self.finite_elements)
+        outcomes = dict((m, dict()) for m in match_specs)
+        submitted = dict((m, 0) for m in match_specs)
+        running = dict()
+        designs = dict()
+        undecided = set(match_specs)
+
+        def submit(m):
+            in_pool = sum(1 for (m_r, n) in running.values() if m_r == m)
+            while submitted[m] < levels and in_pool < self.race_width:
+                nfe = self.finite_elements[submitted[m]]
+                running[executor.submit(design_exchanger, match_specs[m], [nfe])] = (m, submitted[m])
+                submitted[m] += 1
+                in_pool += 1
+
+        def decide(m):
+            #the coarsest level that succeeded, once all the coarser ones have failed
+            for n in range(levels):
+                if n not in outcomes[m]:
+                    return False
+                result = outcomes[m][n]
+                if result is not None and result.success == True:
+                    print("match ", m, " solved with ", self.finite_elements[n], " elements")
+                    designs[m] = result
+                    return True
+            stored = [outcomes[m][n] for n in range(levels) if outcomes[m][n] is not None]
+            if stored:
+                designs[m] = stored[-1]
+            return True
+
+        for m in match_specs:
+            submit(m)
+        while running:
+            done, pending = wait(list(running), return_when = FIRST_COMPLETED)
+            for future in done:
+                m, n = running.pop(future)
+                if m not in undecided:
+                    continue
+                try:
+                    outcomes[m][n] = future.result()
+                except Exception as e:
+                    print("The exchanger worker for match ", m, " with ", self.finite_elements[n], " elements failed: ", e)
+                    outcomes[m][n] = None
+                if decide(m):
+                    undecided.discard(m)
+                    for other, (m_r, n_r) in list(running.items()):
+                        if m_r == m and other.cancel():
+                            running.pop(other)
+                else:
+                    submit(m)
+        return designs
+
+    def _recovery_candidates(self, min_height, omega):
+        """Lists the (min_height, omega) candidates of the recovery sweep in the order the serial recovery tries them.
+
+        Args:
+            min_height (float): the min_height used in the first MINLP solve
+            omega (float): the omega of the parameter data
+
+        returns:
+            list: tuples of (min_height, omega, use binary cuts)
+        """
+        candidates = []
+        for i in range(self.recovery_height_steps):
+            candidates.append((min_height/((i+1)*5), None, True))
+        currentOmega = omega
+        #a tight_omega is already the smallest valid one, so reducing it further is not tried
+        if not self.auto_omega:
+            for i in range(self.recovery_omega_steps):
+                currentOmega = currentOmega/1.5
+                candidates.append((None, currentOmega, False))
+        return candidates
+
+    def _parallel_recovery(self, MEN, MEN_init, mens_args, min_height, ic):
+        """Runs the recovery sweep for an infeasible MINLP as a batch of candidates in the worker processes.
+
+        The NLP initialization of the iteration is solved once, in this process, and the values of its variables are
+        sent to the workers, which only solve the MINLP. In 'first' mode the first candidate that solves to optimality
+        is accepted. In 'best' mode the candidates finishing within recovery_window seconds of the first optimal one
+        are also collected and the one with the lowest MINLP objective is accepted. The remaining candidates still
+        waiting in the queue are cancelled. The solution of the accepted worker is installed in a MINLP model built
+        in this process, without solving it again.
+
+        Args:
+            MEN (MENS): the MENS object of the run
+            MEN_init (Concrete Pyomo model): the solved NLP initialization of the iteration
+            mens_args (dict): keyword arguments used to build the MENS object in the workers
+            min_height (float): the min_height used in the first MINLP solve
+            ic (int): iteration number
+
+        returns:
+            tuple: (solved MINLP model, results), or (None, None) if no candidate solved
+        """
+        omega = MEN.get_parameter('omega')
+        nlp_values = model_values(MEN_init)
+        executor = self._get_executor()
+        futures = []
+        for mh, om, cuts in self._recovery_candidates(min_height, omega):
+            futures.append(executor.submit(solve_recovery_candidate, mens_args, self.corrections, nlp_values, mh, om,
+                                           self.binary_cuts if cuts else None, self._deadline))
+        print("Recovery sweep: ", len(futures), " candidates submitted")
+
+        accepted = []
+        first_time = None
+        pending = set(futures)
+        while pending:
+            timeout = None
+            if first_time != None:
+                timeout = max(0, self.recovery_window - (time.perf_counter() - first_time))
+            if self._deadline != None:
+                remaining = max(0, self._deadline - time.time())
+                timeout = remaining if timeout == None else min(timeout, remaining)
+            done, pending = wait(pending, timeout = timeout, return_when = FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    print("Recovery candidate failed: ", e)
+                    continue
+                if outcome['optimal']:
+                    print("Recovery candidate solved: min_height = ", outcome['min_height'], ", omega = ", outcome['omega'], ", TAC = ", outcome['objective'])
+                    accepted.append(outcome)
+                    if first_time == None:
+                        first_time = time.perf_counter()
+            if accepted and self.recovery_mode == 'first':
+                break
+        for future in pending:
+            future.cancel()
+        if not accepted:
+            print("No candidate of the recovery sweep solved the MINLP")
+            return None, None
+
+        best = min(accepted, key = lambda outcome: outcome['objective'])
+        print("Installing the accepted recovery candidate: min_height = ", best['min_height'], ", omega = ", best['omega'])
+        MENS_solved = MEN.MINLP_from_values(MEN_init, best['values'], min_height_from_nlp = best['min_height'], omega = best['omega'])
+        MENS_solved.solversolved = best['solversolved']
+        MENS_solved.globalsol = best['globalsol']
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        return MENS_solved, results
+
+    def _build_match_spec(self, MENS_model, i, j, k, orig, stream_properties, warm_start = False):
+        """Builds the numeric specification of the exchanger of a selected match (see design_exchanger).
+
+        Args:
+            MENS_model (pyomo model): solved network model (MINLP or NLP suboptimization)
+            i (str): rich stream
+            j (str): lean stream
+            k (int): stage
+            orig (bool): True if MENS_model is the MINLP, False for the non-isocompositional suboptimization
+            stream_properties (dict): physical properties of the streams
+            warm_start (bool, optional): if True the stored profiles of the (i,j) match are added
+
+        returns:
+            dict: match specification
+        """
+        CRin_Side = {}
+        if orig == True:
+            CRin_Side[i] = MENS_model.cr[i,k].value
+            CRin_Side[j] = MENS_model.cl[j,k].value
+        else:
+            CRin_Side[i] = MENS_model.cr[i,k].value
+            CRin_Side[j] = MENS_model.clin[i,j,k].value
+
+        CRout_Side = {}
+        if orig == True:
+            CRout_Side[i] = MENS_model.cr[i,(k+1)].value
+            CRout_Side[j] = MENS_model.cl[j,(k+1)].value
+        else:
+            CRout_Side[i] = MENS_model.crin[i,j,(k+1)].value
+            CRout_Side[j] = MENS_model.cl[j,(k+1)].value
+
+        FlowM = {}
+        if orig == True:
+            FlowM[i] = MENS_model.M[i,j,k].value/(MENS_model.cr[i,k].value-MENS_model.cr[i,(k+1)].value)
+            FlowM[j] = MENS_model.M[i,j,k].value/(MENS_model.cl[j,k].value-MENS_model.cl[j,(k+1)].value)
+        else:
+            FlowM[i] = MENS_model.M[i,j,k].value/(MENS_model.cr[i,k].value-MENS_model.crin[i,j,(k+1)].value)
+            FlowM[j] = MENS_model.M[i,j,k].value/(MENS_model.clin[i,j,k].value-MENS_model.cl[j,(k+1)].value)
+
+        ME_inits = self._obtain_initializations(MENS_model,i,j,k)
+        match_spec = {'i':i, 'j':j, 'k':k, 'rich_in_side':CRin_Side, 'rich_out_side':CRout_Side, 'flowrates':FlowM,\
+                      'me_inits':ME_inits, 'stream_properties':stream_properties, 'deadline':self._deadline}
+        if warm_start and (i,j) in self.warm_starts:
+            match_spec['warm_start'] = self.warm_starts[i,j]
+        return match_spec
+
+    def _evaluate_both(self, candidates, stream_properties, warm_start = False):
+        """Designs the exchangers of several candidate networks at the same time and keeps the one with the lowest real TAC.
+
+        All the exchangers of all the candidates are submitted to the worker pool together, so the wall time is close
+        to that of a single network. A candidate with a failed exchanger is only kept if every candidate has one.
+
+        Args:
+            candidates (list): tuples of (solved network model, orig, men_type) with orig True for the MINLP
+                                and men_type 'minlp' or 'nlp'
+            stream_properties (dict): physical properties of the streams
+            warm_start (bool, optional): if True the stored profiles of each (i,j) match are used
+
+        returns:
+            dict: the selected candidate, with its 'model', 'orig', 'men_type', the 'specs' of the solved matches,
+                  its 'exchanger_models', 'costs' (see _real_TAC) and the evaluations of the 'others'
+        """
+        executor = self._get_executor()
+        evaluations = []
+        futures = dict()
+        for n, (model, orig, men_type) in enumerate(candidates):
+            specs = dict()
+            designs = dict()
+            m = 0
+            for i in model.i:
+                for j in model.j:
+                    for k in model.k:
+                        if value(model.y[i,j,k]) >= 0.99 and model.M[i,j,k].value != 0:
+                            match_spec = self._build_match_spec(model, i, j, k, orig, stream_properties, warm_start)
+                            known, was_reused = self._known_design(match_spec)
+                            if known is not None:
+                                designs[m] = known
+                            else:
+                                specs[m] = match_spec
+                                futures[n,m] = executor.submit(design_exchanger, match_spec, self.finite_elements)
+                        m += 1
+            evaluations.append({'model': model, 'orig': orig, 'men_type': men_type, 'specs': specs, 'exchanger_models': designs})
+        print("Solving ", len(futures), " exchangers of ", len(candidates), " candidate networks in parallel")
+
+        for (n, m), future in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                print("The exchanger worker for match ", m, " of candidate ", n, " failed: ", e)
+                result = None
+            if result is not None:
+                evaluations[n]['exchanger_models'][m] = result
+                spec = evaluations[n]['specs'][m]
+                self._trace_exchanger(result, [spec['i'], spec['j'], spec['k']])
+
+        for evaluation in evaluations:
+            evaluation['costs'] = self._real_TAC(evaluation['model'], evaluation['exchanger_models'], evaluation['men_type'])
+            print("Real TAC of the ", evaluation['men_type'], " network: ", evaluation['costs']['real_TAC'],
+                  ", failed exchangers: ", evaluation['costs']['discard'])
+        valid = [evaluation for evaluation in evaluations if evaluation['costs']['discard'] == False]
+        if not valid:
+            valid = evaluations
+        best = min(valid, key = lambda evaluation: evaluation['costs']['real_TAC'])
+        best['others'] = [evaluation for evaluation in evaluations if evaluation is not best]
+        return best
+
+    def _known_design(self, match_spec):
+        """Looks for a design of the match that does not have to be solved again, first in the last designs of the
+        incremental mode and then in the design cache.
+
+        Args:
+            match_spec (dict): numeric specification of the match
+
+        returns:
+            tuple: (ExchangerResult or None, True if it was reused by the incremental mode)
+        """
+        i, j, k = match_spec['i'], match_spec['j'], match_spec['k']
+        if self.incremental:
+            design = self._unchanged_design(match_spec)
+            if design is not None:
+                print("Boundary conditions of match ", i,j,k, " have not moved, the last design is reused")
+                return design, True
+        if self.design_cache != None:
+            design = self.design_cache.get(match_spec)
+            if design is not None:
+                print("Exchanger design for match ", i,j,k, " taken from the cache")
+                return design, False
+        return None, False
+
+    def _unchanged_design(self, match_spec):
+        """Returns the last design of the same (i,j,k) match if its boundary conditions have not moved.
+
+        The inlet and outlet concentrations and the flowrates of both streams are compared with those of the last
+        successful solve of the match, with the relative tolerance incremental_tol.
+
+        Args:
+            match_spec (dict): numeric specification of the match (see design_exchanger)
+
+        returns:
+            ExchangerResult of the last solve, or None if the match has to be solved again
+        """
+        match = (match_spec['i'], match_spec['j'], match_spec['k'])
+        if match not in self.last_designs:
+            return None
+        last_spec, design = self.last_designs[match]
+        for name in ['rich_in_side', 'rich_out_side', 'flowrates']:
+            for stream in [match_spec['i'], match_spec['j']]:
+                old = last_spec[name][stream]
+                new = match_spec[name][stream]
+                if abs(new - old) > self.incremental_tol*max(abs(old), abs(new)):
+                    return None
+        return design
+
+    def _store_designs(self, match_specs, exchanger_models, warm_start = False):
+        """Keeps the solved exchangers in the design cache, the warm starts and the last designs of the incremental mode,
+        for the options that are used.
+
+        Args:
+            match_specs (dict): match specifications of the exchangers solved in this iteration, indexed by match number
+            exchanger_models (dict): ExchangerResults of the solved exchangers, indexed by match number
+            warm_start (bool, optional): if True the profiles are kept as warm starts
+
+        returns:
+            None
+        """
+        if self.design_cache != None:
+            for m in match_specs:
+                if m in exchanger_models:
+                    self.design_cache.put(match_specs[m], exchanger_models[m])
+        if warm_start:
+            self._store_warm_starts(match_specs, exchanger_models)
+        if self.incremental:
+            self._store_last_designs(match_specs, exchanger_models)
+
+    def _store_last_designs(self, match_specs, exchanger_models):
+        """Keeps the boundary conditions and result of every successfully solved match for the incremental mode.
+
+        Args:
+            match_specs (dict): match specifications of the exchangers solved in this iteration, indexed by match number
+            exchanger_models (dict): ExchangerResults of the solved exchangers, indexed by match number
+
+        returns:
+            None
+        """
+        for m in match_specs:
+            if m not in exchanger_models or exchanger_models[m] is None or exchanger_models[m].success != True:
+                continue
+            spec = match_specs[m]
+            self.last_designs[spec['i'],spec['j'],spec['k']] = (spec, exchanger_models[m])
+
+    def _trace_exchanger(self, design, match):
+        """Adds the timing of the finite element levels and staged models of an exchanger solve to the iteration trace.
+
+        Args:
+            design (ExchangerResult): the stored exchanger, with its 'timings'
+            match (list): identification of the match, stored with each phase
+
+        returns:
+            None
+        """
+        for entry in getattr(design, "timings", []):
+            info = dict(entry)
+            name = info.pop("phase")
+            seconds = info.pop("seconds")
+            self.trace.add(name, seconds, match = match, **info)
+
+    def _store_warm_starts(self, match_specs, exchanger_models):
+        """Keeps the profiles of the successfully solved exchangers so that the same (i,j) match can be
+        initialized from them in the next iterations.
+
+        Args:
+            match_specs (dict): match specifications of the exchangers solved in this iteration, indexed by match number
+            exchanger_models (dict): ExchangerResults of the solved exchangers, indexed by match number
+
+        returns:
+            None
+        """
+        for m in match_specs:
+            if m not in exchanger_models or exchanger_models[m] is None or exchanger_models[m].success != True:
+                continue
+            spec = match_specs[m]
+            ws = exchanger_models[m].warm_start
+            if ws != None:
+                self.warm_starts[spec['i'],spec['j']] = ws
+
     def _obtain_initializations(self, MENS_model,i,j,k):
         """This function is used to get the initializations for the individual mass exchanger 
         optimization from the solutions of the MINLP
@@ -103,7 +798,7 @@ class HybridStrategy(object):
     
         """ 
         ME_inits = dict()
-        ME_inits["height"]=MENS_model.height[i,j,k].value*MENS_model.heightcor[i,j,k]
+        ME_inits["height"]=MENS_model.height[i,j,k].value*value(MENS_model.heightcor[i,j,k])
         ME_inits["kw"]=float(value(MENS_model.kw))
         ME_inits["kwcor"]=float(value(MENS_model.kwcor[i,j,k]))
         ME_inits["surfarea"]=float(value(MENS_model.surfA[i,j,k]))
@@ -114,25 +809,108 @@ class HybridStrategy(object):
         ME_inits["packcost"]=float(value(MENS_model.packcost[i,j,k]))
         return ME_inits
         
-    def _apply_cor_filter(self, correction):
+    def _apply_cor_filter(self, correction, key = None):
         """Ensures that the correction factor is filtered so that the value is not 
         over-corrected between successive iterations.
         
         Args:
             correction (float): value of correction obtained from _get_correction_factors
+            key (tuple, optional): (match number, correction name). With the adaptive filter the band of this
+                                    correction is used instead of cor_filter_size
             
         returns:
             float: filtered correction factor
             
         """
-        if correction >= (self.cor_filter_size +1):
-            correction = self.cor_filter_size +1
-        elif correction <= (1-self.cor_filter_size):  
-            correction =1-self.cor_filter_size
+        band = self.cor_filter_size
+        if self.cor_filter == 'adaptive' and key != None:
+            self._raw_corrections[key] = correction
+            band = self.filter_bands.get(key, self.cor_filter_size)
+        if correction >= (band +1):
+            correction = band +1
+        elif correction <= (1-band):  
+            correction =1-band
         else:
             correction=correction
         return correction   
+
+    def _update_filter_bands(self, ic):
+        """Adapts the filter band of every correction from the unfiltered corrections of this iteration.
+
+        The band is widened (cor_filter_growth) when a correction moves in the same direction as in the previous
+        iteration and the real TAC improved, and narrowed (cor_filter_shrink) when its direction changes, within
+        cor_filter_bounds.
+
+        Args:
+            ic (int): iteration number
+
+        returns:
+            None
+        """
+        previous = [it for it in self.solution_log if it < ic]
+        improved = False
+        if ic in self.solution_log and previous:
+            improved = self.solution_log[ic] < self.solution_log[max(previous)]
+        band_min, band_max = self.cor_filter_bounds
+        for key, correction in self._raw_corrections.items():
+            direction = (correction > 1) - (correction < 1)
+            band = self.filter_bands.get(key, self.cor_filter_size)
+            last = self.cor_directions.get(key)
+            if last != None and direction != 0 and last != 0:
+                if direction == last and improved:
+                    band = min(band*self.cor_filter_growth, band_max)
+                elif direction != last:
+                    band = max(band*self.cor_filter_shrink, band_min)
+            self.filter_bands[key] = band
+            self.cor_directions[key] = direction
+        if self.filter_bands:
+            bands = list(self.filter_bands.values())
+            self.filter_band_log[ic] = {'min': min(bands), 'mean': sum(bands)/len(bands), 'max': max(bands)}
+            print("Adaptive filter bands: ", self.filter_band_log[ic])
+        self._raw_corrections = dict()
     
+    def _correction_inputs(self, MENS_model, i, j, k):
+        """Collects the values of the network model that the corrections of match (i,j,k) are computed from.
+
+        Args:
+            MENS_model (pyomo model): solved network model (MINLP or NLP suboptimization)
+            i (str): rich stream
+            j (str): lean stream
+            k (int): stage
+
+        returns:
+            dict: the approximate design values and the corrections used for the match
+        """
+        return {'kw': value(MENS_model.kw), 'kwcor': value(MENS_model.kwcor[i,j,k]), 'dia': value(MENS_model.dia[i,j,k]),
+                'diacor': value(MENS_model.diacor[i,j,k]), 'height': MENS_model.height[i,j,k].value,
+                'heightcor': value(MENS_model.heightcor[i,j,k]), 'packcost': value(MENS_model.packcost[i,j,k]),
+                'packcostcor': value(MENS_model.packcostcor[i,j,k]), 'surfA': value(MENS_model.surfA[i,j,k]),
+                'surfAcor': value(MENS_model.surfAcor[i,j,k])}
+
+    def _design_corrections(self, inputs, design, m = None):
+        """Computes the filtered corrections of a match from its detailed exchanger design.
+
+        Args:
+            inputs (dict): values of the network model for the match (see _correction_inputs)
+            design (ExchangerResult): the successfully solved exchanger of the match
+            m (int, optional): match number, used to select the band of the adaptive filter
+
+        returns:
+            dict: filtered value of each correction, keyed by the correction name
+        """
+        corrections = dict()
+        kw_c = value(design.koga)/(inputs['kw']*inputs['kwcor'])
+        corrections["kwcor"] = self._apply_cor_filter(kw_c, (m, "kwcor"))*inputs['kwcor']
+        dia_c = value(design.diameter)/(inputs['dia']*inputs['diacor'])
+        corrections["diacor"] = self._apply_cor_filter(dia_c, (m, "diacor"))*inputs['diacor']
+        height_c = value(design.height)/(inputs['height']*inputs['heightcor'])
+        corrections["heightcor"] = self._apply_cor_filter(height_c, (m, "heightcor"))*inputs['heightcor']
+        packcost_c = value(design.PackCost)/(inputs['packcost']*inputs['packcostcor'])
+        corrections["packcostcor"] = self._apply_cor_filter(packcost_c, (m, "packcostcor"))*inputs['packcostcor']
+        surfA_c = value(design.SpecAreaPacking)/(inputs['surfAcor']*inputs['surfA'])
+        corrections["surfAcor"] = self._apply_cor_filter(surfA_c, (m, "surfAcor"))*inputs['surfAcor']
+        return corrections
+
     def _get_correction_factors(self, MENS_model, ME_model, men_type = 'nlp'):
         """Obtains the correction factors by comparing the values from the MINLP and NLP suboptimization.
         
@@ -150,11 +928,6 @@ class HybridStrategy(object):
                                 
         """ 
         corrections = dict()
-        kwcor = dict()
-        diacor = dict()
-        heightcor = dict()
-        packcostcor=dict()
-        surfAcor = dict()
         m = 0
         for i in MENS_model.i:
             for j in MENS_model.j:
@@ -169,39 +942,99 @@ class HybridStrategy(object):
                         if ME_model[m].success== True:
                             #should possibly have a way here to tell whether the exchanger model solved correctly
                             #if it didn't then we should set the correction to 1 for this iteration
-                            kw_c = ME_model[m].koga.value/(MENS_model.kw*MENS_model.kwcor[i,j,k])
-                            kwcor = self._apply_cor_filter(kw_c)
-                            corrections[m,"kwcor"]=kwcor*MENS_model.kwcor[i,j,k]
-                            dia_c = ME_model[m].diameter.value/(MENS_model.dia[i,j,k]*MENS_model.diacor[i,j,k])
-                            diacor = self._apply_cor_filter(dia_c) 
-                            corrections[m,"diacor"] = diacor*MENS_model.diacor[i,j,k]
-                            height_c = ME_model[m].height.value/(MENS_model.height[i,j,k].value*MENS_model.heightcor[i,j,k])
-                            heightcor = self._apply_cor_filter(height_c) 
-                            corrections[m,"heightcor"] = heightcor*MENS_model.heightcor[i,j,k]
-                            packcost_c = ME_model[m].PackCost.value/(MENS_model.packcost[i,j,k]*MENS_model.packcostcor[i,j,k])
-                            x = self._apply_cor_filter(packcost_c)
-                            corrections[m,"packcostcor"] = x*MENS_model.packcostcor[i,j,k]
-                            surfA_c = ME_model[m].SpecAreaPacking.value/(MENS_model.surfAcor[i,j,k]*MENS_model.surfA[i,j,k])
-                            surfAcor = self._apply_cor_filter(surfA_c)
-                            corrections[m,"surfAcor"] = surfAcor*MENS_model.surfAcor[i,j,k]
+                            inputs = self._correction_inputs(MENS_model, i, j, k)
+                            for name, cor in self._design_corrections(inputs, ME_model[m], m).items():
+                                corrections[m,name] = cor
                         else:
-                            corrections[m,"kwcor"] = MENS_model.kwcor[i,j,k]
-                            corrections[m,"diacor"] = MENS_model.diacor[i,j,k]
-                            corrections[m,"heightcor"] = MENS_model.heightcor[i,j,k]
-                            corrections[m,"packcostcor"] = MENS_model.packcostcor[i,j,k]
-                            corrections[m,"surfAcor"] = MENS_model.surfAcor[i,j,k] 
+                            corrections[m,"kwcor"] = value(MENS_model.kwcor[i,j,k])
+                            corrections[m,"diacor"] = value(MENS_model.diacor[i,j,k])
+                            corrections[m,"heightcor"] = value(MENS_model.heightcor[i,j,k])
+                            corrections[m,"packcostcor"] = value(MENS_model.packcostcor[i,j,k])
+                            corrections[m,"surfAcor"] = value(MENS_model.surfAcor[i,j,k]) 
                         
                     else:
-                        corrections[m,"kwcor"] = MENS_model.kwcor[i,j,k]
-                        corrections[m,"diacor"] = MENS_model.diacor[i,j,k]
-                        corrections[m,"heightcor"] = MENS_model.heightcor[i,j,k]
-                        corrections[m,"packcostcor"] = MENS_model.packcostcor[i,j,k]
-                        corrections[m,"surfAcor"] = MENS_model.surfAcor[i,j,k]   
+                        corrections[m,"kwcor"] = value(MENS_model.kwcor[i,j,k])
+                        corrections[m,"diacor"] = value(MENS_model.diacor[i,j,k])
+                        corrections[m,"heightcor"] = value(MENS_model.heightcor[i,j,k])
+                        corrections[m,"packcostcor"] = value(MENS_model.packcostcor[i,j,k])
+                        corrections[m,"surfAcor"] = value(MENS_model.surfAcor[i,j,k])   
                     m += 1
                     
         return corrections   
   
-    def _check_convergence(self, MENS_model, exchanger_models, m, tol = 0.02, previous_corrections=None, men_type = 'nlp'):
+    def _accelerate_corrections(self, previous_corrections, new_corrections):
+        """Accelerates the fixed-point iteration on the correction factors.
+
+        The outer loop of the strategy is a fixed-point iteration x = G(x), where G(x) are the filtered corrections
+        obtained from the exchanger models when the MINLP was solved with corrections x. Either Aitken extrapolation
+        (componentwise, over the last three G values) or Anderson mixing (over the last cor_acceleration_memory pairs)
+        is used. The filtered update G(x) is returned whenever the accelerated step is not trusted, i.e. when the
+        history is too short, the residual grew, the step is ill-conditioned or it leaves the filter band.
+
+        Args:
+            previous_corrections (dict): corrections used in the iteration that was just solved (x)
+            new_corrections (dict): filtered corrections obtained in this iteration (G(x))
+
+        returns:
+            dict: corrections to be used in the next iteration
+        """
+        keys = sorted(new_corrections)
+        x = numpy.array([float(value(previous_corrections.get(key, 1))) for key in keys])
+        g = numpy.array([float(value(new_corrections[key])) for key in keys])
+        if self._cor_history and self._cor_history[-1][0] != keys:
+            #the set of corrections changed so the history cannot be used
+            self._cor_history = []
+        self._cor_history.append((keys, x, g))
+        self._cor_history = self._cor_history[-(self.cor_acceleration_memory + 1):]
+        self.acceleration_log[self.iter_count] = 'filtered'
+        filtered = dict(zip(keys, g))
+
+        if len(self._cor_history) < 2:
+            return filtered
+        f = g - x
+        f_prev = self._cor_history[-2][2] - self._cor_history[-2][1]
+        if numpy.linalg.norm(f) > numpy.linalg.norm(f_prev):
+            print("Correction residual increased, acceleration history is reset")
+            self._cor_history = [self._cor_history[-1]]
+            return filtered
+
+        if self.cor_acceleration == 'aitken':
+            if len(self._cor_history) < 3:
+                return filtered
+            g2 = self._cor_history[-3][2]
+            g1 = self._cor_history[-2][2]
+            d1 = g1 - g2
+            d2 = g - g1
+            denom = d2 - d1
+            accelerated = g.copy()
+            ok = numpy.abs(denom) > 1e-12
+            accelerated[ok] = g[ok] - d2[ok]**2/denom[ok]
+        else:
+            x_hist = numpy.array([h[1] for h in self._cor_history])
+            g_hist = numpy.array([h[2] for h in self._cor_history])
+            f_hist = g_hist - x_hist
+            dF = numpy.diff(f_hist, axis = 0).T
+            dG = numpy.diff(g_hist, axis = 0).T
+            if numpy.linalg.norm(dF) <= 1e-12:
+                return filtered
+            gamma = numpy.linalg.lstsq(dF, f, rcond = None)[0]
+            if not numpy.all(numpy.isfinite(gamma)) or numpy.abs(gamma).max() > 1e3:
+                print("Anderson mixing is ill-conditioned, filtered corrections are used")
+                return filtered
+            accelerated = g - dG.dot(gamma)
+
+        #safeguard: each accelerated correction must stay positive and within the filter band around x
+        ratio = accelerated/x
+        bad = (~numpy.isfinite(accelerated)) | (accelerated <= 0) | (ratio > 1 + self.cor_filter_size) | (ratio < 1 - self.cor_filter_size)
+        if self.cor_acceleration == 'anderson' and numpy.any(bad):
+            print("Anderson step leaves the filter band, filtered corrections are used")
+            return filtered
+        accelerated[bad] = g[bad]
+        self.acceleration_log[self.iter_count] = self.cor_acceleration
+        print("Corrections accelerated with ", self.cor_acceleration)
+        return dict(zip(keys, accelerated))
+
+    def _check_convergence(self, MENS_model, exchanger_models, m, tol = 0.02, previous_corrections=None, men_type = 'nlp', partial = False):
         """Convergence checking for the iterative procedure.
         
         This function compares the previous solutions 2 solutions as well as the globally best solution
@@ -221,6 +1054,8 @@ class HybridStrategy(object):
                                             iteration when the user knows the last sets of corrections
                                             
             men_type (str): tells us if we have the MINLP or NLP subopt as optimal
+            partial (bool, optional): True if some exchangers of the network are still running (asynchronous mode).
+                                            The network is then not accepted as best and convergence is not declared
         
         Returns:
             bool (boolean): returns True if model is converged within tolerance or False if not 
@@ -231,45 +1066,25 @@ class HybridStrategy(object):
         MENval = MENS_model.TACeqn()
         print("MINLP objective function value is ",MENval)
         if self.best_objective_MINLP == None:
-            self.best_network_MINLP = MENS_model
+            self.best_network_MINLP = NetworkResult.from_model(MENS_model)
             self.best_objective_MINLP = MENval
         elif MENval <= self.best_objective_MINLP:
             self.best_objective_MINLP = MENval
-            self.best_network_MINLP = MENS_model
+            self.best_network_MINLP = NetworkResult.from_model(MENS_model)
         else:
             pass
         
         self.MENval_log[self.iter_count] = MENval
                
         #print(type(MENS_model.TACeqn()))
-        capval = 0
-        count = 0
-        #print(exchanger_models)
-        nlp_exshelval = 0
-        nlp_packcost = 0
-        discard = False
-        exchangers = 0
-        for i in MENS_model.i:
-            for j in MENS_model.j:
-                for k in MENS_model.k:
-                    print("do we get here?")
-                    yvals = {}
-                    if men_type == 'minlp':
-                        yvals[i,j,k] = value(MENS_model.y[i,j,k])                            
-                    else:
-                        yvals[i,j,k] = MENS_model.y[i,j,k]
-                    
-                    if yvals[i,j,k]>=0.99 and MENS_model.M[i,j,k].value!=0 and count in exchanger_models:
-                        r=exchanger_models[count].Obj4()
-                        nlp_exshelval += value(exchanger_models[count].AF)*23805*(value(exchanger_models[count].diameter)**0.57)*1.15*value(exchanger_models[count].height) 
-                        nlp_packcost += value(exchanger_models[count].AF)*pi*(value(exchanger_models[count].diameter)**2)/4*value(exchanger_models[count].height)*value(exchanger_models[count].PackCost)
-                        capval+=r
-                        print("exchanger.success for exchanger ", i,j,k, "=", exchanger_models[count].success)
-                        exchangers += 1
-                        if exchanger_models[count].success == False:
-                            discard = True
-                            print("DISCARD THIS NLP SOLUTION. At least 1 model failed")
-                    count+=1
+        costs = self._real_TAC(MENS_model, exchanger_models, men_type)
+        capval = costs['capcost_nlp']
+        nlp_exshelval = costs['shell_costs']
+        nlp_packcost = costs['pack_costs']
+        discard = costs['discard']
+        exchangers = costs['exchangers']
+        if discard == True:
+            print("DISCARD THIS NLP SOLUTION. At least 1 model failed")
         print("NLP MEX shell costs: ", nlp_exshelval) 
         print("NLP MEX pack costs: ", nlp_packcost) 
         print("NLP MEX cap costs: ", capval) 
@@ -287,20 +1102,16 @@ class HybridStrategy(object):
         minlpcapcost=minlppackcost+minlpshellcost
         print("MINLP cap costs:", minlpcapcost)
         
-        fixcosts = 0
-        for i in MENS_model.i:
-            for j in MENS_model.j:
-                for k in MENS_model.k:
-                    fixcosts+=(value(MENS_model.fixcost)*value(MENS_model.y[i,j,k]))
+        fixcosts = costs['fix_costs']
         print("NLP MEX fix costs: ", fixcosts) 
-        utilitycosts = 0
-        for j in MENS_model.j:
-            utilitycosts += value(MENS_model.L1[j])*value(MENS_model.AC[j])
+        utilitycosts = costs['utility_cost']
         print("NLP MEX utility costs: ", utilitycosts)     
-        realval = capval+ fixcosts+ utilitycosts
+        realval = costs['real_TAC']
         
         print("NLP objective function value is ",realval)
-        if discard == False:
+        if partial == True:
+            print("Some exchangers of this network are still running, its real TAC is incomplete and it cannot be taken as the best")
+        elif discard == False:
             
             if self.best_objective_real == None:
                 self.best_objective_real = realval
@@ -343,6 +1154,80 @@ class HybridStrategy(object):
                 previous_corrections[i] = 1
         
         # second we compare the correction factors 
+        stop_flag2 = self._corrections_converged(previous_corrections, new_cors, tol)
+                
+        print("Stop_flag 1 = difference between MINLP and NLP", stop_flag1)   
+        print("Stop_flag 2 = difference between correction factors", stop_flag2)          
+        if partial == True:
+            return False
+        if stop_flag2 == True or stop_flag1 == True and self.best_objective_real != None:
+            print("either flag is true. This means that the solution was found")
+            return True
+        else:
+            return False
+        
+    def _real_TAC(self, MENS_model, exchanger_models, men_type = 'nlp'):
+        """Computes the real TAC of a network from its detailed exchanger designs.
+
+        The capital costs of the selected matches are taken from the exchanger designs, the fixed and utility costs
+        from the network model. The models and the HybridStrategy are not changed.
+
+        Args:
+            MENS_model (pyomo model): solved network model (MINLP or NLP suboptimization)
+            exchanger_models (dict): ExchangerResults of the selected matches, indexed by match number
+            men_type (str): 'minlp' or 'nlp', the type of MENS_model
+
+        returns:
+            dict: real_TAC, capcost_nlp, shell_costs, pack_costs, fix_costs, utility_cost, the number of exchangers
+                  and whether any exchanger failed ('discard')
+        """
+        capval = 0
+        count = 0
+        nlp_exshelval = 0
+        nlp_packcost = 0
+        discard = False
+        exchangers = 0
+        for i in MENS_model.i:
+            for j in MENS_model.j:
+                for k in MENS_model.k:
+                    yvals = {}
+                    if men_type == 'minlp':
+                        yvals[i,j,k] = value(MENS_model.y[i,j,k])                            
+                    else:
+                        yvals[i,j,k] = MENS_model.y[i,j,k]
+                    
+                    if yvals[i,j,k]>=0.99 and MENS_model.M[i,j,k].value!=0 and count in exchanger_models:
+                        r=value(exchanger_models[count].Obj4)
+                        nlp_exshelval += value(exchanger_models[count].AF)*23805*(value(exchanger_models[count].diameter)**0.57)*1.15*value(exchanger_models[count].height) 
+                        nlp_packcost += value(exchanger_models[count].AF)*pi*(value(exchanger_models[count].diameter)**2)/4*value(exchanger_models[count].height)*value(exchanger_models[count].PackCost)
+                        capval+=r
+                        exchangers += 1
+                        if exchanger_models[count].success == False:
+                            discard = True
+                    count+=1
+        fixcosts = 0
+        for i in MENS_model.i:
+            for j in MENS_model.j:
+                for k in MENS_model.k:
+                    fixcosts+=(value(MENS_model.fixcost)*value(MENS_model.y[i,j,k]))
+        utilitycosts = 0
+        for j in MENS_model.j:
+            utilitycosts += value(MENS_model.L1[j])*value(MENS_model.AC[j])
+        return {'real_TAC': capval + fixcosts + utilitycosts, 'capcost_nlp': capval, 'shell_costs': nlp_exshelval,
+                'pack_costs': nlp_packcost, 'fix_costs': fixcosts, 'utility_cost': utilitycosts, 'exchangers': exchangers,
+                'discard': discard}
+
+    def _corrections_converged(self, previous_corrections, new_cors, tol):
+        """Compares the new correction factors with the previous ones.
+
+        Args:
+            previous_corrections (dict): correction factors used in this iteration
+            new_cors (dict): correction factors obtained from this iteration
+            tol (float): allowed relative change of every correction factor
+
+        returns:
+            bool: True if every correction factor changed by less than tol (only from the third iteration)
+        """
         stop_flag2 = False
         stop_dict = dict()
         if self.iter_count>=2:
@@ -363,15 +1248,74 @@ class HybridStrategy(object):
         for k,v in stop_dict.items():
             if v == False:
                 stop_flag2 = False
-                
-        print("Stop_flag 1 = difference between MINLP and NLP", stop_flag1)   
-        print("Stop_flag 2 = difference between correction factors", stop_flag2)          
-        if stop_flag2 == True or stop_flag1 == True and self.best_objective_real != None:
-            print("either flag is true. This means that the solution was found")
-            return True
-        else:
-            return False
-        
+        return stop_flag2
+
+    def _evaluation_of_iteration(self, MENS_model, exchanger_models, men_type):
+        """Collects the evaluation of the network of the current iteration so that it can be stored in the topology cache.
+
+        Args:
+            MENS_model (pyomo model): the network model passed to _check_convergence
+            exchanger_models (dict): ExchangerResults of the solved exchangers, indexed by match number
+            men_type (str): tells us if we have the MINLP or NLP subopt as optimal
+
+        returns:
+            dict: real TAC, costs and exchangers of the network
+        """
+        ic = self.iter_count
+        return {'iteration': ic, 'men_type': men_type, 'real_TAC': self.solution_log[ic], 'capcost_nlp': self.capcost_log_nlp[ic],
+                'capcost_MINLP': self.capcost_log_MINLP[ic], 'utility_cost': self.utility_cost[ic], 'exchangers': self.exchanger_log[ic],
+                'failed': self.failed_exchanger[ic], 'exchanger_models': dict(exchanger_models)}
+
+    def _reuse_network_evaluation(self, MENS_model, evaluation, tol = 0.02):
+        """Convergence checking for an iteration whose network was found in the topology cache.
+
+        The real TAC, costs and exchangers of the earlier evaluation are logged for this iteration. The MINLP objective
+        is taken from the MINLP solved in this iteration, as it depends on the current corrections, and the corrections
+        are computed again from the stored exchanger designs and this MINLP, so that a revisit does not bring back the
+        corrections of the earlier iteration.
+
+        Args:
+            MENS_model (pyomo model): solved MINLP model of this iteration
+            evaluation (dict): the evaluation stored in the topology cache
+            tol (float, default= 0.02): the tolerance set by the user for when to stop the iterations
+
+        returns:
+            bool: True if the iterations are converged
+        """
+        ic = self.iter_count
+        print("Network of iteration ", ic, " was evaluated in iteration ", evaluation['iteration'], ". The suboptimization and exchangers are not solved again")
+        MENval = MENS_model.TACeqn()
+        realval = evaluation['real_TAC']
+        if self.best_objective_MINLP == None or MENval <= self.best_objective_MINLP:
+            self.best_objective_MINLP = MENval
+            self.best_network_MINLP = NetworkResult.from_model(MENS_model)
+        self.MENval_log[ic] = MENval
+        if evaluation['failed'] == False:
+            if self.best_objective_real == None or realval <= self.best_objective_real:
+                self.best_objective_real = realval
+                self.best_net_iter = ic
+                self.best_exchangers = dict(evaluation['exchanger_models'])
+        per_diff = ((realval-MENval)/realval)*100
+        print("difference between real solution and MINLP solution is (%):", per_diff)
+        self.NLP_log[ic] = realval
+        self.solution_log[ic] = realval
+        self.MINLP_TAC_log[ic] = MENval
+        self.exchanger_log[ic] = evaluation['exchangers']
+        self.capcost_log_MINLP[ic] = evaluation['capcost_MINLP']
+        self.capcost_log_nlp[ic] = evaluation['capcost_nlp']
+        self.failed_exchanger[ic] = evaluation['failed']
+        self.utility_cost[ic] = evaluation['utility_cost']
+        self.diff_NLP_MINLP_log[ic] = per_diff
+        new_cors = self._get_correction_factors(MENS_model, evaluation['exchanger_models'], men_type = 'minlp')
+        self.correction_log[ic] = new_cors
+        stop_flag1 = abs(per_diff) <= tol*100
+        stop_flag2 = False
+        if bool(self.corrections) == True:
+            stop_flag2 = self._corrections_converged(self.corrections, new_cors, tol)
+        print("Stop_flag 1 = difference between MINLP and NLP", stop_flag1)
+        print("Stop_flag 2 = difference between correction factors", stop_flag2)
+        return stop_flag2 == True or stop_flag1 == True and self.best_objective_real != None
+
     def _generate_binary_cut(self, MENS_model, iteration):
         """Binary cut generator for the MINLP model
         
@@ -436,7 +1380,7 @@ class HybridStrategy(object):
         self.symmetry_cuts[iteration] = sym_cuts
         
         
-    def run_hybrid_strategy(self, max_iter=None, cor_filter_size=None,rich_data=None,lean_data=None, correction_factors = None, parameter_data=None, stream_properties = None, tol = 0.02, exname = None, non_iso = True, stages = None, superstruct = 'SBS', bin_cuts = False):
+    def run_hybrid_strategy(self, max_iter=None, cor_filter_size=None,rich_data=None,lean_data=None, correction_factors = None, parameter_data=None, stream_properties = None, tol = 0.02, exname = None, non_iso = True, stages = None, superstruct = 'SBS', bin_cuts = False, parallel = False, max_workers = None, race_finite_elements = False, design_cache = False, design_cache_tol = 1e-4, design_cache_size = 256, warm_start = False, checkpoint_file = None, resume_from = None, trace_file = None, cor_acceleration = None, cor_acceleration_memory = 3, persistent_model = False, recovery_mode = None, recovery_window = 60, time_budget = None, log_store = None, verbosity = None, topology_cache = False, topology_cache_tol = 1e-2, incremental = False, incremental_tol = 1e-3, evaluate_both = False, async_fraction = None, cor_filter = 'fixed', cor_filter_bounds = None, auto_omega = False, options = None):
         """Starts the hybrid strategy iterative procedure by solving MINLP and NLP problems
         
         This function will be called by the user when they want to run the 
@@ -450,6 +1394,11 @@ class HybridStrategy(object):
             cor_filter_size (int, optional): default = 0.5. User should input small number (0.02). 
                                             Represents the allowable change as a percentage between runs (0.02=2%)
                                             default value means corrections are essentially not filtered.
+            cor_filter (str, optional):     'fixed' to clip every correction to cor_filter_size, or 'adaptive' to keep a band per
+                                            correction, starting at cor_filter_size, that widens while the correction keeps moving in
+                                            the same direction and the real TAC improves, and narrows when it oscillates. Default is 'fixed'
+            cor_filter_bounds (tuple, optional): (smallest, largest) band of the adaptive filter. Default is
+                                            (cor_filter_size/4, min(4*cor_filter_size, 0.9))
             rich_data (pandas DataFrame):   DataFrame of rich stream name, concentration in, concentration out and flowrates.
             lean_data (pandas DataFrame):   DataFrame of lean stream name, concentration in, concentration out and flowrates.
             correction_factors (dictionary): Dictionary of all correction factors
@@ -461,9 +1410,84 @@ class HybridStrategy(object):
             superstructure (str,optional):  The type of superstructure to be used. SBS and SWS currently supported
             bin_cut (bool, optional):       If True, binary cut is generated to exclude a particular set of binary variables from all 
                                             future iterations. Default is False.
+            parallel (bool, optional):      If True, the detailed exchanger models of each iteration are solved in a pool of
+                                            worker processes rather than one after the other. Default is False.
+            max_workers (int, optional):    Number of worker processes used when parallel is True. Default is the number of CPUs.
+            race_finite_elements (bool, optional): If True, the finite element variants of each exchanger are solved at the
+                                            same time in the worker pool, race_width (default 2) of them per match at once, and the
+                                            coarsest one that succeeds is kept, instead of increasing the number of elements one
+                                            solve at a time. A finer variant already running when a coarser one succeeds cannot be
+                                            stopped, so each match may use up to race_width - 1 extra solves. Default is False.
+            design_cache (bool, optional):  If True, solved exchanger designs are memoized for the run and a match with the same
+                                            boundary concentrations, flows and initializations is not re-solved. Default is False.
+            design_cache_tol (float, optional): relative tolerance used to compare the boundary conditions in the design cache.
+                                            Default is 1e-4
+            design_cache_size (int, optional): maximum number of designs held in the design cache. Default is 256
+            topology_cache (bool, optional): If True, the real TAC and exchanger designs of every network evaluated as the MINLP
+                                            are kept, and when the MINLP returns the same matches with the same stage compositions
+                                            again the suboptimization and exchanger solves are skipped. The corrections are
+                                            computed from the kept designs and the MINLP of the revisit. A network for which the
+                                            suboptimization was chosen is not kept, so its revisits run the suboptimization
+                                            again. Default is False.
+            topology_cache_tol (float, optional): relative tolerance used to compare the stage compositions in the topology
+                                            cache. Default is 1e-2
+            incremental (bool, optional):   If True, a selected match whose inlet and outlet concentrations and flows are within
+                                            incremental_tol of its last successful solve keeps that design, and only the matches
+                                            that moved are solved again. The reuse counts are kept in reuse_log. Default is False.
+            incremental_tol (float, optional): relative tolerance on the boundary conditions in the incremental mode. Default is 1e-3
+            evaluate_both (bool, optional): If True, the exchangers of both the MINLP network and the non-isocompositional
+                                            suboptimization network are designed at the same time in the worker pool, and the
+                                            network with the lower real TAC is kept instead of the one with the lower approximate
+                                            TAC. The designs of the other network are also kept in the design cache, warm starts
+                                            and incremental mode. Needs non_iso and parallel, and cannot be combined with
+                                            race_finite_elements or async_fraction. Default is False.
+            async_fraction (float, optional): fraction (0 to 1] of the exchangers of an iteration that must be solved before the
+                                            next MINLP is started. The exchangers are solved in the worker pool, matches still running
+                                            keep their last corrections and their results are folded into the corrections of a later
+                                            iteration. An iteration with late exchangers is not accepted as best or as converged.
+                                            Default is None, every iteration waits for all its exchangers.
+            warm_start (bool, optional):    If True, the profiles and design of each solved exchanger are kept and used to
+                                            initialize the same (i,j) match in later iterations. Default is False.
+            checkpoint_file (str, optional): name of a JSON file to which the state of the run (corrections, cuts, best solution
+                                            and logs) is written after every iteration. Default is None, no checkpoint.
+            resume_from (str, optional):    name of a checkpoint file from a previous run. The iteration counter, corrections,
+                                            cut pool, best solution, acceleration history and adaptive filter bands are restored
+                                            and the iterations continue from there. The warm starts, design and topology caches,
+                                            last designs of the incremental mode and late asynchronous exchangers are not stored
+                                            and start empty, so the first iterations after a resume may solve exchangers that an
+                                            uninterrupted run would have reused.
+            trace_file (str, optional):     name of a JSON lines file to which the time spent in each phase of every iteration
+                                            is appended. Only the last 10 records are then kept in self.trace.records. Default
+                                            is None, every record is kept in self.trace.records.
+            cor_acceleration (str, optional): 'aitken' or 'anderson' to accelerate the fixed-point iteration on the correction
+                                            factors over the history of previous iterations. The filtered update is used whenever
+                                            the accelerated step fails the safeguards. Default is None, no acceleration.
+            cor_acceleration_memory (int, optional): number of previous iterations used by Anderson mixing. Default is 3
+            persistent_model (bool, optional): If True, the NLP initialization model of the MENS is built once and only its
+                                            correction factors and omega are updated between iterations. Default is False.
+            recovery_mode (str, optional):  'first' or 'best' to run the recovery of an infeasible MINLP as a batch of
+                                            (min_height, omega) candidates in worker processes. 'first' accepts the first
+                                            candidate that solves, 'best' the lowest TAC found within recovery_window seconds
+                                            of the first solution. Default is None, the serial recovery loop.
+            recovery_window (float, optional): time window in seconds used by the 'best' recovery mode. Default is 60
+            auto_omega (bool, optional):    If True, the omega of every pair of streams is the smallest valid big-M computed from the
+                                            composition bounds and EMAC (MENS.tight_omega) instead of the scalar of the parameter data,
+                                            and the recovery of an infeasible MINLP does not retry with smaller omegas. Default is False.
+            time_budget (float, optional):  wall-clock time in seconds allowed for the run. The time limit of every MINLP, NLP and
+                                            exchanger solve is capped by the time left, no new iteration is started if the previous
+                                            iterations suggest it cannot finish, and an iteration whose exchangers could not all be
+                                            solved in time is discarded. Default is None, no time budget.
+            log_store (str, optional):      name of an SQLite file to which the objective values, costs, correction factors and
+                                            selected matches are appended at the end of every iteration (see LogStore). The
+                                            csv files are then not written at the end of the run. Default is None.
+            verbosity (str, optional):      'quiet', 'info' or 'debug'. The values of the model components are only formatted
+                                            and written in 'debug'. Default is None, the current level of the MExNetS logger
+                                            (debug unless changed with set_verbosity).
+            options (HybridOptions, optional): the options from parallel to auto_omega grouped in one object. They are then
+                                            not given as keyword arguments. Default is None, the keyword arguments are used.
         
         Returns:
-            print that tells the user that the iterations have ended
+            tuple: the best real objective found and the exchangers of the best network (best_objective_real, best_exchangers)
             
         """
         if isinstance(max_iter, int):
@@ -487,6 +1511,62 @@ class HybridStrategy(object):
         else:
             raise RuntimeError("Must input an integer or leave to default for stages")
         
+        arguments = locals()
+        given = HybridOptions(**dict((name, arguments[name]) for name in HybridOptions.defaults))
+        if options == None:
+            options = given
+        elif not isinstance(options, HybridOptions):
+            raise RuntimeError("options must be a HybridOptions object or left to default")
+        elif given.non_default():
+            raise RuntimeError("Give the options either in options or as keyword arguments, not both: " + str(sorted(given.non_default())))
+        options.validate(non_iso)
+        self.options = options
+        parallel = options.parallel
+        race_finite_elements = options.race_finite_elements
+        warm_start = options.warm_start
+        checkpoint_file = options.checkpoint_file
+        resume_from = options.resume_from
+        persistent_model = options.persistent_model
+        auto_omega = options.auto_omega
+        evaluate_both = options.evaluate_both
+        cor_filter = options.cor_filter
+        cor_filter_bounds = options.cor_filter_bounds
+
+        self.trace = IterationTrace(options.trace_file)
+        self.recovery_mode = options.recovery_mode
+        self.recovery_window = options.recovery_window
+        self.auto_omega = auto_omega
+        if options.time_budget != None:
+            self._deadline = time.time() + options.time_budget
+            print('User-defined time budget: ', options.time_budget, ' s')
+        else:
+            self._deadline = None
+        self._iteration_times = []
+        set_solver_deadline(self._deadline)
+        if options.verbosity != None:
+            set_verbosity(options.verbosity)
+        if options.log_store != None:
+            self.log_store = IterationLogStore(options.log_store, run_name = exname)
+        else:
+            self.log_store = None
+        self.cor_acceleration = options.cor_acceleration
+        self.cor_acceleration_memory = options.cor_acceleration_memory
+        self._cor_history = []
+        if options.design_cache:
+            self.design_cache = ExchangerDesignCache(rel_tol = options.design_cache_tol, max_size = options.design_cache_size)
+        else:
+            self.design_cache = None
+        self.async_fraction = options.async_fraction
+        self._late_exchangers = dict()
+        self.incremental = options.incremental
+        self.incremental_tol = options.incremental_tol
+        self.last_designs = dict()
+        if options.topology_cache:
+            self.topology_cache = TopologyCache(rel_tol = options.topology_cache_tol)
+        else:
+            self.topology_cache = None
+        self.max_workers = options.max_workers
+        
         self.cor_filter_size = cor_filter_size    
         if isinstance(self.cor_filter_size, (int, float)):
             pass
@@ -495,8 +1575,13 @@ class HybridStrategy(object):
             self.cor_filter_size=0.5
         else:
             raise RuntimeError("Must input a number or leave to default")
-        print(type(superstruct))
-        print(superstruct)
+        if cor_filter_bounds == None:
+            cor_filter_bounds = (self.cor_filter_size/4, min(4*self.cor_filter_size, 0.9))
+        self.cor_filter = cor_filter
+        self.cor_filter_bounds = cor_filter_bounds
+        self._raw_corrections = dict()
+        log_message(type(superstruct))
+        log_message(superstruct)
         if not isinstance(superstruct, str):
             raise RuntimeError("Must input superstructure type as string")
         #elif superstruct != 'SBS' or superstruct != 'SWS':
@@ -509,79 +1594,123 @@ class HybridStrategy(object):
         print('User-defined correction factor filter: ', self.cor_filter_size)
         self.tol = tol
         #initialize the MENS class here with the data from files. Replace this with values from provide_problem_data eventually
-        Ex1MEN = MENS(rich_data=rich_data,lean_data=lean_data, correction_factors = correction_factors, parameter_data=parameter_data, stream_properties = stream_properties, stages = stages, superstruct = superstruct)
+        mens_args = dict(rich_data=rich_data,lean_data=lean_data, correction_factors = correction_factors, parameter_data=parameter_data, stream_properties = stream_properties, stages = stages, superstruct = superstruct, auto_omega = auto_omega)
+        Ex1MEN = MENS(persistent = persistent_model, **mens_args)
+        if auto_omega:
+            print("Omega computed from the composition bounds and EMAC:")
+            for (i, j), om in sorted(Ex1MEN.tight_omega().items()):
+                print("    ", i, j, om)
+
+        start_iter = 0
+        if resume_from != None:
+            last_iter = load_checkpoint(resume_from, self)
+            start_iter = last_iter + 1
+            print("Resuming from checkpoint ", resume_from, " after iteration ", last_iter)
+            print("Best solution so far found at iteration ", self.best_net_iter, ": ", self.best_objective_real)
 
         #begin the iterative procedure
-        for ic in range(max_iter):
+        for ic in range(start_iter, max_iter):
+            if self._deadline != None:
+                remaining = self._deadline - time.time()
+                expected = 0
+                if self._iteration_times:
+                    expected = sum(self._iteration_times)/len(self._iteration_times)
+                if remaining <= 0 or remaining < expected:
+                    print("Time budget: ", max(remaining, 0), " s left and an iteration takes about ", expected, " s. No new iteration is started")
+                    break
             print("------------------------------------------------------------------------------------------------------------------------------------")
             print("------------------------------------------------------------------------------------------------------------------------------------")
             print("------------------------------------------ITERATION NUMBER: ", ic, "-----------------------------------------------------------")
             print("------------------------------------------------------------------------------------------------------------------------------------")
             print("------------------------------------------------------------------------------------------------------------------------------------")
-            iter_time = time.clock()
+            iter_time = time.perf_counter()
+            self.trace.start_iteration(ic)
             #these values are the initial values used to select matches between the NLP initialization of the MINLP and the MINLP
             min_height=0.01
             #min_mass_ex = 1e-7
             #initialize the MINLP with the NLP
-            MEN_init, success_init = Ex1MEN.NLP_MENS_init(correction_factors=self.corrections)
+            if self._late_exchangers:
+                with self.trace.phase("fold_late_exchangers"):
+                    folded = self._fold_late_exchangers(warm_start)
+                print(folded, " late exchangers folded into the corrections, ", len(self._late_exchangers), " still running")
+            with self.trace.phase("NLP_MENS_init"):
+                MEN_init, success_init = Ex1MEN.NLP_MENS_init(correction_factors=self.corrections)
             print("Values used in the initialisation")
-            MEN_init.height.pprint()
-            MEN_init.M.pprint()
-            MEN_init.L.pprint()
-            MEN_init.cr.pprint()
-            MEN_init.cl.pprint()
-            MEN_init.dcin.pprint()
-            MEN_init.dcout.pprint()
-            MEN_init.y.pprint()
+            dump(MEN_init.height)
+            dump(MEN_init.M)
+            dump(MEN_init.L)
+            dump(MEN_init.cr)
+            dump(MEN_init.cl)
+            dump(MEN_init.dcin)
+            dump(MEN_init.dcout)
+            dump(MEN_init.y)
             #attempt to solve the first MINLP
-            currentOmega = MEN_init.omega
-            if success_init == True:
-                MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init, min_height_from_nlp=min_height, bin_cuts = self.binary_cuts)
-            else:
-                MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init, bin_cuts = self.binary_cuts)
+            currentOmega = Ex1MEN.get_parameter('omega')
+            with self.trace.phase("MINLP_MENS_full"):
+                if success_init == True:
+                    MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init, min_height_from_nlp=min_height, bin_cuts = self.binary_cuts)
+                else:
+                    MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init, bin_cuts = self.binary_cuts)
             #the aim of this loop is to make the MINLP more robust by changing which heights from the NLP are included in the MINLP
             #not sure how rigorous this really is as it only changes the selected matches by lowering the heights and masses
             #exchanged between the NLP and MINLP. Exits the program if no solution is found to MINLP.
             #would like to include more options and solvers for this (and different OMEGAs and EMACs)
             
             if (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):  
-                #change for a while loop with a max iter
-                for i in range(20):
-                    print("MINLP didn't solve, attempting new matches")  
-                    mh=min_height/((i+1)*5)
-                    #print("mh",mh)
-                    MEN_init = Ex1MEN.NLP_MENS_init(correction_factors=self.corrections)
-                    MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init,min_height_from_nlp=(mh), bin_cuts = self.binary_cuts)
-                    
-                    if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
-                        print("MINLP solved")
+                if self.recovery_mode != None:
+                    with self.trace.phase("recovery_sweep"):
+                        rec_solved, rec_results = self._parallel_recovery(Ex1MEN, MEN_init, mens_args, min_height, ic)
+                    if rec_solved is not None:
+                        MENS_solved, results = rec_solved, rec_results
                         if bin_cuts ==True:
                             self._generate_binary_cut(MENS_solved, ic)
-                        break
-                    #elif (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):  
-                    #    print("MINLP didn't solve, attempting new matches")  
-                    #    mm=min_mass_ex/((i+1)*10)
-                    #    #print("mm", mm)
-                    #    MEN_init = Ex1MEN.NLP_MENS_init(correction_factors=self.corrections)
-                    #    MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init,min_height_from_nlp=(mh),min_mass_ex_from_nlp=mm)
-                    #    if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
-                    #        print("MINLP solved")
-                    #        break
-                    for i in range(50):
-                        if (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):  
-                            print("MINLP didn't solve, attempting new matches with diff omega")
-                            omegaNew = currentOmega/1.5
-                            MEN_init = Ex1MEN.NLP_MENS_init(correction_factors=self.corrections, omega = omegaNew)
-                            MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init, omega=omegaNew)
-                            
-                            print("new Omega", omegaNew)
-                            if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
-                                print("MINLP solved")
-                                if bin_cuts ==True:
-                                    self._generate_binary_cut(MENS_solved, ic)
+                else:
+                    #change for a while loop with a max iter
+                    for i in range(20):
+                        if self._out_of_time():
+                            print("Time budget exhausted, the recovery of the MINLP is stopped")
+                            break
+                        print("MINLP didn't solve, attempting new matches")  
+                        mh=min_height/((i+1)*5)
+                        #print("mh",mh)
+                        #the NLP initialization is not modified by the MINLP, so it is reused for every retry
+                        with self.trace.phase("recovery_retry", retry = i, min_height = mh):
+                            MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init,min_height_from_nlp=(mh), bin_cuts = self.binary_cuts)
+                    
+                        if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
+                            print("MINLP solved")
+                            if bin_cuts ==True:
+                                self._generate_binary_cut(MENS_solved, ic)
+                            break
+                        #elif (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):  
+                        #    print("MINLP didn't solve, attempting new matches")  
+                        #    mm=min_mass_ex/((i+1)*10)
+                        #    #print("mm", mm)
+                        #    MEN_init, success_init = Ex1MEN.NLP_MENS_init(correction_factors=self.corrections)
+                        #    MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init,min_height_from_nlp=(mh),min_mass_ex_from_nlp=mm)
+                        #    if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
+                        #        print("MINLP solved")
+                        #        break
+                        #with auto_omega the omega is already the smallest valid one, so smaller values are not tried
+                        for i in range(0 if self.auto_omega else 50):
+                            if self._out_of_time():
                                 break
-                            else: 
-                                currentOmega = omegaNew 
+                            if (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):  
+                                print("MINLP didn't solve, attempting new matches with diff omega")
+                                omegaNew = currentOmega/1.5
+                                #omega only enters the NLP through omega*(1-y) with all its binaries at 1, so the
+                                #same initialization is used with the new omega
+                                with self.trace.phase("recovery_retry_omega", retry = i):
+                                    MENS_solved,results = Ex1MEN.MINLP_MENS_full(MEN_init, omega=omegaNew)
+                            
+                                print("new Omega", omegaNew)
+                                if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
+                                    print("MINLP solved")
+                                    if bin_cuts ==True:
+                                        self._generate_binary_cut(MENS_solved, ic)
+                                    break
+                                else: 
+                                    currentOmega = omegaNew 
             else:
                 print("The first solve of the MINLP is feasible")
                 if bin_cuts ==True:
@@ -589,14 +1718,14 @@ class HybridStrategy(object):
             
             #print(MENS_solved)
             #print(results)
-            MENS_solved.height.pprint()
-            MENS_solved.M.pprint()
-            MENS_solved.L1.pprint()
-            MENS_solved.cr.pprint()
-            MENS_solved.cl.pprint()
-            MENS_solved.dcin.pprint()
-            MENS_solved.dcout.pprint()
-            MENS_solved.y.pprint()
+            dump(MENS_solved.height)
+            dump(MENS_solved.M)
+            dump(MENS_solved.L1)
+            dump(MENS_solved.cr)
+            dump(MENS_solved.cl)
+            dump(MENS_solved.dcin)
+            dump(MENS_solved.dcout)
+            dump(MENS_solved.y)
             print("Original objective func")
             print(MENS_solved.TACeqn())
             orig_ob = MENS_solved.TACeqn()
@@ -607,27 +1736,40 @@ class HybridStrategy(object):
                 print("Optimal solution for NLP: ", self.best_objective_real) 
                 con = False
 
+            #a network already evaluated in an earlier iteration is not solved again
+            topology_key = None
+            revisit = None
+            if self.topology_cache != None and con:
+                topology_key = self.topology_cache.make_key(MENS_solved)
+                revisit = self.topology_cache.get(topology_key)
+
             #Now we build the NLP from the MINLP solution
+            MENS_minlp = MENS_solved
             orig=True
-            if non_iso and con:
+            success_subopt = False
+            if revisit is not None:
+                #the suboptimization is skipped, so the MINLP of this iteration is the network model
+                men_type = 'minlp'
+            elif non_iso and con:
                 MENS_solved1 =MENS_solved.clone()
                 MENS_solvedclone = MENS_solved1
                 Ex1TR=SubOptMENS(MENS_solvedclone)
-                MENS_solvedsub, results, success_subopt = Ex1TR.run_suboptimization()
-                MENS_solvedsub.height.pprint()
-                MENS_solvedsub.M.pprint()
-                MENS_solvedsub.L1.pprint()
-                MENS_solvedsub.avlean.pprint()
-                MENS_solvedsub.cr.pprint()
-                MENS_solvedsub.cl.pprint()
-                MENS_solvedsub.dcin.pprint()
-                MENS_solvedsub.dcout.pprint()
-                MENS_solvedsub.Flrich.pprint()
-                MENS_solvedsub.Flean.pprint()
+                with self.trace.phase("SubOptMENS"):
+                    MENS_solvedsub, results, success_subopt = Ex1TR.run_suboptimization()
+                dump(MENS_solvedsub.height)
+                dump(MENS_solvedsub.M)
+                dump(MENS_solvedsub.L1)
+                dump(MENS_solvedsub.avlean)
+                dump(MENS_solvedsub.cr)
+                dump(MENS_solvedsub.cl)
+                dump(MENS_solvedsub.dcin)
+                dump(MENS_solvedsub.dcout)
+                dump(MENS_solvedsub.Flrich)
+                dump(MENS_solvedsub.Flean)
                 #MENS_solved.flv.pprint()
-                MENS_solvedsub.clin.pprint()
-                MENS_solvedsub.crin.pprint()
-                MENS_solvedsub.y.pprint()
+                dump(MENS_solvedsub.clin)
+                dump(MENS_solvedsub.crin)
+                dump(MENS_solvedsub.y)
                 if success_subopt == False: 
                     print("The NLP subopt model for iteration ", ic, "failed to solve. Without a valid network model the original MINLP is taken as solution")
                     print("The current best solution for the NLP was found at iteration: ", self.best_net_iter)
@@ -658,9 +1800,30 @@ class HybridStrategy(object):
                         print("ORIGINAL MINLP BETTER THAN SUBOPT, so orig is chosen")
                 
                 print(orig_ob)
+            #the exchangers of both networks are designed and the choice is made on the real TAC
+            both = None
+            if evaluate_both and con and revisit is None and success_subopt:
+                with self.trace.phase("evaluate_both"):
+                    both = self._evaluate_both([(MENS_minlp, True, 'minlp'), (MENS_solvedsub, False, 'nlp')], stream_properties, warm_start)
+                MENS_solved = both['model']
+                orig = both['orig']
+                men_type = both['men_type']
+                print("The ", men_type, " network has the lower real TAC and is chosen")
             #m is the counter for all possible matches and also is the key for correction factors
             m = 0
             exchanger_models=dict()
+            match_specs=dict()
+            solved_specs=dict()
+            incomplete = False
+            reused = 0
+            late = []
+            others = []
+            if revisit is not None:
+                exchanger_models = dict(revisit['exchanger_models'])
+            elif both is not None:
+                exchanger_models = dict(both['exchanger_models'])
+                solved_specs = dict(both['specs'])
+                others = both['others']
             
             #This loop runs the individual exchanger model optimizations
             for i in MENS_solved.i:
@@ -672,66 +1835,27 @@ class HybridStrategy(object):
                         else:
                             yvals[i,j,k] = MENS_solved.y[i,j,k]
                             
-                        if yvals[i,j,k]>=0.99 and MENS_solved.M[i,j,k].value!=0 and con:
+                        if yvals[i,j,k]>=0.99 and MENS_solved.M[i,j,k].value!=0 and con and revisit is None and both is None:
                             print("SETTING UP THE PROBLEM FOR MATCH [i,j,k] = ", i,j,k)
-                            CRin_Side = {}
-                            if orig == True:
-                                CRin_Side[i] = MENS_solved.cr[i,k].value
-                                CRin_Side[j] = MENS_solved.cl[j,k].value                                
-                            else:
-                                CRin_Side[i] = MENS_solved.cr[i,k].value
-                                CRin_Side[j] = MENS_solved.clin[i,j,k].value
-
-                            CRout_Side = {}                            
-                            if orig == True:
-                                CRout_Side[i] = MENS_solved.cr[i,(k+1)].value
-                                CRout_Side[j] = MENS_solved.cl[j,(k+1)].value                                
-                            else:
-                                CRout_Side[i] = MENS_solved.crin[i,j,(k+1)].value
-                                CRout_Side[j] = MENS_solved.cl[j,(k+1)].value
-
-                            FlowM = {}
-                            if orig == True:
-                                FlowM[i] = MENS_solved.M[i,j,k].value/(MENS_solved.cr[i,k].value-MENS_solved.cr[i,(k+1)].value)
-                                FlowM[j] = MENS_solved.M[i,j,k].value/(MENS_solved.cl[j,k].value-MENS_solved.cl[j,(k+1)].value)                                
+                            match_spec = self._build_match_spec(MENS_solved, i, j, k, orig, stream_properties, warm_start)
+                            cached, was_reused = self._known_design(match_spec)
+                            if was_reused:
+                                reused += 1
+                            if cached is not None:
+                                exchanger_models[m] = cached
+                            elif self._out_of_time():
+                                print("Time budget exhausted, the exchanger for match ", i,j,k, " is not solved")
+                                incomplete = True
+                            elif parallel or race_finite_elements or self.async_fraction != None:
+                                match_specs[m] = match_spec
                             else:
-                                FlowM[i] = MENS_solved.M[i,j,k].value/(MENS_solved.cr[i,k].value-MENS_solved.crin[i,j,(k+1)].value)
-                                FlowM[j] = MENS_solved.M[i,j,k].value/(MENS_solved.clin[i,j,k].value-MENS_solved.cl[j,(k+1)].value)
-                            
-                            ME_inits = self._obtain_initializations(MENS_solved,i,j,k)   #, me_inits=ME_inits
-                            finiteels = [20,50,100,200]
-                            count = 0
-                            while count <= 3:
-                                nfe = finiteels[count]
-                                print("solving for ", nfe, "number of elements")
-                                mx = mass_exchanger(rich_stream_name = i, lean_stream_name=j, rich_in_side=CRin_Side, rich_out_side=CRout_Side,flowrates = FlowM, me_inits = ME_inits, stream_properties = stream_properties, nfe =nfe)
-    
-                                ME5, ME5results = mx.find_detailed_exchanger_design()
-                                print(ME5results)
-                                print("ME5 results type: ",type(ME5results))
-                                print(ME5.success)
-                                if ME5results == 'failed epically':
-                                    print("The exchanger could not be solved. This means that for this exchanger no model is stored. Could result in failure to produce correction factors.")
-                                    exchanger_models[m]=ME5
-                                    #exchanger_models[m].success = False
-                                elif not isinstance(ME5results, str):
-                                    if isinstance(ME5results, pyomo.core.base.PyomoModel.ConcreteModel):
-                                        print("model did not solve correctly, so it is skipped")
-                                        exchanger_models[m]=ME5
-                                    elif (ME5results.solver.status == SolverStatus.ok) and (ME5results.solver.termination_condition == TerminationCondition.optimal):
-                                        exchanger_models[m]=ME5
-                                    elif (ME5results.solver.status == SolverStatus.ok) and (ME5results.solver.termination_condition == TerminationCondition.locallyOptimal):
-                                        exchanger_models[m]=ME5
-                                else:
-                                    #Should add way to deal with unsolved NLPs (increase elements?)
-                                    print("The exchanger could not be solved. This means that for this exchanger no model is stored. Could result in failure to produce correction factors.")
-                                    pass
-                                if ME5.success == False:
-                                    print("try to increase number of FEs")
-                                elif ME5.success == True:
-                                    break
-                                count = count + 1
-                        elif con ==True:
+                                solved_specs[m] = match_spec
+                                with self.trace.phase("exchanger_design", match = [i,j,k]):
+                                    stored = design_exchanger(match_spec, self.finite_elements)
+                                if stored is not None:
+                                    exchanger_models[m] = stored
+                                    self._trace_exchanger(stored, [i,j,k])
+                        elif con ==True and revisit is None and both is None:
                             #print("MATCH: ", m, " match ", i, "with ", j, " is not a selected match in ", k)
                             if m in exchanger_models:
                                 pass
@@ -742,76 +1866,150 @@ class HybridStrategy(object):
                             pass
                                            
                         m+=1
+            if race_finite_elements and match_specs:
+                print("Racing the finite element variants of ", len(match_specs), " exchangers")
+                with self.trace.phase("exchanger_designs_race", matches = len(match_specs)):
+                    designs = self._design_exchangers_race(match_specs)
+            elif self.async_fraction != None and match_specs:
+                print("Solving ", len(match_specs), " exchangers in parallel, waiting for ", self.async_fraction*100, "% of them")
+                with self.trace.phase("exchanger_designs_async", matches = len(match_specs)):
+                    designs, late = self._design_exchangers_async(match_specs, MENS_solved)
+                for m_s in late:
+                    print("Exchanger for match ", match_specs[m_s]['i'], match_specs[m_s]['j'], match_specs[m_s]['k'], " is still running, it keeps its last corrections")
+                    match_specs.pop(m_s)
+            elif parallel and match_specs:
+                print("Solving ", len(match_specs), " exchangers in parallel")
+                with self.trace.phase("exchanger_designs_parallel", matches = len(match_specs)):
+                    designs = self._design_exchangers_parallel(match_specs)
+            else:
+                designs = dict()
+            for m_s in designs:
+                exchanger_models[m_s] = designs[m_s]
+                self._trace_exchanger(designs[m_s], [match_specs[m_s]['i'], match_specs[m_s]['j'], match_specs[m_s]['k']])
+            solved_specs.update(match_specs)
+            #the designs of the network that was not chosen are kept first, so those of the chosen network take precedence
+            for other in others:
+                self._store_designs(other['specs'], other['exchanger_models'], warm_start)
+            self._store_designs(solved_specs, exchanger_models, warm_start)
+            if self.design_cache != None:
+                print("Exchanger design cache: ", self.design_cache.hits, " hits, ", self.design_cache.misses, " misses")
+            if self.incremental:
+                self.reuse_log[ic] = {'reused': reused, 'solved': len(solved_specs)}
+                print("Incremental mode: ", reused, " exchangers reused, ", len(solved_specs), " solved")
+            if con == True and self._out_of_time():
+                for m_s in solved_specs:
+                    if m_s not in exchanger_models or exchanger_models[m_s] is None or exchanger_models[m_s].success != True:
+                        incomplete = True
+            if incomplete:
+                print("Time budget exhausted before all the exchangers of iteration ", ic, " were solved. The iteration is discarded")
+                con = False
             self.iter_count = ic
-            if con == True:
-                stop = self._check_convergence(MENS_solved,exchanger_models,m,tol = self.tol, men_type = men_type)
+            if con == True and revisit is not None:
+                stop = self._reuse_network_evaluation(MENS_solved, revisit, tol = self.tol)
+            elif con == True:
+                with self.trace.phase("_check_convergence"):
+                    stop = self._check_convergence(MENS_solved,exchanger_models,m,tol = self.tol, men_type = men_type, partial = len(late) > 0)
+                #only a network evaluated as the MINLP is kept, as the designs of a suboptimized network are sized for
+                #the suboptimization and not for the MINLP a revisit is checked against
+                if topology_key != None and not late and men_type == 'minlp':
+                    self.topology_cache.put(topology_key, self._evaluation_of_iteration(MENS_solved, exchanger_models, men_type))
             else:
                 stop = True
             #print("These are the previous corrections")
             #print(self.corrections)
-            self.corrections=self._get_correction_factors(MENS_solved,exchanger_models, men_type = men_type)    
+            new_corrections = self._get_correction_factors(MENS_solved,exchanger_models, men_type = men_type)
+            if self.cor_acceleration != None and con == True:
+                self.corrections = self._accelerate_corrections(self.corrections, new_corrections)
+            else:
+                self.corrections = new_corrections
+            if self.cor_filter == 'adaptive' and con == True:
+                self._update_filter_bands(ic)
             #print("These are the current corrections")
             #print(self.corrections)
-            iter_end = time.clock()
+            iter_end = time.perf_counter()
             print("Iteration time: ", iter_end - iter_time)
+            self._iteration_times.append(iter_end - iter_time)
+            self.trace.end_iteration(MINLP_TAC = self.MINLP_TAC_log.get(ic), real_TAC = self.solution_log.get(ic), reuse = self.reuse_log.get(ic))
+            if self.log_store != None:
+                topology = None
+                if con == True:
+                    topology = ''.join('1' if value(MENS_solved.y[i,j,k]) >= 0.99 else '0' for i in MENS_solved.i for j in MENS_solved.j for k in MENS_solved.k)
+                self.log_store.log_iteration(self, ic, topology = topology, seconds = iter_end - iter_time)
+            if checkpoint_file != None:
+                save_checkpoint(checkpoint_file, self)
+                print("Checkpoint written to ", checkpoint_file)
+            if self.shared_bound != None and self._portfolio_should_stop(ic) and stop == False:
+                print("The best network of this run (", self.best_objective_real, ") has not improved for ", self.portfolio_patience,
+                      " iterations and is worse than the best of the portfolio. The run is stopped")
+                self.stopped_by_portfolio = True
+                stop = True
             if stop:
                 break
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\CORRECTION LOG///////////////////////////////////")
-        print("Every correction factor at every iteration logged")
-        print("=======================================================================")
-        print(self.correction_log)
-        write_to_csv('correction_log'+exname+'.csv', self.correction_log)
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\  Solution Log  ///////////////////////////////////")  
-        print("EVERY NLP OBJECTIVE FUNCTION SOLUTION AT EVERY ITERATION LOGGED")
-        print("=======================================================================")
-        print(self.solution_log)
-        write_to_csv('solution_log'+exname+'.csv', self.solution_log)
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\  MINLP TAC Solution Log  ///////////////////////")  
-        print("EVERY MINLP OBJECTIVE FUNCTION SOLUTION AT EVERY ITERATION LOGGED")
-        print("=======================================================================")
-        print(self.MINLP_TAC_log)
-        write_to_csv('MINLP_TAC_log'+exname+'.csv', self.MINLP_TAC_log)
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\  Exchanger log  ///////////////////////")  
-        print("How many binary variables were selected in every iteration")
-        print("=======================================================================")
-        print(self.exchanger_log)
-        write_to_csv('exchanger_log'+exname+'.csv', self.exchanger_log)
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\  Capital costs for MINLP Solution Log  ///////////////////////")  
-        print("            EVERY MINLP Capital cost logged               ")
-        print("=======================================================================")
-        print(self.capcost_log_MINLP)
-        write_to_csv('capcost_log_MINLP'+exname+'.csv', self.capcost_log_MINLP)
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\  capital costs nlp Solution Log  ///////////////////////")  
-        print("EVERY NLP OBJECTIVE FUNCTION SOLUTION AT EVERY ITERATION LOGGED")
-        print("=======================================================================")
-        print(self.capcost_log_nlp)
-        write_to_csv('capcost_log_nlp'+exname+'.csv', self.capcost_log_nlp)
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\  exchanger failed during the NLP solution ///////////////////////")  
-        print("Whether an NLP failed AT EVERY ITERATION LOGGED")
-        print("=======================================================================")
-        print(self.failed_exchanger)
-        write_to_csv('failed_exchanger'+exname+'.csv', self.failed_exchanger)
-        print("=======================================================================")
-        print("\\\\\\\\\\\\\\\\\\\\\\  UTILITIES Solution Log  ///////////////////////")  
-        print("         UTILITY COSTS AT EACH ITERATION LOGGED         ")
-        print("=======================================================================")
-        print(self.utility_cost)
-        write_to_csv('utility_cost'+exname+'.csv', self.utility_cost)
-        print("=======================================================================")
-        print("=======================================================================")
-        print("=======================================================================")
+        self._shutdown_executor()
+        set_solver_deadline(None)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\CORRECTION LOG///////////////////////////////////")
+        log_message("Every correction factor at every iteration logged")
+        log_message("=======================================================================")
+        log_message(self.correction_log)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\  Solution Log  ///////////////////////////////////")  
+        log_message("EVERY NLP OBJECTIVE FUNCTION SOLUTION AT EVERY ITERATION LOGGED")
+        log_message("=======================================================================")
+        log_message(self.solution_log)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\  MINLP TAC Solution Log  ///////////////////////")  
+        log_message("EVERY MINLP OBJECTIVE FUNCTION SOLUTION AT EVERY ITERATION LOGGED")
+        log_message("=======================================================================")
+        log_message(self.MINLP_TAC_log)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\  Exchanger log  ///////////////////////")  
+        log_message("How many binary variables were selected in every iteration")
+        log_message("=======================================================================")
+        log_message(self.exchanger_log)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\  Capital costs for MINLP Solution Log  ///////////////////////")  
+        log_message("            EVERY MINLP Capital cost logged               ")
+        log_message("=======================================================================")
+        log_message(self.capcost_log_MINLP)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\  capital costs nlp Solution Log  ///////////////////////")  
+        log_message("EVERY NLP OBJECTIVE FUNCTION SOLUTION AT EVERY ITERATION LOGGED")
+        log_message("=======================================================================")
+        log_message(self.capcost_log_nlp)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\  exchanger failed during the NLP solution ///////////////////////")  
+        log_message("Whether an NLP failed AT EVERY ITERATION LOGGED")
+        log_message("=======================================================================")
+        log_message(self.failed_exchanger)
+        log_message("=======================================================================")
+        log_message("\\\\\\\\\\\\\\\\\\\\\\  UTILITIES Solution Log  ///////////////////////")  
+        log_message("         UTILITY COSTS AT EACH ITERATION LOGGED         ")
+        log_message("=======================================================================")
+        log_message(self.utility_cost)
+        log_message("=======================================================================")
+        log_message("=======================================================================")
+        log_message("=======================================================================")
+        if self.log_store != None:
+            self.log_store.close()
+            print("Iteration logs of run ", self.log_store.run_id, " written to ", options.log_store)
+        else:
+            write_to_csv('correction_log'+exname+'.csv', self.correction_log)
+            write_to_csv('solution_log'+exname+'.csv', self.solution_log)
+            write_to_csv('MINLP_TAC_log'+exname+'.csv', self.MINLP_TAC_log)
+            write_to_csv('exchanger_log'+exname+'.csv', self.exchanger_log)
+            write_to_csv('capcost_log_MINLP'+exname+'.csv', self.capcost_log_MINLP)
+            write_to_csv('capcost_log_nlp'+exname+'.csv', self.capcost_log_nlp)
+            write_to_csv('failed_exchanger'+exname+'.csv', self.failed_exchanger)
+            write_to_csv('utility_cost'+exname+'.csv', self.utility_cost)
+        if self.topology_cache != None:
+            self.topology_cache.report()
         print("CONVERGENCE ACHIEVED AFTER ", self.iter_count, " iterations")
         print("Best network found at iteration: ", self.best_net_iter)
         print("Optimal solution for NLP: ", self.best_objective_real) 
 
         print("Hopefully the optimal solution is somewhere in the jumbled mess above")
+        return self.best_objective_real, self.best_exchangers
         
     def provide_problem_data(self, rich_data, lean_data, parameter_data, stream_properties):
         """
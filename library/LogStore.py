@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Append-only store of the per-iteration logs of the hybrid strategy.
+
+The objective values, costs, correction factors and selected matches of each iteration are
+written to an SQLite file as soon as the iteration ends, so that nothing is lost if the run dies.
+Several runs can be written to the same file and read back together for analysis.
+
+@author: mchlshort
+"""
+from __future__ import division
+import sqlite3
+import time
+from contextlib import closing
+import numpy
+import pandas as pd
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+#the correction factors stored for each match, in the column order of the corrections table
+correction_names = ["kwcor", "diacor", "heightcor", "packcostcor", "surfAcor"]
+
+#columns of the iterations table and the HybridStrategy log each one is taken from
+iteration_logs = [("MINLP_TAC", "MINLP_TAC_log"), ("real_TAC", "solution_log"), ("capcost_MINLP", "capcost_log_MINLP"),
+                  ("capcost_nlp", "capcost_log_nlp"), ("utility_cost", "utility_cost"), ("exchangers", "exchanger_log"),
+                  ("failed", "failed_exchanger"), ("diff_NLP_MINLP", "diff_NLP_MINLP_log")]
+
+class IterationLogStore(object):
+    def __init__(self, filename, run_name = None):
+        """SQLite store of the iteration logs of one run of the hybrid strategy.
+
+        A new run is added to the file every time the store is opened, earlier runs in the same file are kept.
+
+        Args:
+            filename (str): name of the SQLite file, created if it does not exist
+            run_name (str, optional): name of the run (e.g. the example name), stored with the run
+
+        """
+        self.filename = filename
+        self._connection = sqlite3.connect(filename)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+        cursor = self._connection.execute("INSERT INTO runs (name, started) VALUES (?, ?)", (run_name, time.time()))
+        self.run_id = cursor.lastrowid
+        self._connection.commit()
+
+    def _create_tables(self):
+        """Creates the runs, iterations, corrections and topology tables if the file is new
+        """
+        columns = ", ".join("%s REAL" % name for name, log in iteration_logs)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS runs (run_id INTEGER PRIMARY KEY, name TEXT, started REAL)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS iterations (run_id INTEGER, iteration INTEGER, seconds REAL, "
+                                 + columns + ", PRIMARY KEY (run_id, iteration))")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS corrections (run_id INTEGER, iteration INTEGER, match INTEGER, "
+                                 + ", ".join("%s REAL" % name for name in correction_names)
+                                 + ", PRIMARY KEY (run_id, iteration, match))")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS topology (run_id INTEGER, iteration INTEGER, y TEXT, "
+                                 "PRIMARY KEY (run_id, iteration))")
+        self._connection.commit()
+
+    def log_iteration(self, strategy, iteration, topology = None, seconds = None):
+        """Appends the logs of one iteration and commits them to the file.
+
+        Args:
+            strategy (HybridStrategy): the hybrid strategy being run, whose logs are read for this iteration
+            iteration (int): iteration number
+            topology (str, optional): selected matches as a string of '0'/'1' over all the (i,j,k) matches,
+                                        in the order of the correction factor match numbers
+            seconds (float, optional): wall-clock time of the iteration
+
+        returns:
+            None
+        """
+        row = [self.run_id, iteration, seconds]
+        for name, log in iteration_logs:
+            entry = getattr(strategy, log).get(iteration)
+            row.append(None if entry is None else float(entry))
+        self._connection.execute("INSERT OR REPLACE INTO iterations VALUES (" + ", ".join("?"*len(row)) + ")", row)
+        corrections = strategy.correction_log.get(iteration)
+        if corrections:
+            matches = sorted(set(m for m, name in corrections))
+            rows = []
+            for m in matches:
+                rows.append([self.run_id, iteration, m] + [corrections.get((m, name)) for name in correction_names])
+            self._connection.executemany("INSERT OR REPLACE INTO corrections VALUES (" + ", ".join("?"*(3 + len(correction_names))) + ")", rows)
+        if topology != None:
+            self._connection.execute("INSERT OR REPLACE INTO topology VALUES (?, ?, ?)", (self.run_id, iteration, topology))
+        self._connection.commit()
+
+    def close(self):
+        """Closes the connection to the file
+        """
+        if self._connection != None:
+            self._connection.close()
+            self._connection = None
+
+def _run_filter(run_ids):
+    """SQL condition and parameters selecting the given runs (all runs if None)
+    """
+    if run_ids == None:
+        return "", []
+    run_ids = list(run_ids)
+    return " WHERE run_id IN (" + ", ".join("?"*len(run_ids)) + ")", run_ids
+
+def read_runs(filename):
+    """Reads the runs stored in a log file
+
+    Args:
+        filename (str): name of the SQLite file
+
+    returns:
+        DataFrame: run_id, name and start time of each run
+    """
+    with closing(sqlite3.connect(filename)) as connection:
+        return pd.read_sql_query("SELECT * FROM runs ORDER BY run_id", connection)
+
+def read_iterations(filename, run_ids = None):
+    """Reads the objective values and costs of every iteration of one or more runs
+
+    Args:
+        filename (str): name of the SQLite file
+        run_ids (list, optional): runs to read. Default is all the runs in the file
+
+    returns:
+        DataFrame: one row per (run_id, iteration)
+    """
+    condition, parameters = _run_filter(run_ids)
+    with closing(sqlite3.connect(filename)) as connection:
+        return pd.read_sql_query("SELECT * FROM iterations" + condition + " ORDER BY run_id, iteration", connection, params = parameters)
+
+def read_corrections(filename, run_ids = None):
+    """Reads the correction factors of one or more runs as a dense matrix
+
+    Args:
+        filename (str): name of the SQLite file
+        run_ids (list, optional): runs to read. Default is all the runs in the file
+
+    returns:
+        tuple: (rows, matches, array) where rows is a DataFrame with the run_id and iteration of each row of the array,
+                and array has the shape (rows, matches, correction type), in the order of correction_names. Missing values
+                are nan
+    """
+    condition, parameters = _run_filter(run_ids)
+    with closing(sqlite3.connect(filename)) as connection:
+        values = connection.execute("SELECT run_id, iteration, match, " + ", ".join(correction_names) + " FROM corrections"
+                                    + condition + " ORDER BY run_id, iteration, match", parameters).fetchall()
+    keys = sorted(set((row[0], row[1]) for row in values))
+    matches = sorted(set(row[2] for row in values))
+    row_of = dict((key, n) for n, key in enumerate(keys))
+    column_of = dict((m, n) for n, m in enumerate(matches))
+    array = numpy.full((len(keys), len(matches), len(correction_names)), numpy.nan)
+    for row in values:
+        array[row_of[row[0], row[1]], column_of[row[2]], :] = [numpy.nan if x is None else x for x in row[3:]]
+    rows = pd.DataFrame(keys, columns = ["run_id", "iteration"])
+    return rows, matches, array
+
+def read_topology(filename, run_ids = None):
+    """Reads the selected matches of every iteration of one or more runs
+
+    Args:
+        filename (str): name of the SQLite file
+        run_ids (list, optional): runs to read. Default is all the runs in the file
+
+    returns:
+        DataFrame: run_id, iteration and y string of each iteration
+    """
+    condition, parameters = _run_filter(run_ids)
+    with closing(sqlite3.connect(filename)) as connection:
+        return pd.read_sql_query("SELECT * FROM topology" + condition + " ORDER BY run_id, iteration", connection, params = parameters)
+
+def export_csv(filename, run_id, exname):
+    """Writes the logs of a run to the csv files previously written at the end of run_hybrid_strategy
+    ('solution_log'+exname+'.csv', 'correction_log'+exname+'.csv' etc.)
+
+    Args:
+        filename (str): name of the SQLite file
+        run_id (int): run to export
+        exname (str): name of the example appended to the csv file names
+
+    returns:
+        None
+    """
+    iterations = read_iterations(filename, [run_id]).set_index("iteration")
+    for name, log in iteration_logs:
+        iterations[[name]].rename(columns = {name: 0}).to_csv(log + exname + '.csv')
+    rows, matches, array = read_corrections(filename, [run_id])
+    corrections = dict()
+    for n, it in enumerate(rows["iteration"]):
+        corrections[int(it)] = dict(((m, name), array[n, c, t]) for c, m in enumerate(matches) for t, name in enumerate(correction_names))
+    pd.DataFrame.from_dict(corrections, orient = "index").to_csv('correction_log' + exname + '.csv')
@@ -18,6 +18,9 @@ import inspect
 import numpy
 from pyomo.opt import SolverFactory, ProblemFormat, TerminationCondition
 from library.FeasibleSolver import *
+from library.Verbosity import *
+from library.StreamData import *
+from library.Superstructure import *
 
 __author__ = "Michael Short"
 __copyright__ = "Copyright 2020"
@@ -44,8 +47,40 @@ def read_stream_data(filename):
     data = pd.read_csv(filename,index_col=0, header=0, float_precision = 'round_trip')
     return data
 
+def model_values(model):
+    """Returns the values of all the variables of a model, so that a solution can be sent between processes
+
+        Args:
+            model (Concrete Pyomo model): solved model
+
+        Returns:
+            dict: values of each variable component, keyed by the component name and then by the index
+
+    """
+    return dict((var.local_name, dict((index, var[index].value) for index in var)) for var in model.component_objects(Var))
+
+def load_values(model, values):
+    """Sets the variables of a model to values returned by model_values. Components and indices that are not in
+    the model are skipped
+
+        Args:
+            model (Concrete Pyomo model): model built from the same formulation
+            values (dict): values of each variable component, keyed by the component name and then by the index
+
+        Returns:
+            None
+
+    """
+    for name in values:
+        var = model.component(name)
+        if not isinstance(var, Var):
+            continue
+        for index, v in values[name].items():
+            if index in var:
+                var[index].value = v
+
 class MENS(object):
-    def __init__(self, rich_data, lean_data, parameter_data, stream_properties, correction_factors=None, stages = None, superstruct = 'SBS'):
+    def __init__(self, rich_data, lean_data, parameter_data, stream_properties, correction_factors=None, stages = None, superstruct = 'SBS', persistent = False, auto_omega = False):
         """MENS mass exchanger network synthesis class.
 
         This class aims to take in data for the rich streams and lean streams as separate matrices
@@ -60,15 +95,30 @@ class MENS(object):
             parameter_data (pandas DataFrame): DataFrame of problem-specific parameters.
             stages (optional, int): Number of stages for the SWS
             superstructure (optional, str): Either SBS or SWS as of now
+            persistent (optional, bool): If True, the NLP initialization model is built once and only its correction
+                                        factors and omega are updated between iterations. Default is False
+            auto_omega (optional, bool): If True, the omega of each pair (i,j) is computed from the composition bounds and EMAC
+                                        with tight_omega instead of the scalar of the parameter data. Default is False
             
         """
         self._rich_data = rich_data
         self._lean_data = lean_data
+        #flowrates and compositions as dictionaries, used by the constraint rules instead of pandas lookups
+        self._streams = StreamData(rich_data, lean_data)
+        #stages and existence masks of the superstructure, shared by all the models
+        self._superstructure = Superstructure(self._streams, superstruct, stages)
+        if superstruct == 'SWS' and stages == None:
+            stages = self._superstructure.nstages
         self._correction_factors = None
         self._parameters = parameter_data
         self._stream_properties = stream_properties
         self.stages = stages
         self.superstructure = superstruct
+        self.persistent = persistent
+        self._nlp_model = None
+        self._nlp_initial_values = None
+        self.auto_omega = auto_omega
+        self._tight_omega = None
         
         if correction_factors == None:
             print("No correction factors provided, so all assumed to equal 1")
@@ -83,41 +133,153 @@ class MENS(object):
             raise RuntimeError("correction factors need to be inputted as a dictionary or set to None")
         # NEED TO GIVE ERROR MESSAGES AND  Checks for the data
   
-    #==========================================================
-    #        FIRST NLP FOR INITIALIZATION OF MINLP
-    #==========================================================
-    def NLP_MENS_init(self, correction_factors=None, omega = None):
-        """This function performs an NLP suboptimization with all user-defined matches selected.
+    def _correction_dict(self, model, name):
+        """Returns the correction factors of one type indexed by (i,j,k)
         
-        This is then used to initialize the MINLP optimization. Currently utilizes IPOPT to perform the
-        optimization, however it is hoped to include options for other solvers in the future.
+        The correction factors provided to the class are indexed by the number of the match, counted over
+        all the i, j and k of the superstructure, and the name of the correction.
         
         Args:
-            correction_factors (dict, optional): Can be used to start an optimization with correction facotrs known,
-                                            e.g. when a previous iteration failed.
-                                            
-        Returns:
-            model (Concrete model from Pyomo): the model with optimal solution found
-            results (Pyomo solved results): the results from the solver
+            model (Concrete model from Pyomo): model with the sets i, j and k
+            name (str): name of the correction, i.e. kwcor, diacor, heightcor, packcostcor or surfAcor
             
+        Returns:
+            dict: correction factors indexed by (i,j,k)
         """
-        if correction_factors == None:
-            print("No correction factors provided, so all assumed to equal 1")
-                    
-        elif isinstance(correction_factors,dict):
-            if bool(correction_factors) == True:
-                self._correction_factors = {}
-                self._correction_factors = correction_factors
-            else:
-                pass
-        else:
-            raise RuntimeError("correction factors need to be inputted as a dictionary or set to None")
+        count = 0
+        cord = dict() 
+        for i in model.i:
+            for j in model.j:
+                for k in model.k:
+                    if self._correction_factors==None:
+                        cord[i,j,k]=1
+                    else:
+                        cord[i,j,k]=value(self._correction_factors[count,name])
+                    count +=1
+        return cord
+
+    def _model_corrections(self, model, name, nlp = None):
+        """Returns the correction factors of one type used to build a model, indexed by (i,j,k)
+
+        Args:
+            model (Concrete model from Pyomo): model with the sets i, j and k
+            name (str): name of the correction, i.e. kwcor, diacor, heightcor, packcostcor or surfAcor
+            nlp (Concrete model from Pyomo, optional): if given, the correction factors of this model are used,
+                                        so that the MINLP is built with the same values as its NLP initialization
+
+        Returns:
+            dict: correction factors indexed by (i,j,k)
+        """
+        if nlp is None:
+            return self._correction_dict(model, name)
+        param = getattr(nlp, name)
+        return dict((index, value(param[index])) for index in param)
+
+    def _copy_initial_values(self, nlp, model):
+        """Initializes the variables of the MINLP with the solution of the NLP
+
+        Variables are matched by name, with the lean flowrates L of the NLP copied to L1. Fixed variables and
+        variables whose bounds fix them at zero (matches removed by the height filter) keep their own values.
+
+        Args:
+            nlp (Concrete model from Pyomo): the solved NLP initialization
+            model (Concrete model from Pyomo): the MINLP built by _build_model
+
+        Returns:
+            None
+        """
+        names = {'L1': 'L'}
+        for var in model.component_objects(Var):
+            source = nlp.component(names.get(var.local_name, var.local_name))
+            if not isinstance(source, Var):
+                continue
+            for index in var:
+                if index not in source or source[index].value is None:
+                    continue
+                if var[index].fixed or (var[index].lb == 0 and var[index].ub == 0):
+                    continue
+                var[index].value = source[index].value
+
+    def _admissible_matches(self, model):
+        """Returns the matches that can exist in the superstructure, i.e. the (i,j,k) where model.arex is 1
+
+        Args:
+            model (Concrete model from Pyomo): model with the sets i, j and k and the dict arex
+
+        Returns:
+            list: (i,j,k) tuples of the admissible matches, in the order of the superstructure
+        """
+        return [(i,j,k) for i in model.i for j in model.j for k in model.k if model.arex[i,j,k] == 1]
+
+    def tight_omega(self):
+        """Computes the smallest valid big-M of the logical constraints on the composition differences for each pair (i,j)
+
+        With y[i,j,k] = 0 the constraints only require dcin[i,j,k] (and dcout[i,j,k+1]) to lie within omega[i,j] of
+        cr - cl, and they must not cut off any compositions within their bounds, cr in [Cout(i), Cin(i)] and
+        cl in [Cin(j), Cout(j)]. Since dcin and dcout are bounded by [EMAC, 1] this holds for every cr and cl when
+        omega[i,j] >= EMAC - (Cout(i) - Cout(j)) and omega[i,j] >= (Cin(i) - Cin(j)) - 1. The composition bounds
+        are the same in every stage, so a single value per pair is as tight as a per-stage one.
+
+        returns:
+            dict: omega indexed by (i,j)
+        """
+        if self._tight_omega == None:
+            EMAC = self.get_parameter('EMAC')
+            streams = self._streams
+            self._tight_omega = dict()
+            for i in streams.rich_Cin:
+                for j in streams.lean_Cin:
+                    self._tight_omega[i,j] = max(EMAC - (streams.rich_Cout[i] - streams.lean_Cout[j]),
+                                                 (streams.rich_Cin[i] - streams.lean_Cin[j]) - 1, 0.0)
+        return self._tight_omega
+
+    def get_parameter(self, name):
+        """Returns the value of a problem-specific parameter of the parameter data (e.g. omega, EMAC, kw)
+
+        Args:
+            name (str): name of the parameter
+
+        returns:
+            float
+        """
+        if name not in self._parameters.index:
+            raise RuntimeError("parameter " + str(name) + " is not in the parameter data")
+        return float(self._parameters.at[name,'value'])
+
+    def _default_omega(self):
+        """Returns the omega used when none is given, either tight_omega or the scalar of the parameter data
+        """
+        if self.auto_omega:
+            return self.tight_omega()
+        return self.get_parameter('omega')
+
+    def _build_model(self, omega = None, nlp = None, arex = None):
+        """Builds the MENS model. The NLP initialization and the MINLP share this formulation.
+        
+        Without nlp the NLP initialization is built, with all the matches of the superstructure selected, the binaries
+        as fixed parameters and the lean flowrates as the variables L. With nlp the MINLP is built over the matches
+        in arex: the binaries are variables, the lean flowrates are the variables L1, and the correction factors
+        (and omega, if not given) are taken from the NLP. The NLP model is not modified.
+        
+        When the class is persistent the correction factors and omega of the NLP are built as mutable parameters
+        so that they can be updated with _update_NLP_parameters.
         
+        Args:
+            omega (float or dict, optional): big-M parameter for the logical constraints. Default is from the parameter data
+                                        (or tight_omega with auto_omega), or from the NLP when building the MINLP
+            nlp (Concrete model from Pyomo, optional): the solved NLP initialization, given to build the MINLP
+            arex (dict, optional): 1 for the matches of the MINLP and 0 otherwise, indexed by (i,j,k). Required with nlp
+            
+        Returns:
+            model (Concrete model from Pyomo): the unsolved model
+        """
+        minlp = nlp is not None
         model = ConcreteModel()
         #Setting the data to belong to the model
         model._rich_data=None
         model._rich_data = self._rich_data
         model._lean_data = self._lean_data
+        model._streams = self._streams
         #==============
         #   SCALARS
         #==============
@@ -146,158 +308,31 @@ class MENS(object):
         #================================
         #   SUPERSTRUCTURE GENERATION
         #================================
-        # IDEA IS TO AUTOMATE THE SUPERSTRUCTURE GENERATION and include in init
-        # THIS IS SBS
+        #the stages and existence of the streams and matches are computed once from the stream data
+        #and shared by every model built by this class
+        superstructure = self._superstructure
+        model.nstages = superstructure.nstages
+        model.k = RangeSet(len(superstructure.k))
         if self.superstructure == 'SBS':
-            model.nstages = (model.nlut+model.nrps)-1
-        elif self.superstructure == 'SWS':
-            if self.stages == None:
-                #if we do not have explicitly defined stages we just use Yee and Grossmann's heuristic
-                self.stages = max(model.nlut,model.nrps)
-                model.nstages = self.stages
-            else:
-                model.nstages = self.stages
-        #max(model.nlut,model.nrps)+1
-        
-        #model.k = RangeSet((model.nstages+1))        
- 
-        if self.superstructure == 'SBS':                
-            count = 0
-            supply_dict = {}
-            for i in model.i:
-                if self._rich_data.at[i,'Cin'] in supply_dict.values():
-                    pass
-                else: 
-                    supply_dict[count] = self._rich_data.at[i,'Cin']
-                    count += 1
-            for j in model.j:
-                if self._lean_data.at[j,'Cin'] in supply_dict.values():
-                    pass
-                else:
-                    supply_dict[count] = self._lean_data.at[j,'Cin']    
-                    count += 1
-            vals = sorted(supply_dict.values(), reverse=True)
-            #print(vals)
-            
-            ckval = {}
-            for i in range(count):
-                #print(i)
-                ckval[i+1] = vals[i]
-            
-            #print(ckval)
-            model.k = RangeSet((len(ckval)))
-            model.nstages = len(ckval) - 1
-            model.ck =Param(model.k, initialize = ckval)
-            
-            model.ckr_first = Param(model.i,model.k,initialize = 0.0,mutable=True)
-            
-            for i in model.i:
-                for k in model.k:
-                    if model.ck[k] == self._rich_data.at[i,'Cin']:
-                        model.ckr_first[i,k] = model.ck[k]
-            model.ckr_first.pprint()            
-            model.ckl_first = Param(model.j,model.k,initialize = 0.0,mutable=True)
-            
-            for j in model.j:
-                for k in model.k:
-                    if model.ck[k] == self._lean_data.at[j,'Cin']:
-                        model.ckl_first[j,k] = model.ck[k]
-                  
-            model.ckl_first.pprint()         
-            model.r_exist = Param(model.i,model.k,initialize = 0.0,mutable=True)
-            
-            for i in model.i:
-                for k in model.k:
-                    if k == (model.nstages+1):
-                        model.r_exist[i,k] = 0
-                    elif model.ck[k] <= self._rich_data.at[i,'Cin']:
-                        model.r_exist[i,k] = 1
-                    else:
-                        model.r_exist[i,k] = 0
-            
-    
-            model.l_exist = Param(model.j,model.k,initialize = 0.0,mutable=True)
-            
-            for j in model.j:
-                for k in model.k:
-                    if k == (model.nstages+1):
-                        model.l_exist[j,k] = 0
-                    elif k == 1:
-                        model.l_exist[j,k] = 1
-                    elif model.ck[k] == self._lean_data.at[j,'Cin']:
-                        model.l_exist[j,k] = 0
-                    elif model.ck[k] >= self._lean_data.at[j,'Cin']:
-                        model.l_exist[j,k] = 1
-                                
-            #model.l_exist.pprint()        
-            #model.r_exist.pprint() 
-                        
-            #Superstructure for SBS
-            model.arex = {}
-            for i in model.i:
-                for j in model.j:
-                    for k in model.k:
-                        if model.l_exist[j,k] == 1 and model.r_exist[i,k] == 1:
-                            model.arex[i,j,k] = 1
-                        else:
-                            model.arex[i,j,k] = 0         
-
-        elif self.superstructure == 'SWS':
-            model.k = RangeSet((model.nstages+1)) 
-            model.arex ={}
-            for i in model.i:
-                for j in model.j:
-                    for k in model.k:
-                        if k != model.nstages+1:
-                            model.arex[i,j,k] = 1
-                        else:
-                            model.arex[i,j,k] = 0
-            
-            r_exist ={}
-            for i in model.i:
-                for k in model.k:
-                    
-                    if k != model.nstages+1:
-                        r_exist[i,k] = 1
-                    else:
-                        r_exist[i,k] = 0
-
-            model.r_exist = Param(model.i,model.k,initialize = r_exist)
-            l_exist ={}
-            for j in model.j:
-                for k in model.k:
-                    
-                    if k != model.nstages+1:
-                        l_exist[j,k] = 1
-                    else:
-                        l_exist[j,k] = 0
-
-            model.l_exist = Param(model.j,model.k,initialize = l_exist)
-            
-            model.ckr_first = Param(model.i,model.k,initialize = 0.0,mutable=True)
-            
-            for i in model.i:
-                for k in model.k:
-                    if k == 1:
-                        model.ckr_first[i,k] = 1
-
-            model.ckr_first.pprint()  
-                       
-            model.ckl_first = Param(model.j,model.k,initialize = 0.0,mutable=True)
-            
-            for j in model.j:
-                for k in model.k:
-                    if k == model.nstages + 1: 
-                        model.ckl_first[j,k] = 1
-                  
-            model.ckl_first.pprint()         
-                                
-            model.l_exist.pprint()        
-            model.r_exist.pprint() 
-            
+            model.ck = Param(model.k, initialize = superstructure.as_dict('ck'))
+        model.ckr_first = Param(model.i,model.k,initialize = superstructure.as_dict('ckr_first'))
+        dump(model.ckr_first)
+        model.ckl_first = Param(model.j,model.k,initialize = superstructure.as_dict('ckl_first'))
+        dump(model.ckl_first)
+        model.r_exist = Param(model.i,model.k,initialize = superstructure.as_dict('r_exist'))
+        model.l_exist = Param(model.j,model.k,initialize = superstructure.as_dict('l_exist'))
+        dump(model.l_exist)
+        dump(model.r_exist)
+        #sparse set of the admissible matches. The match variables, constraints and the TAC are only built
+        #over these, so the size of the problem sent to the solver scales with the feasible matches
+        if minlp:
+            #the matches of the MINLP are those left by the height filter of the NLP
+            model.arex = dict(arex)
+            model.match = Set(dimen = 3, ordered = True, initialize = self._admissible_matches(model))
         else:
-            raise RuntimeError("Superstructure not SWS or SBS")
-        #print(model.arex)       
+            #Superstructure (copied, as the model owns and may change its arex)
+            model.arex = dict(superstructure.as_dict('arex'))
+            model.match = Set(dimen = 3, ordered = True, initialize = superstructure.matches())
         #=========================================================
         #   PARAMETERS
         #=========================================================
@@ -332,17 +367,19 @@ class MENS(object):
                 return False
         model.st = Param(model.k, initialize = m_stage)
         model.stages = RangeSet(model.nstages)
-        model.stages.pprint()
-        model.last.pprint()
+        dump(model.stages)
+        dump(model.last)
         parameters = dict()
         for i in self._parameters.index:
             parameters[i] = self._parameters.at[i,'value']
         #BIG-M vale for Big-M constraint
-        # THIS SHOULD BE EXTERNAL AND WE SHOULD GENERATE IT.Start some big val and decrease
-        if omega == None:
-            model.omega = Param (model.i,model.j, initialize=parameters['omega'])
+        #either the scalar of the parameter data or, with auto_omega, the tightest valid value of each pair
+        if omega == None and minlp:
+            model.omega = Param (model.i,model.j, initialize=dict((index, value(nlp.omega[index])) for index in nlp.omega))
+        elif omega == None:
+            model.omega = Param (model.i,model.j, initialize=self._default_omega(), mutable=self.persistent)
         else:
-            model.omega = Param (model.i,model.j, initialize=omega)
+            model.omega = Param (model.i,model.j, initialize=omega, mutable=self.persistent)
         
         #Problem-specific parameters
         #Still need to implement CHECKs FOR THEIR PRESENCE
@@ -350,21 +387,12 @@ class MENS(object):
         p=parameters['kw']
         model.kw = Param(initialize=p)
                 
-        count = 0
-        kw_cord = dict() 
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if self._correction_factors==None:
-                        kw_cord[i,j,k]=1
-                    else:
-                        kw_cord[i,j,k]=self._correction_factors[count,"kwcor"]
-                    count +=1
+        kw_cord = self._model_corrections(model, "kwcor", nlp)
 
         def kw_cor_init(model, i,j,k):
             return kw_cord[i,j,k]
 
-        model.kwcor = Param(model.i, model.j, model.k, initialize=kw_cor_init)
+        model.kwcor = Param(model.i, model.j, model.k, initialize=kw_cor_init, mutable=self.persistent)
         #annualization factor (over how many years, normally 5 thus AF = 0.2)
         model.AF = Param(initialize=parameters['AF'])
         #annual cost per height of continuous contact colum
@@ -401,110 +429,74 @@ class MENS(object):
         
         model.dia = Param(model.i, model.j, model.k, initialize=dia_init) 
 
-        count = 0
-        dia_cord = dict() 
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if self._correction_factors==None:
-                        dia_cord[i,j,k]=1
-                    else:
-                        dia_cord[i,j,k]=self._correction_factors[count, "diacor"]
-                    count +=1
+        dia_cord = self._model_corrections(model, "diacor", nlp)
 
         def dia_cor_init(model, i,j,k):
             return dia_cord[i,j,k]
            
-        model.diacor = Param(model.i, model.j, model.k, initialize=dia_cor_init)     
+        model.diacor = Param(model.i, model.j, model.k, initialize=dia_cor_init, mutable=self.persistent)     
         
-        count = 0
-        h_cord = dict() 
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if self._correction_factors==None:
-                        h_cord[i,j,k]=1
-                    else:
-                        h_cord[i,j,k]=self._correction_factors[count, "heightcor"]
-                    count +=1
+        h_cord = self._model_corrections(model, "heightcor", nlp)
 
         def h_cor_init(model, i,j,k):
             return h_cord[i,j,k]        
         
-        model.heightcor= Param(model.i, model.j, model.k, initialize=h_cor_init)
+        model.heightcor= Param(model.i, model.j, model.k, initialize=h_cor_init, mutable=self.persistent)
         
         # packing cost per meter^3
         model.packcost = Param(model.i, model.j, model.k, initialize=parameters['packcost'])
 
-        count = 0
-        packc_cord = dict() 
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if self._correction_factors==None:
-                        packc_cord[i,j,k]=1
-                    else:
-                        packc_cord[i,j,k]=self._correction_factors[count,"packcostcor"]
-                    count +=1
+        packc_cord = self._model_corrections(model, "packcostcor", nlp)
 
         def packc_cor_init(model, i,j,k):
             return packc_cord[i,j,k]
         
-        model.packcostcor = Param(model.i, model.j, model.k, initialize=packc_cor_init)
+        model.packcostcor = Param(model.i, model.j, model.k, initialize=packc_cor_init, mutable=self.persistent)
            
         #surface area associated with the packing and fluid/gas velocities
         model.surfA = Param(model.i, model.j, model.k, initialize=parameters['SurfA'])
         
-        count = 0
-        surfA_cord = dict() 
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if self._correction_factors==None:
-                        surfA_cord[i,j,k]=1
-                    else:
-                        surfA_cord[i,j,k]=self._correction_factors[count,"surfAcor"]
-                    count +=1
+        surfA_cord = self._model_corrections(model, "surfAcor", nlp)
 
         def surfA_cor_init(model, i,j,k):
             return surfA_cord[i,j,k]
         
-        model.surfAcor = Param(model.i, model.j, model.k, initialize = surfA_cor_init)
+        model.surfAcor = Param(model.i, model.j, model.k, initialize = surfA_cor_init, mutable=self.persistent)
 
         #cost of the lean streams
         model.AC = Param(model.j, initialize=aci)
-        model.AC.pprint()
+        dump(model.AC)
         #=================
         #   VARIABLES
         #=================
-        def y_bounds(model,i,j,k):
-            if model.arex[i,j,k] ==1:
-                return (0,1)
-            else:
-                return (0.0,0.0)
-        
-        
-        #These are actually fixed here to arex
-        model.y = Param(model.i,model.j,model.k, initialize = model.arex)
+        if minlp:
+            model.y = Var(model.i,model.j,model.k, initialize = model.arex, within = Binary)
+            #binaries of matches that are not admissible are not part of the problem
+            for index in model.y:
+                if index not in model.match:
+                    model.y[index].fix(0)
+        else:
+            #These are actually fixed here to arex
+            model.y = Param(model.i,model.j,model.k, initialize = model.arex)
         #relaxed binary
-        model.y1 = Var(model.i,model.j,model.k, initialize = model.arex, bounds=y_bounds)
+        model.y1 = Var(model.match, initialize = 1, within = NonNegativeReals, bounds=(0,1))
         
         #Variables for design of network
         #Composition at each interval boundary
         def cl_init(model,j,k):
-            return abs((self._lean_data.at[j,'Cin']-self._lean_data.at[j,'Cout']))/2
+            return abs((self._streams.lean_Cin[j]-self._streams.lean_Cout[j]))/2
 
         def cr_init(model,i,k):
-            return abs((self._rich_data.at[i,'Cout']-self._rich_data.at[i,'Cin']))/2
+            return abs((self._streams.rich_Cout[i]-self._streams.rich_Cin[i]))/2
 
         def cr_bounds(model,i,k):
-            lb = self._rich_data.at[i,'Cout']
-            ub = self._rich_data.at[i,'Cin']
+            lb = self._streams.rich_Cout[i]
+            ub = self._streams.rich_Cin[i]
             return (lb,ub)
 
         def cl_bounds(model,j,k):
-            lb = self._lean_data.at[j,'Cin']
-            ub = self._lean_data.at[j,'Cout']
+            lb = self._streams.lean_Cin[j]
+            ub = self._streams.lean_Cout[j]
             return (lb,ub)
 
         model.cr = Var(model.i,model.k, initialize= cr_init, bounds = cr_bounds)
@@ -545,14 +537,16 @@ class MENS(object):
         #Mass exchanged
         def m_init(model,i,j,k):
             if model.arex[i,j,k] ==1:
-                c=(self._rich_data.at[i,'F']*(self._rich_data.at[i,'Cin']-self._rich_data.at[i,'Cout']))
+                c=self._streams.rich_load[i]
                 return c
             else:
                 return 0.0
    
         def m_bounds(model,i,j,k):
-            if model.arex[i,j,k] ==1:
-                return (0,(self._rich_data.at[i,'F']*(self._rich_data.at[i,'Cin']-self._rich_data.at[i,'Cout'])))
+            if model.arex[i,j,k] ==1 and minlp:
+                return (0.0,None)
+            elif model.arex[i,j,k] ==1:
+                return (0,self._streams.rich_load[i])
             else:
                 return (0,0)
 
@@ -560,30 +554,41 @@ class MENS(object):
         
         #rule for bounds of lean streams
         def L_bounds(model,j):
-            if self._lean_data.at[j,'F']>0:
-                return (0.05,self._lean_data.at[j,'F'])
-        
+            if self._streams.lean_F[j]>0 and minlp:
+                return (0.1,self._streams.lean_F[j])
+            elif self._streams.lean_F[j]>0:
+                return (0.05,self._streams.lean_F[j])
+            elif minlp:
+                return (0.1, 10)
             else:
                 # THESE SHOULD BE GENERATED FROM DATA
                 return (0.01, 10)
             
         def L_init(model,j):
-            if self._lean_data.at[j,'F']>0:
-                return self._lean_data.at[j,'F']
+            #the MINLP starts from the lean flowrates of the solved NLP, which also select the big-M of Log_M_RPS_LPS
+            if minlp and nlp.L[j].value is not None:
+                return nlp.L[j].value
+            if self._streams.lean_F[j]>0:
+                return self._streams.lean_F[j]
         
             else:
                 # THESE SHOULD BE GENERATED FROM DATA
                 return 1.5
         
-        #Flowrate of lean used (J) all included
+        #Flowrate of lean used (J) all included, named L in the NLP and L1 in the MINLP
         #this should be changed - init
-        model.L = Var(model.j, initialize=L_init,bounds = L_bounds)
+        if minlp:
+            model.L1 = Var(model.j, initialize=L_init,bounds = L_bounds)
+            L = model.L1
+        else:
+            model.L = Var(model.j, initialize=L_init,bounds = L_bounds)
+            L = model.L
 
         #   Flowrate of splits for non iso-compositional mixing
         '''
         def Flrich_bounds(model,i,j,k):
             if model.arex[i,j,k] ==1:
-                return (0.01,self._rich_data.at[i,'F'])
+                return (0.01,self._streams.rich_F[i])
             else:
                 return (0.0,50)
     
@@ -610,7 +615,7 @@ class MENS(object):
         
         #initialization rules
         def dcin_init_rule(model,i,j,k):
-            return self._rich_data.at[i,'Cin']-self._lean_data.at[j,'Cin']
+            return self._streams.rich_Cin[i]-self._streams.lean_Cin[j]
 
         def dcin_bounds_rule(model,i,j,k):
             if model.arex[i,j,k] ==1:
@@ -619,7 +624,7 @@ class MENS(object):
                 return (model.EMAC,None)
     
         def dcout_init_rule(model,i,j,k):
-            return self._rich_data.at[i,'Cin']-self._lean_data.at[j,'Cin']
+            return self._streams.rich_Cin[i]-self._streams.lean_Cin[j]
 
         def dcout_bounds_rule(model,i,j,k):
             if k>=2:
@@ -645,11 +650,11 @@ class MENS(object):
         '''
         
         #positive/negative tolerance
-        model.pnhc=Var(model.i,model.j,model.k, initialize= 1e-6,within = NonNegativeReals)
-        model.snhc=Var(model.i,model.j,model.k, initialize= 1e-6,within = NonNegativeReals)
+        model.pnhc=Var(model.match, initialize= 1e-6,within = NonNegativeReals)
+        model.snhc=Var(model.match, initialize= 1e-6,within = NonNegativeReals)
 
         #mass transfer coefficient
-        model.kya=Var(model.i,model.j,model.k, initialize = 13, bounds = (0.00, None))
+        model.kya=Var(model.match, initialize = 13, bounds = (0.00, None))
         
         #height of column
         def height_init(model, i,j,k):
@@ -674,7 +679,7 @@ class MENS(object):
         #assignment of stream inlet compositions
         def CRichIn_(model, i,k):
             if model.ckr_first[i,k] != 0.0:
-                return model.cr[i,k] == (self._rich_data.at[i,'Cin'])
+                return model.cr[i,k] == (self._streams.rich_Cin[i])
 
             else:
                 return Constraint.Skip
@@ -683,7 +688,7 @@ class MENS(object):
         
         def CLeanIn_(model, j,k):
             if model.ckl_first[j,k] != 0.0:
-                return model.cl[j,k] == float(self._lean_data.at[j,'Cin'])
+                return model.cl[j,k] == float(self._streams.lean_Cin[j])
             else:
                 return Constraint.Skip
 
@@ -691,7 +696,7 @@ class MENS(object):
 
         def CRichOut_(model, i,k):
             if (model.last[k])==True:
-                return model.cr[i,k] == float(self._rich_data.at[i,'Cout'])
+                return model.cr[i,k] == float(self._streams.rich_Cout[i])
             else:
                 return Constraint.Skip
 
@@ -699,7 +704,7 @@ class MENS(object):
              
         def CLeanOut_(model, j,k):
             if model.first[k] == True:
-                return model.cl[j,k] == float(self._lean_data.at[j,'Cout'])        
+                return model.cl[j,k] == float(self._streams.lean_Cout[j])        
             else:
                 return Constraint.Skip
 
@@ -707,22 +712,22 @@ class MENS(object):
         
         #Available mass in lean stream j
         def AvLean_(model,j):
-            a = (self._lean_data.at[j,'Cout'])-(self._lean_data.at[j,'Cin'])
-            return model.avlean[j] == model.L[j]*(a)
+            a = self._streams.lean_dC[j]
+            return model.avlean[j] == L[j]*(a)
 
         model.AvLean = Constraint(model.j, rule=AvLean_)
 
         #Stream overall mass balance
         def Total_Mass_Rich_(model,i):   
-            f=(self._rich_data.at[i,'F'])*((self._rich_data.at[i,'Cin'])-(self._rich_data.at[i,'Cout'])) 
+            f=self._streams.rich_load[i] 
             return float(f)== sum(model.M[i,j,k] for j in model.j for k in model.k if model.arex[i,j,k] == 1)                    
         
         model.Total_Mass_Rich = Constraint(model.i, rule = Total_Mass_Rich_)
         
         def Total_Mass_Lean_(model,j):
-            f=model.L[j]*(((self._lean_data.at[j,'Cout'])-(self._lean_data.at[j,'Cin'])))
+            f=L[j]*self._streams.lean_dC[j]
             c=f
-            return model.L[j]*(((self._lean_data.at[j,'Cout'])-(self._lean_data.at[j,'Cin']))) == sum(model.M[i,j,k] for i in model.i for k in model.k if model.arex[i,j,k] == 1)
+            return L[j]*self._streams.lean_dC[j] == sum(model.M[i,j,k] for i in model.i for k in model.k if model.arex[i,j,k] == 1)
             
         model.Total_Mass_Lean = Constraint(model.j, rule = Total_Mass_Lean_)
 
@@ -731,9 +736,9 @@ class MENS(object):
             if k == (model.nstages+1):
                 return Constraint.Skip
             elif model.r_exist[i,k] == 1:    
-                f =(self._rich_data.at[i,'F'])
+                f =(self._streams.rich_F[i])
                 c=f
-                return float(self._rich_data.at[i,'F'])*(model.cr[i,k]-model.cr[i,(k+1)])== sum(model.M[i,j,k] for j in model.j if model.arex[i,j,k] == 1)
+                return float(self._streams.rich_F[i])*(model.cr[i,k]-model.cr[i,(k+1)])== sum(model.M[i,j,k] for j in model.j if model.arex[i,j,k] == 1)
             else:
                 return Constraint.Skip
     
@@ -743,7 +748,7 @@ class MENS(object):
             if k == (model.nstages+1):
                 return Constraint.Skip
             elif model.l_exist[j,k] == 1:
-                return model.L[j]*(model.cl[j,k] - model.cl[j,(k+1)]) == \
+                return L[j]*(model.cl[j,k] - model.cl[j,(k+1)]) == \
                     sum(model.M[i,j,k] for i in model.i if model.arex[i,j,k] == 1)                
             else:
                 return Constraint.Skip 
@@ -788,27 +793,18 @@ class MENS(object):
         
         # Binary variable relaxation strategy
         def P_(model,i,j,k):
-            if k == (model.nstages+1):
-                return Constraint.Skip
-            else:
-                return model.pnhc[i,j,k] == 1e-6
-        model.P = Constraint(model.i, model.j, model.k, rule = P_)
+            return model.pnhc[i,j,k] == 1e-6
+        model.P = Constraint(model.match, rule = P_)
 
         def S_(model,i,j,k):
-            if k == (model.nstages+1):
-                return Constraint.Skip
-            else:
-                return model.snhc[i,j,k] == 1e-6
+            return model.snhc[i,j,k] == 1e-6
 
-        model.S = Constraint(model.i, model.j, model.k, rule = S_)
+        model.S = Constraint(model.match, rule = S_)
 
         def N_(model,i,j,k):
-            if k == (model.nstages+1):
-                return Constraint.Skip
-            else:
-                return model.y[i,j,k] == model.y1[i,j,k]+(model.pnhc[i,j,k]- model.snhc[i,j,k])
+            return model.y[i,j,k] == model.y1[i,j,k]+(model.pnhc[i,j,k]- model.snhc[i,j,k])
 
-        model.N = Constraint(model.i, model.j, model.k, rule = N_)
+        model.N = Constraint(model.match, rule = N_)
 
         '''
         # Mass balances over streams for non-iso-comp mixing
@@ -853,52 +849,37 @@ class MENS(object):
         #Logical Constraint on Mass exchanged between RPS(i) and LPS (j)
         def Log_M_RPS_LPS_(model,i,j,k):
 
-            c = ((self._rich_data.at[i,'F'])*((self._rich_data.at[i,'Cin'])-(self._rich_data.at[i,'Cout'])))
+            c = self._streams.rich_load[i]
             c=(c)
-            d=(model.L[j]*(((self._lean_data.at[j,'Cout'])-((self._lean_data.at[j,'Cin'])))))
-            if model.arex[i,j,k] == 1:
-                if value(c) >=value(d):
-                    return model.M[i,j,k] <= (model.L[j]*(((self._lean_data.at[j,'Cout'])-((self._lean_data.at[j,'Cin'])))))*model.y[i,j,k]
-                else:
-                    return model.M[i,j,k] <= ((self._rich_data.at[i,'F'])*((self._rich_data.at[i,'Cin'])-(self._rich_data.at[i,'Cout'])))*model.y[i,j,k]
+            d=(L[j]*self._streams.lean_dC[j])
+            if value(c) >=value(d):
+                return model.M[i,j,k] <= (L[j]*self._streams.lean_dC[j])*model.y[i,j,k]
             else:
-                return Constraint.Skip
+                return model.M[i,j,k] <= self._streams.rich_load[i]*model.y[i,j,k]
     
-        model.Log_M_RPS_LPS = Constraint(model.i, model.j, model.k, rule = Log_M_RPS_LPS_)
+        model.Log_M_RPS_LPS = Constraint(model.match, rule = Log_M_RPS_LPS_)
         
         #LOGICAL CONSTRAINT ON RICH SIDE COMPOSITION DIFFERENCE BETWEEN RPS(I) AND LPS(J)
         def Log_DC_RPS_LPS_RS_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.dcin[i,j,k] <= model.cr[i,k] - model.cl[j,k]+ model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
+            return model.dcin[i,j,k] <= model.cr[i,k] - model.cl[j,k]+ model.omega[i,j]*(1-model.y[i,j,k])
 
-        model.Log_DC_RPS_LPS_RS = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_RS_)
+        model.Log_DC_RPS_LPS_RS = Constraint(model.match, rule = Log_DC_RPS_LPS_RS_)
         
         def Log_DC_RPS_LPS_RS1_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.dcin[i,j,k] >= model.cr[i,k] - model.cl[j,k]- model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
-        model.Log_DC_RPS_LPS_RS1 = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_RS1_)
+            return model.dcin[i,j,k] >= model.cr[i,k] - model.cl[j,k]- model.omega[i,j]*(1-model.y[i,j,k])
+        model.Log_DC_RPS_LPS_RS1 = Constraint(model.match, rule = Log_DC_RPS_LPS_RS1_)
 
         #LOGICAL CONSTRAINT ON Lean SIDE COMPOSITION DIFFERENCE BETWEEN RPS(I) AND LPS(J)
         def Log_DC_RPS_LPS_LS_(model,i,j,k):
-            if model.arex[i,j,(k)] == 1:
-                return model.dcout[i,j,(k+1)] <= model.cr[i,(k+1)] - model.cl[j,(k+1)]+\
-                                                 model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
-        model.Log_DC_RPS_LPS_LS = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_LS_)
+            return model.dcout[i,j,(k+1)] <= model.cr[i,(k+1)] - model.cl[j,(k+1)]+\
+                                             model.omega[i,j]*(1-model.y[i,j,k])
+        model.Log_DC_RPS_LPS_LS = Constraint(model.match, rule = Log_DC_RPS_LPS_LS_)
 
         def Log_DC_RPS_LPS_LS1_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.dcout[i,j,(k+1)] >= model.cr[i,(k+1)] - model.cl[j,(k+1)] -\
-                                     model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
+            return model.dcout[i,j,(k+1)] >= model.cr[i,(k+1)] - model.cl[j,(k+1)] -\
+                                 model.omega[i,j]*(1-model.y[i,j,k])
 
-        model.Log_DC_RPS_LPS_LS1 = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_LS1_)
+        model.Log_DC_RPS_LPS_LS1 = Constraint(model.match, rule = Log_DC_RPS_LPS_LS1_)
 
 
         '''
@@ -912,22 +893,21 @@ class MENS(object):
         #model.FlowLV = Constraint(model.i, model.j, model.k, rule = FlowLV_)   
         '''
         def KYTransferMass_(model, i,j,k):
-            if model.arex[i,j,k]==1:
-                return model.kya[i,j,k]==model.kw*model.surfA[i,j,k]*model.surfAcor[i,j,k]*model.kwcor[i,j,k]
-            else:
-                return Constraint.Skip
+            return model.kya[i,j,k]==model.kw*model.surfA[i,j,k]*model.surfAcor[i,j,k]*model.kwcor[i,j,k]
     
-        model.KYTransferMass = Constraint(model.i, model.j, model.k, rule = KYTransferMass_)    
+        model.KYTransferMass = Constraint(model.match, rule = KYTransferMass_)    
     
+        #regularization of the height equation, larger in the MINLP where the binaries can switch matches off
+        if minlp:
+            eps = 1E-6
+        else:
+            eps = 1E-12
         def HeightColumn_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.height[i,j,k] == model.M[i,j,k]/(((model.kya[i,j,k]*numpy.pi/4*((model.dia[i,j,k]*model.diacor[i,j,k])**2))) *\
-                                          (((model.dcin[i,j,k]*model.dcout[i,j,(k+1)])*\
-                                           (model.dcin[i,j,k]+model.dcout[i,j,(k+1)])*0.5)**(0.33333)+1E-12)+1E-12)*model.y[i,j,k]
-            else:
-                return Constraint.Skip
+            return model.height[i,j,k] == model.M[i,j,k]/(((model.kya[i,j,k]*numpy.pi/4*((model.dia[i,j,k]*model.diacor[i,j,k])**2))) *\
+                                      (((model.dcin[i,j,k]*model.dcout[i,j,(k+1)])*\
+                                       (model.dcin[i,j,k]+model.dcout[i,j,(k+1)])*0.5)**(0.33333)+eps)+eps)*model.y[i,j,k]
 
-        model.HeightColumn = Constraint(model.i, model.j, model.k, rule = HeightColumn_)
+        model.HeightColumn = Constraint(model.match, rule = HeightColumn_)
         
         #==================================================================================
         #   COBJECTIVE FUNCTION AND SOLVE STATEMENT
@@ -935,455 +915,263 @@ class MENS(object):
         model.w = 0.000001
         def TACeq_(model):
             tac = 0
-            for i in model.i:
-                for j in model.j:
-                    for k in model.k:
-                        tac += model.AF*23805*((model.diacor[i,j,k]*model.dia[i,j,k])**0.57)*1.15*model.heightcor[i,j,k]*model.height[i,j,k]
-                        tac += model.AF*numpy.pi*((model.dia[i,j,k]*model.diacor[i,j,k])**2)/4*model.height[i,j,k]*model.heightcor[i,j,k]*model.packcost[i,j,k]*model.packcostcor[i,j,k]
-                        tac += model.fixcost*model.y[i,j,k]
-                        tac += model.w*(model.pnhc[i,j,k]+model.snhc[i,j,k])
+            for i,j,k in model.match:
+                tac += model.AF*23805*((model.diacor[i,j,k]*model.dia[i,j,k])**0.57)*1.15*model.heightcor[i,j,k]*model.height[i,j,k]
+                tac += model.AF*numpy.pi*((model.dia[i,j,k]*model.diacor[i,j,k])**2)/4*model.height[i,j,k]*model.heightcor[i,j,k]*model.packcost[i,j,k]*model.packcostcor[i,j,k]
+                tac += model.fixcost*model.y[i,j,k]
+                tac += model.w*(model.pnhc[i,j,k]+model.snhc[i,j,k])
             for j in model.j:
-                tac += model.L[j]*model.AC[j]            
+                tac += L[j]*model.AC[j]            
             return tac
         
         model.TACeqn = Objective(rule = TACeq_, sense = minimize)
+        return model
 
+    def _update_NLP_parameters(self, model, omega = None):
+        """Updates the correction factors and omega of the persistent NLP model in place and resets the
+        variables to the values the model was built with.
+        
+        Args:
+            model (Concrete model from Pyomo): the persistent model built by _build_model
+            omega (float or dict, optional): big-M parameter for the logical constraints. Default is from the parameter data
+                                        (or tight_omega with auto_omega)
+            
+        Returns:
+            None
+        """
+        for name in ["kwcor", "diacor", "heightcor", "packcostcor", "surfAcor"]:
+            cord = self._correction_dict(model, name)
+            param = getattr(model, name)
+            for index in cord:
+                param[index] = cord[index]
+        if omega == None:
+            omega = self._default_omega()
+        for i in model.i:
+            for j in model.j:
+                if isinstance(omega, dict):
+                    model.omega[i,j] = omega[i,j]
+                else:
+                    model.omega[i,j] = omega
+        for var, init in self._nlp_initial_values:
+            var.value = init
 
-        model_clone_before_solve = model.clone()
+    #==========================================================
+    #        FIRST NLP FOR INITIALIZATION OF MINLP
+    #==========================================================
+    def NLP_MENS_init(self, correction_factors=None, omega = None):
+        """This function performs an NLP suboptimization with all user-defined matches selected.
+        
+        This is then used to initialize the MINLP optimization. Currently utilizes IPOPT to perform the
+        optimization, however it is hoped to include options for other solvers in the future.
+        
+        Args:
+            correction_factors (dict, optional): Can be used to start an optimization with correction facotrs known,
+                                            e.g. when a previous iteration failed.
+                                            
+        Returns:
+            model (Concrete model from Pyomo): the model with optimal solution found
+            results (Pyomo solved results): the results from the solver
+            
+        """
+        if correction_factors == None:
+            print("No correction factors provided, so all assumed to equal 1")
+                    
+        elif isinstance(correction_factors,dict):
+            if bool(correction_factors) == True:
+                self._correction_factors = {}
+                self._correction_factors = correction_factors
+            else:
+                pass
+        else:
+            raise RuntimeError("correction factors need to be inputted as a dictionary or set to None")
+        
+        if self.persistent:
+            if self._nlp_model == None:
+                self._nlp_model = self._build_model(omega)
+                self._nlp_initial_values = [(var, var.value) for var in self._nlp_model.component_data_objects(Var)]
+            else:
+                print("Updating the correction factors of the persistent NLP model")
+                self._update_NLP_parameters(self._nlp_model, omega)
+            model = self._nlp_model
+        else:
+            model = self._build_model(omega)
+
+        if self.persistent:
+            model_clone_before_solve = None
+        else:
+            model_clone_before_solve = model.clone()
         
         results = solve_until_feas_NLP(model)
-        model.display()
+        dump(model, display = True)
 
         print("THIS IS THE END OF THE NLP INITIALIZATION")
         success = bool
         #print(results)
         try:
             if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
-                model.height.pprint()
-                model.M.pprint()
-                model.avlean.pprint()
-                model.L.pprint()
-                model.cr.pprint()
-                model.cl.pprint()
-                model.dcin.pprint()
-                model.dcout.pprint()
-                model.y.pprint()
+                dump(model.height)
+                dump(model.M)
+                dump(model.avlean)
+                dump(model.L)
+                dump(model.cr)
+                dump(model.cl)
+                dump(model.dcin)
+                dump(model.dcout)
+                dump(model.y)
                 print(model.TACeqn())
                 success = True
                 print("Successful solution of initialization problem")
             elif (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.locallyOptimal):
-                model.height.pprint()
-                model.M.pprint()
-                model.avlean.pprint()
-                model.L.pprint()
-                model.cr.pprint()
-                model.cl.pprint()
-                model.dcin.pprint()
-                model.dcout.pprint()
-                model.y.pprint()
+                dump(model.height)
+                dump(model.M)
+                dump(model.avlean)
+                dump(model.L)
+                dump(model.cr)
+                dump(model.cl)
+                dump(model.dcin)
+                dump(model.dcout)
+                dump(model.y)
                 print(model.TACeqn())
                 print("Successful solution of initialization problem")  
                 success = True
             else:
                 print("INITIALIZATION FAILED")
-                model.height.pprint()
-                model.M.pprint()
-                model.avlean.pprint()
-                model.L.pprint()
-                model.cr.pprint()
-                model.cl.pprint()
-                model.dcin.pprint()
-                model.dcout.pprint()
-                model.y.pprint()
+                dump(model.height)
+                dump(model.M)
+                dump(model.avlean)
+                dump(model.L)
+                dump(model.cr)
+                dump(model.cl)
+                dump(model.dcin)
+                dump(model.dcout)
+                dump(model.y)
                 print(model.TACeqn())
                 success = False
-                model = model_clone_before_solve
+                if self.persistent:
+                    for var, init in self._nlp_initial_values:
+                        var.value = init
+                else:
+                    model = model_clone_before_solve
             print("THIS IS THE END OF THE NLP INITIALIZATION")
         except:
             print("THE NLP initialization FAILED, problem may be infeasible!")
             success = False
         
+        if self.persistent:
+            #the persistent model is reset and solved again at the next call, so it is never returned itself
+            model = model.clone()
         return model, success
     
-    def MINLP_MENS_full(self, model, min_height_from_nlp=None, min_mass_ex_from_nlp=None, omega = None, bin_cuts = None, sym_cuts = None):
-        """MINLP optimization model building and solving.
-        
-        This is the function that is called to solve the full MINLP model for MENS including binary variables
-        Requires the solved NLP in as an argument in order to utilize the initializations provided.
+    def NLP_from_values(self, values, correction_factors = None):
+        """Rebuilds a solved NLP initialization from the values of its variables, without solving it again.
+
+        Used in the recovery workers, which start the MINLP from the NLP solved in the main process.
+
         Args:
-            model (Concrete Pyomo model): Pyomo model passed from the NLP solver, NLP_MENS_init
-            min_height_from_nlp (int, optional): the smallest height values taken from the NLP suboptimization.
-                                            These values will be changed if the first solve fails.
-                                            
-            min_mass_ex_from_nlp (int, optional): the smallest mass exchanged values taken from the NLP suboptimization.
-                                            These values will be changed if the first solve fails.
-            
+            values (dict): values of the variables of the solved NLP (see model_values)
+            correction_factors (dict, optional): the correction factors the NLP was solved with
+
         returns:
-            solved pyomo model
-            
+            Concrete Pyomo model
+        """
+        if isinstance(correction_factors, dict) and bool(correction_factors) == True:
+            self._correction_factors = correction_factors
+        model = self._build_model()
+        load_values(model, values)
+        return model
+
+    def _MINLP_model(self, model, min_height_from_nlp = None, omega = None, fixed_binaries = None):
+        """Builds the MINLP from the solved NLP initialization, without the cuts and without solving it.
+
+        The matches whose NLP height is below min_height_from_nlp are removed and the variables are initialized
+        with the NLP solution. The NLP model is not modified.
+
+        Args:
+            model (Concrete Pyomo model): the solved NLP initialization
+            min_height_from_nlp (float, optional): the smallest NLP height of a match kept in the MINLP
+            omega (float or dict, optional): big-M parameter. Default is the omega of the NLP
+            fixed_binaries (dict, optional): values the binaries y are fixed to, indexed by (i,j,k)
+
+        returns:
+            Concrete Pyomo model
         """
-        
-        print("MINLP MODEL SOLVING")
-        # Initializing and adding/removing components from/to the pyomo model
-        
         #==================================================================================
-        #   CONSTRAINTS AND SETTING UP MODEL BASED ON NLP
+        #   MATCH SELECTION AND MODEL BUILDING BASED ON NLP
         #==================================================================================
-        #===============================================================================
-        #===============================================================================
-        
         #This section is where the initial heights are filtered and the smaller set of binary variables
         #are chosen based on the values from the NLP
-        if omega == None:
-            pass
+        if min_height_from_nlp:
+            min_height = min_height_from_nlp
         else:
-            model.del_component(model.omega)
-            model.omega = Param (model.i,model.j, initialize=omega)
-                        
-        model.ih = {}
+            #print("no min height from NLP set, so it is assumed to be 0.000001")
+            min_height = 0.000000000001
+        arex = {}
         for i in model.i:
             for j in model.j:
                 for k in model.k:
-                    if min_height_from_nlp:
-                        if model.height[i,j,k].value <= min_height_from_nlp:
-                        
-                            model.ih [i,j,k] = 0
-                            model.arex[i,j,k] = 0
-                        else:
-                            model.arex [i,j,k] =1
-                            model.ih [i,j,k] = model.height[i,j,k].value
+                    if model.height[i,j,k].value <= min_height:
+                        arex[i,j,k] = 0
                     else:
-                        #print("no min height from NLP set, so it is assumed to be 0.000001")
-                        if model.height[i,j,k].value <= 0.000000000001:
-                            model.ih [i,j,k] = 0
-                            model.arex[i,j,k] = 0
-                        else:
-                            model.arex [i,j,k] =1
-                            model.ih [i,j,k] = model.height[i,j,k].value
-                   
+                        arex[i,j,k] = 1
+
+        #the MINLP is built from the same formulation as the NLP, which is left unchanged so that it can be
+        #used again when the MINLP is retried with other settings
+        nlp = model
+        model = self._build_model(omega = omega, nlp = nlp, arex = arex)
         model.min_height_from_nlp = min_height_from_nlp
-        def height_bounds(model, i,j,k):
-            if model.arex[i,j,k] ==1:
-                return (0.0,None)
-            else:
-                return (0.0,0.0)
-      
-        model.del_component(model.height)
-        model.del_component(model.height_index)
-        model.del_component(model.height_index_index_0)
-        
-        model.height =  Var(model.i,model.j,model.k, initialize=model.ih, within=NonNegativeReals, bounds = height_bounds)
-        
-        model.iy = {}
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if model.arex[i,j,k] == 1:
-                        model.iy[i,j,k] = 1
-                    else:
-                        model.iy[i,j,k] = 0
-      
-        
-        model.del_component(model.y)
-        model.del_component(model.y_index)
-        model.del_component(model.y_index_index_0)
-        
-        model.y = Var(model.i,model.j,model.k, initialize = model.iy,within = Binary)
-        #for i in model.i:
-        #    for j in model.j:
-        #        for k in model.k:        
-        #            if model.arex[i,j,k] == 0 and model.iy[i,j,k] == 0:
-                        #model.y[i,j,k].value = 0
-                        #model.y[i,j,k].fixed=True
-        print("THESE ARE THE INIT y")
-        model.y.pprint()
-        model.del_component(model.y1)
-        model.del_component(model.y1_index)
-        model.del_component(model.y1_index_index_0)
-        
-        model.y1 = Var(model.i,model.j,model.k, initialize = model.iy, within = NonNegativeReals, bounds=(0,1))
-        #initialization rules
-       
-        def dcin_init_rule(model,i,j,k):
-            return self._rich_data.at[i,'Cin']-self._lean_data.at[j,'Cin']
+        self._copy_initial_values(nlp, model)
+        if fixed_binaries:
+            for index in fixed_binaries:
+                model.y[index].fix(int(round(fixed_binaries[index])))
+        return model
 
-        def dcin_bounds_rule(model,i,j,k):
-            if model.arex[i,j,k] ==1:
-                return (model.EMAC,1)
-            else:
-                return (model.EMAC,None)
-        model.del_component(model.dcin)
-        model.del_component(model.dcin_index)
-        model.del_component(model.dcin_index_index_0)
-        
-        def dcout_init_rule(model,i,j,k):
-            return self._rich_data.at[i,'Cin']-self._lean_data.at[j,'Cin']
+    def MINLP_from_values(self, nlp, values, min_height_from_nlp = None, omega = None):
+        """Builds the MINLP and sets its variables to a solution found elsewhere, without solving it.
 
-        def dcout_bounds_rule(model,i,j,k):
-            if k>=2:
-                if model.arex[i,j,k-1] == 1:
-                    return (model.EMAC,1)
-                else:
-                    return (model.EMAC,None) 
-            else:
-                return (model.EMAC,None) 
-        model.del_component(model.dcout)
-        model.del_component(model.dcout_index)
-        model.del_component(model.dcout_index_index_0)
+        Used to install the network found by a recovery worker in this process. The binaries are fixed at their values.
 
-        model.dcin = Var(model.i,model.j,model.k, initialize=dcin_init_rule,bounds=dcin_bounds_rule)
-        model.dcout= Var(model.i,model.j,model.k, initialize=dcout_init_rule,bounds=dcout_bounds_rule)
-        
-        #This section is where the initial mass exchanged variable are filtered and the smaller set of 
-        #binary variables are chosen based on the values from the NLP
-        """
-        model.im = {}
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if min_mass_ex_from_nlp:
-                        if model.M[i,j,k].value:
-                            if model.M[i,j,k].value <= min_mass_ex_from_nlp:
-                                model.im [i,j,k] = 0
-                                #model.arex[i,j,k] = 0
-                            elif model.arex [i,j,k] ==1:
-                                model.im [i,j,k] = model.M[i,j,k].value
-                    else:
-                        #print("no min mass from NLP set, so it is assumed to be 1e-7")
-                        if model.M[i,j,k].value:
-                            if model.M[i,j,k].value <= 1e-7:
-                                model.im [i,j,k] = 0
-                                #model.arex[i,j,k] = 0
-                            else:
-                                #model.arex [i,j,k] =1
-                                model.im [i,j,k] = model.M[i,j,k].value 
-                        else:
-                            model.im [i,j,k] = model.M[i,j,k].value
+        Args:
+            nlp (Concrete Pyomo model): the NLP initialization the worker started from
+            values (dict): values of the variables of the solved MINLP (see model_values)
+            min_height_from_nlp (float, optional): the min_height used by the worker
+            omega (float or dict, optional): the omega used by the worker
+
+        returns:
+            Concrete Pyomo model
         """
-        model.im = {}
-        for i in model.i:
-            for j in model.j:
-                for k in model.k:
-                    if model.arex[i,j,k] == 1:
-                        model.im [i,j,k] = model.M[i,j,k].value
-                    else:
-                        model.im [i,j,k] = 0
-                        
-        def M_bounds(model, i,j,k):
-            if model.arex[i,j,k] ==1:
-                return (0.0,None)
-            else:
-                return (0.0,0.0)       
-            
-        model.del_component(model.M)
-        model.del_component(model.M_index)
-        model.del_component(model.M_index_index_0)  
-        
-        model.M = Var(model.i,model.j,model.k, initialize=model.im, bounds = M_bounds)
-        
-                #rule for bounds of lean streams
-        def L_bounds(model,j):
-            if self._lean_data.at[j,'F']>0:
-                #print("LEAN DATA:   ",self._lean_data.at[j,'F'])
-                return (0.1,self._lean_data.at[j,'F'])
-        
-            else:
-                #print("LEAN DATA:   ",0,2)
-                return (0.1, 10)
-        #model.L.pprint()
-        l_init={}
-        for j in model.j:
-            #print(j)
-            l_init[j] = model.L[j].value
-            #print(model.L[j].value)
-        #print(l_init)
-        #model.del_component(model.L)
-        avleaninit={}
-        for j in model.j:
-            avleaninit[j] = model.avlean[j].value
-                    
-        model.del_component(model.avlean)
-        model.avlean = Var(model.j, initialize=avleaninit, within=NonNegativeReals)
-        
-        model.L1 = Var(model.j, initialize=l_init,bounds = L_bounds)
-        #model.L.pprint()
-    
-        #Available mass in lean stream j
-        model.del_component(model.AvLean) 
-        def AvLean_(model,j):
-            a = (self._lean_data.at[j,'Cout'])-(self._lean_data.at[j,'Cin'])
-            return model.avlean[j] == model.L1[j]*(a)
+        model = self._MINLP_model(nlp, min_height_from_nlp, omega, fixed_binaries = values['y'])
+        load_values(model, values)
+        return model
 
-        model.AvLean = Constraint(model.j, rule=AvLean_)
-        
-        model.del_component(model.Total_Mass_Rich) 
-        
-        def Total_Mass_Rich_(model,i):   
-            f=(self._rich_data.at[i,'F'])*((self._rich_data.at[i,'Cin'])-(self._rich_data.at[i,'Cout'])) 
-            return float(f)== sum(model.M[i,j,k] for j in model.j for k in model.k if model.arex[i,j,k] == 1)                     
+    def MINLP_MENS_full(self, model, min_height_from_nlp=None, min_mass_ex_from_nlp=None, omega = None, bin_cuts = None, sym_cuts = None, fixed_binaries = None):
+        """MINLP optimization model building and solving.
         
-        model.Total_Mass_Rich = Constraint(model.i, rule = Total_Mass_Rich_)
-        #for i in model.i:    
-        #    print((self._rich_data.at[i,'F'])*((self._rich_data.at[i,'Cin'])-(self._rich_data.at[i,'Cout'])))
-            
-        model.del_component(model.Total_Mass_Lean) 
-      
-        def Total_Mass_Lean_(model,j):
-            f=model.L1[j]*(((self._lean_data.at[j,'Cout'])-(self._lean_data.at[j,'Cin'])))
-            c=f
-            return model.L1[j]*(((self._lean_data.at[j,'Cout'])-(self._lean_data.at[j,'Cin']))) == sum(model.M[i,j,k] for i in model.i for k in model.k if model.arex[i,j,k] == 1)
-            
-        model.Total_Mass_Lean = Constraint(model.j, rule = Total_Mass_Lean_)
-
-        # stage stream overall mass balance
-        model.del_component(model.Stage_Mass_Rich) 
-        model.del_component(model.Stage_Mass_Rich_index)
-        def Stage_Mass_Rich_(model,i,k):    
-            if k == (model.nstages+1):
-                return Constraint.Skip
-            elif model.r_exist[i,k] == 1:    
-                f =(self._rich_data.at[i,'F'])
-                c=f
-                return float(self._rich_data.at[i,'F'])*(model.cr[i,k]-model.cr[i,(k+1)])== sum(model.M[i,j,k] for j in model.j if model.arex[i,j,k] == 1)
-            else:
-                return Constraint.Skip
+        This is the function that is called to solve the full MINLP model for MENS including binary variables
+        Requires the solved NLP in as an argument in order to utilize the initializations provided.
+        Args:
+            model (Concrete Pyomo model): Pyomo model passed from the NLP solver, NLP_MENS_init
+            min_height_from_nlp (int, optional): the smallest height values taken from the NLP suboptimization.
+                                            These values will be changed if the first solve fails.
+                                            
+            min_mass_ex_from_nlp (int, optional): the smallest mass exchanged values taken from the NLP suboptimization.
+                                            These values will be changed if the first solve fails.
+            fixed_binaries (dict, optional): values of the binary variables y indexed by (i,j,k). When given, the binaries are
+                                            fixed to these values, e.g. to re-solve a network found by a recovery worker.
             
-        model.Stage_Mass_Rich = Constraint(model.i, model.k, rule = Stage_Mass_Rich_)
-        
-        model.del_component(model.Stage_Mass_Lean) 
-        model.del_component(model.Stage_Mass_Lean_index)
-        
-        def Stage_Mass_Lean_(model,j,k):
-    
-            if k == (model.nstages+1):
-                return Constraint.Skip
-    
-            elif model.l_exist[j,k] == 1:
-                return model.L1[j]*(model.cl[j,k] - model.cl[j,(k+1)]) == \
-                    sum(model.M[i,j,k] for i in model.i if model.arex[i,j,k] == 1)
-                
-            else:
-                return Constraint.Skip 
+        returns:
+            solved pyomo model
             
-        model.Stage_Mass_Lean = Constraint(model.j,model.k, rule = Stage_Mass_Lean_)
-
-        # Binary variable relaxation strategy
-        model.del_component(model.P) 
-        model.del_component(model.P_index)
-        model.del_component(model.P_index_index_0)
-        
-        def P_(model,i,j,k):
-            if k == (model.nstages+1):
-                return Constraint.Skip
-            else:
-                return model.pnhc[i,j,k] == 1e-6
-        
-        model.P = Constraint(model.i, model.j, model.k, rule = P_)
-        
-        model.del_component(model.S) 
-        model.del_component(model.S_index)
-        model.del_component(model.S_index_index_0) 
-        
-        def S_(model,i,j,k):
-            if k == (model.nstages+1):
-                return Constraint.Skip
-            else:
-                return model.snhc[i,j,k] == 1e-6
-
-        model.S = Constraint(model.i, model.j, model.k, rule = S_)
-        
-        model.del_component(model.N) 
-        model.del_component(model.N_index)
-        model.del_component(model.N_index_index_0)
-        
-        def N_(model,i,j,k):
-            if k == (model.nstages+1):
-                return Constraint.Skip
-            else:
-                return model.y[i,j,k] == model.y1[i,j,k]+(model.pnhc[i,j,k]- model.snhc[i,j,k])
-
-        model.N = Constraint(model.i, model.j, model.k, rule = N_) 
-        
-        model.del_component(model.Log_M_RPS_LPS) 
-        model.del_component(model.Log_M_RPS_LPS_index)
-        model.del_component(model.Log_M_RPS_LPS_index_index_0)
-        
-        def Log_M_RPS_LPS_(model,i,j,k):    
-            c = ((self._rich_data.at[i,'F'])*((self._rich_data.at[i,'Cin'])-(self._rich_data.at[i,'Cout'])))
-            c=(c)
-            d=(model.L1[j]*(((self._lean_data.at[j,'Cout'])-((self._lean_data.at[j,'Cin'])))))
-            if model.arex[i,j,k] == 1:
-                if value(c) >=value(d):
-                    return model.M[i,j,k] <= (model.L1[j]*(((self._lean_data.at[j,'Cout'])-((self._lean_data.at[j,'Cin'])))))*model.y[i,j,k]
-                else:
-                    return model.M[i,j,k] <= ((self._rich_data.at[i,'F'])*((self._rich_data.at[i,'Cin'])-(self._rich_data.at[i,'Cout'])))*model.y[i,j,k]
-            else:
-                return Constraint.Skip
-    
-        model.Log_M_RPS_LPS = Constraint(model.i, model.j, model.k, rule = Log_M_RPS_LPS_)
-        
-        #LOGICAL CONSTRAINT ON RICH SIDE COMPOSITION DIFFERENCE BETWEEN RPS(I) AND LPS(J)
-        model.del_component(model.Log_DC_RPS_LPS_RS)
-        model.del_component(model.Log_DC_RPS_LPS_RS_index)
-        model.del_component(model.Log_DC_RPS_LPS_RS_index_index_0)
-        
-        def Log_DC_RPS_LPS_RS_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.dcin[i,j,k] <= model.cr[i,k] - model.cl[j,k]+ model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
-
-        model.Log_DC_RPS_LPS_RS = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_RS_)
-
-        model.del_component(model.Log_DC_RPS_LPS_RS1)
-        model.del_component(model.Log_DC_RPS_LPS_RS1_index)
-        model.del_component(model.Log_DC_RPS_LPS_RS1_index_index_0)        
-        def Log_DC_RPS_LPS_RS1_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.dcin[i,j,k] >= model.cr[i,k] - model.cl[j,k]- model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
-        model.Log_DC_RPS_LPS_RS1 = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_RS1_)
-
-        #LOGICAL CONSTRAINT ON Lean SIDE COMPOSITION DIFFERENCE BETWEEN RPS(I) AND LPS(J)
-        model.del_component(model.Log_DC_RPS_LPS_LS)
-        model.del_component(model.Log_DC_RPS_LPS_LS_index)
-        model.del_component(model.Log_DC_RPS_LPS_LS_index_index_0)
-        def Log_DC_RPS_LPS_LS_(model,i,j,k):
-            if model.arex[i,j,(k)] == 1:
-                return model.dcout[i,j,(k+1)] <= model.cr[i,(k+1)] - model.cl[j,(k+1)]+\
-                                                 model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
-        model.Log_DC_RPS_LPS_LS = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_LS_)
-        
-        model.del_component(model.Log_DC_RPS_LPS_LS1)
-        model.del_component(model.Log_DC_RPS_LPS_LS1_index)
-        model.del_component(model.Log_DC_RPS_LPS_LS1_index_index_0)
-        def Log_DC_RPS_LPS_LS1_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.dcout[i,j,(k+1)] >= model.cr[i,(k+1)] - model.cl[j,(k+1)] -\
-                                     model.omega[i,j]*(1-model.y[i,j,k])
-            else:
-                return Constraint.Skip
-
-        model.Log_DC_RPS_LPS_LS1 = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_LS1_)        
+        """
         
-        model.del_component(model.KYTransferMass)
-        model.del_component(model.KYTransferMass_index)
-        model.del_component(model.KYTransferMass_index_index_0)
-        def KYTransferMass_(model, i,j,k):
-            if model.arex[i,j,k]==1:
-                return model.kya[i,j,k]==model.kw*model.surfA[i,j,k]*model.surfAcor[i,j,k]*model.kwcor[i,j,k]
-            else:
-                return Constraint.Skip
-    
-        model.KYTransferMass = Constraint(model.i, model.j, model.k, rule = KYTransferMass_) 
+        print("MINLP MODEL SOLVING")
+        model = self._MINLP_model(model, min_height_from_nlp, omega, fixed_binaries)
+        print("THESE ARE THE INIT y")
+        dump(model.y)
 
         # Cut generation
         model.cuts = ConstraintList()
         
-        print('cuts:',bin_cuts)
+        log_message('cuts:', bin_cuts)
         if bin_cuts:
             for cutnum in bin_cuts:
                 #print('cutnum:', cutnum)
@@ -1418,57 +1206,88 @@ class MENS(object):
                                 
                     model.cuts.add(expr >= 1)
 
-        model.del_component(model.HeightColumn)
-        model.del_component(model.HeightColumn_index)
-        model.del_component(model.HeightColumn_index_index_0)
-        def HeightColumn_(model,i,j,k):
-            if model.arex[i,j,k] == 1:
-                return model.height[i,j,k] == model.M[i,j,k]/(((model.kya[i,j,k]*numpy.pi/4*((model.dia[i,j,k]*model.diacor[i,j,k])**2))) *\
-                                          (((model.dcin[i,j,k]*model.dcout[i,j,(k+1)])*\
-                                           (model.dcin[i,j,k]+model.dcout[i,j,(k+1)])*0.5)**(0.33333)+1E-6)+1E-6)*model.y[i,j,k]
-            else:
-                return Constraint.Skip
-
-        model.HeightColumn = Constraint(model.i, model.j, model.k, rule = HeightColumn_)
-        
-        #==================================================================================
-        #   OBJECTIVE FUNCTION AND SOLVE STATEMENT
-        #==================================================================================
-        model.del_component(model.TACeqn)
-        model.w = 0.000001
-        def TACeq_(model):
-            tac = 0
-            for i in model.i:
-                for j in model.j:
-                    for k in model.k:
-                        tac += model.AF*23805*((model.diacor[i,j,k]*model.dia[i,j,k])**0.57)*1.15*model.heightcor[i,j,k]*model.height[i,j,k]
-                        tac += model.AF*numpy.pi*((model.dia[i,j,k]*model.diacor[i,j,k])**2)/4*model.height[i,j,k]*model.heightcor[i,j,k]*model.packcost[i,j,k]*model.packcostcor[i,j,k]
-                        tac += model.fixcost*model.y[i,j,k]
-                        tac += model.w*(model.pnhc[i,j,k]+model.snhc[i,j,k])
-            for j in model.j:
-                tac += model.L1[j]*model.AC[j]            
-            return tac
-        
-        model.TACeqn = Objective(rule = TACeq_, sense = minimize)
-        
         results, solversolved, globalsol  = solve_until_feas_MINLP_DICOPT(model)
         #==================================================================================
         #   POSTPROCESSING AND DISPLAY AND RETURN
         #==================================================================================
-        print(results)
+        log_message(results)
         if (results.solver.status == SolverStatus.ok) and (results.solver.termination_condition == TerminationCondition.optimal):
-            model.height.pprint()
-            model.M.pprint()
-            model.avlean.pprint()
-            model.L1.pprint()
-            model.cr.pprint()
-            model.cl.pprint()
-            model.dcin.pprint()
-            model.dcout.pprint()
-            model.y.pprint()
+            dump(model.height)
+            dump(model.M)
+            dump(model.avlean)
+            dump(model.L1)
+            dump(model.cr)
+            dump(model.cl)
+            dump(model.dcin)
+            dump(model.dcout)
+            dump(model.y)
             print(model.TACeqn())
         model.solversolved = solversolved
         model.globalsol = globalsol
 
         return model,results
     
+
+class NetworkResult(object):
+    __slots__ = ("TAC", "status", "termination", "indices", "arrays")
+
+    def __init__(self, TAC, indices, arrays, status = None, termination = None):
+        """Compact numeric record of a solved network (MINLP or suboptimization) model.
+
+        The value of every variable component is stored as a NumPy array with the list of its indices,
+        so that the best network can be kept over the iterations without keeping the Pyomo model alive.
+
+        Args:
+            TAC (float): total annualized cost of the network
+            indices (dict): list of the indices of each variable component, keyed by the component name
+            arrays (dict): NumPy array of the values of each variable component, in the order of indices
+            status (str, optional): solver status of the solve
+            termination (str, optional): termination condition of the solve
+
+        """
+        self.TAC = TAC
+        self.indices = indices
+        self.arrays = arrays
+        self.status = status
+        self.termination = termination
+
+    @classmethod
+    def from_model(cls, model, results = None):
+        """Extracts the compact record from a solved network model
+
+        The binaries are always stored under 'y', also when they are fixed parameters in the suboptimization.
+
+        Args:
+            model (Concrete pyomo model): model returned by MINLP_MENS_full or the suboptimization
+            results (optional): solver results of the solve
+
+        Returns:
+            NetworkResult
+        """
+        indices = dict()
+        arrays = dict()
+        for component in model.component_objects(Var, active = True):
+            keys = list(component.keys())
+            indices[component.local_name] = keys
+            arrays[component.local_name] = numpy.array([component[key].value for key in keys], dtype = float)
+        if 'y' not in indices:
+            keys = list(model.y.keys())
+            indices['y'] = keys
+            arrays['y'] = numpy.array([value(model.y[key]) for key in keys], dtype = float)
+        status = None
+        termination = None
+        if results is not None:
+            status = str(results.solver.status)
+            termination = str(results.solver.termination_condition)
+        return cls(TAC = value(model.TACeqn), indices = indices, arrays = arrays, status = status, termination = termination)
+
+    def get(self, name):
+        """Returns the values of a variable component as a dictionary keyed by its indices
+
+        Args:
+            name (str): name of the component in the network model (e.g. 'y', 'height', 'M')
+
+        Returns:
+            dict
+        """
+        return dict(zip(self.indices[name], self.arrays[name].tolist()))
@@ -15,11 +15,13 @@ from pyomo.environ import *
 from pyomo.dae import *
 from pyomo.opt import SolverFactory, ProblemFormat, TerminationCondition, SolverStatus
 from library.FeasibleSolver import *
+from library.Verbosity import *
 import pandas as pd
 import os
 import inspect
 import numpy as np
 import sys
+import time
 
 __author__ = "Michael Short"
 __copyright__ = "Copyright 2020"
@@ -30,8 +32,66 @@ __maintainer__ =  "Michael Short"
 __email__ = "m.short@surrey.ac.uk"
 __status__ = "Development"
 
+#Radau collocation points on each finite element, matching the collocation matrix a(jj,jj) used in the models
+radau_points = {3:[0.155051025721682, 0.644948974278318, 1.0]}
+
+def exchanger_profiles(m):
+    """Extracts the concentration and flux profiles of a solved exchanger model as NumPy arrays.
+
+    The points are the inlet and the Radau collocation points of every finite element, given as the
+    normalized position along the column. Values that were never set are stored as nan.
+
+    Args:
+        m (Concrete pyomo model): solved exchanger model
+
+    Returns:
+        tuple: (position, cR, cL, flux) arrays. flux has no value at the inlet and is one shorter
+    """
+    nfe = len(m.ii)
+    ncp = len(m.jj)
+    tau = radau_points[ncp]
+    position = [0.0]
+    cR = [m.cR0[1].value]
+    cL = [m.cL0[1].value]
+    flux = []
+    for ii in m.ii:
+        for jj in m.jj:
+            position.append((ii - 1 + tau[jj - 1])/nfe)
+            cR.append(m.cRs[ii,jj].value)
+            cL.append(m.cLs[ii,jj].value)
+            flux.append(m.flux[ii,jj].value)
+    return (np.array(position, dtype = float), np.array(cR, dtype = float), np.array(cL, dtype = float),
+            np.array(flux, dtype = float))
+
+def extract_warm_start(m, rich_in_side, rich_out_side, rich_stream_name, lean_stream_name):
+    """Extracts the profiles and design variables of a solved exchanger model so that they can be used to
+    initialize a later solve of the same match.
+
+    The profiles are stored against the normalized position along the column, so that they can be
+    interpolated onto a different number of finite elements.
+
+    Args:
+        m (Concrete pyomo model): solved exchanger model
+        rich_in_side (dict): concentrations at the rich inlet side used for the solve
+        rich_out_side (dict): concentrations at the rich outlet side used for the solve
+        rich_stream_name (str): name of the rich stream
+        lean_stream_name (str): name of the lean stream
+
+    Returns:
+        dict: warm start data for mass_exchanger
+    """
+    position, cR, cL, flux = exchanger_profiles(m)
+    design = dict()
+    for name in ["height", "diameter", "area", "koga", "VelocityR", "VelocityL", "ReL", "ReG", "Flood", "FloodAct",
+                 "packfact", "ai", "packsize", "SpecAreaPacking", "packVoid", "PackCost"]:
+        design[name] = getattr(m, name).value
+    return {"position":position, "cR":cR, "cL":cL, "flux":flux,
+            "rich_in":rich_in_side[rich_stream_name], "rich_out":rich_out_side[rich_stream_name],
+            "lean_in":rich_in_side[lean_stream_name], "lean_out":rich_out_side[lean_stream_name],
+            "FlowRm":value(m.FlowRm), "design":design}
+
 class mass_exchanger(object):
-    def __init__(self, rich_stream_name, lean_stream_name, rich_in_side, rich_out_side, flowrates, me_inits, stream_properties, ncp =3, nfe =200):
+    def __init__(self, rich_stream_name, lean_stream_name, rich_in_side, rich_out_side, flowrates, me_inits, stream_properties, ncp =3, nfe =200, warm_start = None):
         # type: dict,dict, dict,
         """mass_exchanger class for individual packed column optimization from mass balances.
 
@@ -54,6 +114,8 @@ class mass_exchanger(object):
             stream_properties (dict): physical properties of the streams
             ncp (int, optional):number of collocation points. Default is 3, must be an odd number for Radau roots (preferably under 10)
             nfe (int, optional): number of finite elements. Default is 100, must be a whole number.
+            warm_start (dict, optional): profiles and design variables of a previous solve of the same match,
+                                        as returned by extract_warm_start. Used as the initial point of the full model.
             
         """
         #self.ip = SolverFactory('ipopt')
@@ -69,6 +131,7 @@ class mass_exchanger(object):
         self._stream_properties = stream_properties
         self.ncp = ncp
         self.nfe = nfe
+        self.warm_start = warm_start
                
     def Construct_pyomo_model(self):
         """ Constructs the first basic pyomo model. Used to initialize further models
@@ -254,8 +317,8 @@ class mass_exchanger(object):
         #display(m)
         #print(results)
 
-        m.height.pprint()
-        m.diameter.pprint()
+        dump(m.height)
+        dump(m.diameter)
         q = m.FlowRm.value*(m.cR0[1].value-m.cRs[self.nfe,self.ncp].value)
         print("mass exchanged R:  ", q )
         
@@ -362,14 +425,14 @@ class mass_exchanger(object):
             count+=1
             
         m.visRich = Param(initialize = m.visR[self.rich_stream_name])
-        m.visRich.pprint()
+        dump(m.visRich)
         m.de = Param(initialize=0.02)        
         
         #These need to come from data
         m.RHOG = Param(initialize = rhog[self.rich_stream_name])
-        m.RHOG.pprint()
+        dump(m.RHOG)
         m.RHOL = Param(initialize = rhol[self.lean_stream_name])
-        m.RHOL.pprint()
+        dump(m.RHOL)
         #sys.exit()
         #Henry for mol SO2 per mol H2O = 0.0234, but in this eg, it is already inc
         #m.henry = Param(initialize = 1)
@@ -421,7 +484,8 @@ class mass_exchanger(object):
         #========================================
         
         m.del_component(m.TRateVap)
-        m.del_component(m.TRateVap_index)
+        #deleted by name, as Pyomo 6 no longer adds the implicit index set to the model
+        m.del_component('TRateVap_index')
         def TRateVap_(m, ii,jj):
 
             return m.flux[ii,jj] == -m.koga*m.area*m.surfarea*m.surfacor*(m.cRs[ii,jj]-m.henry*m.cLs[ii,jj])
@@ -488,11 +552,11 @@ class mass_exchanger(object):
         #print(m.FixCost, "    ", q, "   ", w)
         #print(m.CapCost.value)
         #m.CapCost.pprint()
-        m.height.pprint()
-        m.diameter.pprint()
-        m.VelocityL.pprint()
-        m.VelocityR.pprint()
-        m.koga.pprint()
+        dump(m.height)
+        dump(m.diameter)
+        dump(m.VelocityL)
+        dump(m.VelocityR)
+        dump(m.koga)
         #m.flux.pprint()
         q = m.FlowRm.value*(m.cR0[1].value-m.cRs[self.nfe,self.ncp].value)
         print("mass exchanged R:  ", q )
@@ -703,18 +767,18 @@ class mass_exchanger(object):
         #w=m.AF*pi*(m.diameter()**2)/4*m.height()*m.PackCost
         #print(m.FixCost, "    ",q,"   ", w)
         #m.CapCost.pprint()
-        m.height.pprint()
+        dump(m.height)
         #m.heightp.pprint()
-        m.diameter.pprint()
-        m.ReG.pprint()
-        m.ReL.pprint()
-        m.Flood.pprint()
-        m.FloodAct.pprint()
-        m.VelocityR.pprint()
-        m.VelocityL.pprint()
-        m.packfact.pprint()
-        m.koga.pprint()
-        m.de.pprint()
+        dump(m.diameter)
+        dump(m.ReG)
+        dump(m.ReL)
+        dump(m.Flood)
+        dump(m.FloodAct)
+        dump(m.VelocityR)
+        dump(m.VelocityL)
+        dump(m.packfact)
+        dump(m.koga)
+        dump(m.de)
         #m.display()
         #print(results)
         #results.pprint
@@ -812,7 +876,7 @@ class mass_exchanger(object):
         #========================================
             
         m.del_component(m.TRateVap)
-        m.del_component(m.TRateVap_index)
+        m.del_component('TRateVap_index')
         def TRateVap_(m, ii,jj):
             return m.flux[ii,jj] == -m.koga*m.area*m.ai*(m.cRs[ii,jj]-m.henry*m.cLs[ii,jj])
         m.TRateVap = Constraint(m.ii,m.jj, rule = TRateVap_)
@@ -878,22 +942,22 @@ class mass_exchanger(object):
         q= m.AF*23805*(m.diameter**0.57)*1.15*m.height()
         w=m.AF*pi*(m.diameter()**2)/4*m.height()*m.PackCost
         #print(m.FixCost, "    ",q,"   ", w)
-        m.height.pprint()
-        m.diameter.pprint()
+        dump(m.height)
+        dump(m.diameter)
         #m.ai.pprint()
-        m.FloodAct.pprint()
-        m.Flood.pprint()  
-        m.ai.pprint()
-        m.ap.pprint()
-        m.packfact.pprint()
-        m.VelocityR.pprint()
-        m.VelocityL.pprint()
-        m.koga.pprint()
+        dump(m.FloodAct)
+        dump(m.Flood)
+        dump(m.ai)
+        dump(m.ap)
+        dump(m.packfact)
+        dump(m.VelocityR)
+        dump(m.VelocityL)
+        dump(m.koga)
         #m.packsize.pprint()
-        m.PackCost.pprint()
+        dump(m.PackCost)
         #m.SpecAreaPacking.pprint()
-        m.ReL.pprint()
-        m.ReG.pprint()
+        dump(m.ReL)
+        dump(m.ReG)
         #m.packVoid.pprint()
         print("All inlet and outlet concs:")
         q = m.FlowRm.value*(m.cR0[1].value-m.cRs[self.nfe,self.ncp].value)
@@ -1474,24 +1538,24 @@ class mass_exchanger(object):
         print("fixcost",m.FixCost, "shell",q,"packing   ", w)
         print("results from 5th NLP")
         #m.CapCost.pprint()
-        m1.height.pprint()
-        m1.diameter.pprint()
+        dump(m1.height)
+        dump(m1.diameter)
         #m.ai.pprint()
-        m1.area.pprint()
-        m1.FloodAct.pprint()
-        m1.Flood.pprint()  
-        m1.ai.pprint()
+        dump(m1.area)
+        dump(m1.FloodAct)
+        dump(m1.Flood)
+        dump(m1.ai)
         #m.ap.pprint()
-        m1.packfact.pprint()
-        m1.VelocityR.pprint()
-        m1.VelocityL.pprint()
-        m1.koga.pprint()
-        m1.packsize.pprint()
-        m1.PackCost.pprint()
-        m1.SpecAreaPacking.pprint()
-        m1.ReL.pprint()
-        m1.ReG.pprint()
-        m1.packVoid.pprint()
+        dump(m1.packfact)
+        dump(m1.VelocityR)
+        dump(m1.VelocityL)
+        dump(m1.koga)
+        dump(m1.packsize)
+        dump(m1.PackCost)
+        dump(m1.SpecAreaPacking)
+        dump(m1.ReL)
+        dump(m1.ReG)
+        dump(m1.packVoid)
         print("All inlet and outlet concs:")
         q = m1.FlowRm.value*(m1.cR0[1].value-m1.cRs[self.nfe,self.ncp].value)
         print("mass exchanged R:  ", q )
@@ -1508,8 +1572,8 @@ class mass_exchanger(object):
         #print("number of constraints", m1.nconstraints())
         
         #m.display()
-        print('=============================================================================================')
-        print(results)
+        log_message('=============================================================================================')
+        log_message(results)
         #m.load(results)
         #elif (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):  
         #    print("The exchanger problem could not be solved")
@@ -1564,7 +1628,7 @@ class mass_exchanger(object):
         m.Obj4 = Objective( rule = Obj4_,sense=minimize)
         #m.Obj3.deactivate()
         m.Obj4.activate() 
-        m.height.pprint()
+        dump(m.height)
         presolve_clone = m.clone()
         results = solve_until_feas_NLP(m)
         #========================================
@@ -1617,23 +1681,23 @@ class mass_exchanger(object):
         
         #print("number of constraints", m.nconstraints())
         #m.CapCost.pprint()
-        m.height.pprint()
-        m.diameter.pprint()
+        dump(m.height)
+        dump(m.diameter)
         #m.ai.pprint()
-        m.FloodAct.pprint()
-        m.Flood.pprint()  
-        m.ai.pprint()
+        dump(m.FloodAct)
+        dump(m.Flood)
+        dump(m.ai)
         #m.ap.pprint()
-        m.packfact.pprint()
-        m.VelocityR.pprint()
-        m.VelocityL.pprint()
-        m.koga.pprint()
-        m.packsize.pprint()
-        m.PackCost.pprint()
-        m.SpecAreaPacking.pprint()
-        m.ReL.pprint()
-        m.ReG.pprint()
-        m.packVoid.pprint()
+        dump(m.packfact)
+        dump(m.VelocityR)
+        dump(m.VelocityL)
+        dump(m.koga)
+        dump(m.packsize)
+        dump(m.PackCost)
+        dump(m.SpecAreaPacking)
+        dump(m.ReL)
+        dump(m.ReG)
+        dump(m.packVoid)
         #m.display()
         #print('=============================================================================================')
         #print(results)
@@ -1644,6 +1708,73 @@ class mass_exchanger(object):
         m.success = success_solve
         return m, results, presolve_clone, success_solve
 
+    def _interpolate_warm_start(self):
+        """Interpolates the stored profiles of a previous solve onto the finite element grid of this model.
+
+        The concentration profiles are rescaled to the new boundary concentrations and the flux to the new
+        mass exchanged, so that the initial point is close to satisfying the boundary conditions.
+
+        Args:
+            None
+
+        Returns:
+            inits (dict): initial values for the profile variables, indexed by variable name
+        """
+        ws = self.warm_start
+        tau = radau_points[self.ncp]
+        pos_s = np.array([(ii - 1 + tau[jj - 1])/self.nfe for ii in range(1, self.nfe + 1) for jj in range(1, self.ncp + 1)])
+        pos_0 = np.array([(ii - 1)/self.nfe for ii in range(1, self.nfe + 1)])
+
+        def rescale(profile, old_in, old_out, new_in, new_out):
+            if abs(old_out - old_in) <= 1e-12:
+                return profile - old_in + new_in
+            return new_in + (profile - old_in)/(old_out - old_in)*(new_out - new_in)
+
+        rich_in = self.rich_in[self.rich_stream_name]
+        rich_out = self.rich_out[self.rich_stream_name]
+        lean_in = self.rich_in[self.lean_stream_name]
+        lean_out = self.rich_out[self.lean_stream_name]
+
+        cR = rescale(ws["cR"], ws["rich_in"], ws["rich_out"], rich_in, rich_out)
+        cL = rescale(ws["cL"], ws["lean_in"], ws["lean_out"], lean_in, lean_out)
+        cRs = np.interp(pos_s, ws["position"], cR)
+        cR0 = np.interp(pos_0, ws["position"], cR)
+        cLs = np.interp(pos_s, ws["position"], cL)
+        cL0 = np.interp(pos_0, ws["position"], cL)
+
+        mass_old = ws["FlowRm"]*(ws["rich_in"] - ws["rich_out"])
+        mass_new = self.mass_flows[self.rich_stream_name]*(rich_in - rich_out)
+        scale = 1
+        if abs(mass_old) > 1e-12:
+            scale = mass_new/mass_old
+        flux = np.minimum(np.interp(pos_s, ws["position"][1:], ws["flux"])*scale, 0)
+        height = ws["design"]["height"]
+
+        inits = dict()
+        inits["cRs"] = dict()
+        inits["cLs"] = dict()
+        inits["flux"] = dict()
+        inits["cdotR"] = dict()
+        inits["cdotL"] = dict()
+        inits["hs"] = dict()
+        inits["cR0"] = dict()
+        inits["cL0"] = dict()
+        inits["h0"] = dict()
+        n = 0
+        for ii in range(1, self.nfe + 1):
+            inits["cR0"][ii] = max(float(cR0[ii - 1]), 0)
+            inits["cL0"][ii] = max(float(cL0[ii - 1]), 0)
+            inits["h0"][ii] = height*pos_0[ii - 1]
+            for jj in range(1, self.ncp + 1):
+                inits["cRs"][ii,jj] = max(float(cRs[n]), 0)
+                inits["cLs"][ii,jj] = max(float(cLs[n]), 0)
+                inits["flux"][ii,jj] = float(flux[n])
+                inits["cdotR"][ii,jj] = float(flux[n])/self.mass_flows[self.rich_stream_name]
+                inits["cdotL"][ii,jj] = float(flux[n])/self.mass_flows[self.lean_stream_name]
+                inits["hs"][ii,jj] = height*pos_s[n]
+                n += 1
+        return inits
+
     def full_exchanger_model(self):
         """ Constructs the the 5th pyomo model of 5 from no initial values.
         Contains all variables and model information.
@@ -1687,7 +1818,13 @@ class mass_exchanger(object):
         m1.ag = Param(initialize = 0.123)
         
         
-        m1.height = Var(initialize = 2,bounds = (0.15, None))
+        design = {"height":2, "diameter":0.5, "area":0.25, "koga":0.04, "VelocityR":1, "VelocityL":1, "ReL":100, "ReG":100,
+                  "Flood":1000, "FloodAct":1000, "packfact":2000, "ai":150, "packsize":0.05, "SpecAreaPacking":150, "packVoid":0.68,
+                  "PackCost":self.ME_inits["packcost"]*self.ME_inits["packcostcor"]}
+        if self.warm_start != None:
+            print("Initializing the exchanger from the previous solution for this match")
+            design.update(self.warm_start["design"])
+        m1.height = Var(initialize = design["height"],bounds = (0.15, None))
         #=========================================
         #Parameters
         #=========================================
@@ -1798,6 +1935,18 @@ class mass_exchanger(object):
         for i in m1.ii:
             for j in m1.jj:
                 hs_init[i,j]=0.1
+        
+        if self.warm_start != None:
+            inits = self._interpolate_warm_start()
+            flux_init = inits["flux"]
+            cRs_init = inits["cRs"]
+            cLs_init = inits["cLs"]
+            cL0_init = inits["cL0"]
+            cR0_init = inits["cR0"]
+            h0_init = inits["h0"]
+            cdotR_init = inits["cdotR"]
+            cdotL_init = inits["cdotL"]
+            hs_init = inits["hs"]
                     
         #flux of the contaminant from vapour
         m1.flux =Var(m1.ii,m1.jj, initialize = flux_init, bounds = (None, 0))
@@ -1813,35 +1962,35 @@ class mass_exchanger(object):
         m1.hs = Var(m1.ii,m1.jj,within = NonNegativeReals, initialize = hs_init)
         
         
-        d = 0.5
+        d = design["diameter"]
         m1.diameter = Var(initialize =d, within = NonNegativeReals)
 
-        m1.area = Var(initialize = 0.25, within = NonNegativeReals)
+        m1.area = Var(initialize = design["area"], within = NonNegativeReals)
 
-        m1.koga = Var(initialize = 0.04, within = NonNegativeReals)
+        m1.koga = Var(initialize = design["koga"], within = NonNegativeReals)
 
-        m1.VelocityR = Var(initialize = 1, bounds=(0.00001,None))
+        m1.VelocityR = Var(initialize = design["VelocityR"], bounds=(0.00001,None))
         
-        m1.VelocityL = Var(initialize = 1, bounds=(0.00001,None)) 
+        m1.VelocityL = Var(initialize = design["VelocityL"], bounds=(0.00001,None)) 
         
-        m1.ReL = Var(initialize = 100, bounds = (0.00001,None)) 
+        m1.ReL = Var(initialize = design["ReL"], bounds = (0.00001,None)) 
         
-        m1.ReG = Var(initialize = 100, bounds = (1,None))
+        m1.ReG = Var(initialize = design["ReG"], bounds = (1,None))
 
-        m1.Flood = Var(initialize = 1000, within = NonNegativeReals)
+        m1.Flood = Var(initialize = design["Flood"], within = NonNegativeReals)
 
-        m1.FloodAct = Var(initialize = 1000, within = NonNegativeReals)
+        m1.FloodAct = Var(initialize = design["FloodAct"], within = NonNegativeReals)
         
-        m1.packfact = Var(initialize = 2000, bounds =(40,4000))
+        m1.packfact = Var(initialize = design["packfact"], bounds =(40,4000))
 
-        m1.ai = Var(initialize = 150, within = NonNegativeReals) 
+        m1.ai = Var(initialize = design["ai"], within = NonNegativeReals) 
         
-        m1.packsize = Var(initialize = 0.05, bounds=(0.005, None))
-        m1.SpecAreaPacking = Var(initialize =150, bounds=(5, None))
-        m1.packVoid = Var(initialize=0.68,bounds = (0.5, None))
+        m1.packsize = Var(initialize = design["packsize"], bounds=(0.005, None))
+        m1.SpecAreaPacking = Var(initialize =design["SpecAreaPacking"], bounds=(5, None))
+        m1.packVoid = Var(initialize=design["packVoid"],bounds = (0.5, None))
         
         #m.del_component(m.PackCost)
-        m1.PackCost = Var(initialize = (self.ME_inits["packcost"]*self.ME_inits["packcostcor"]), within = NonNegativeReals)
+        m1.PackCost = Var(initialize = design["PackCost"], within = NonNegativeReals)
  
         #========================================
         #CONSTRAINTS
@@ -2050,24 +2199,24 @@ class mass_exchanger(object):
         print( "shell",q,"packing   ", w)
         print("results from 5th NLP")
         #m.CapCost.pprint()
-        m1.height.pprint()
-        m1.diameter.pprint()
+        dump(m1.height)
+        dump(m1.diameter)
         #m.ai.pprint()
-        m1.area.pprint()
-        m1.FloodAct.pprint()
-        m1.Flood.pprint()  
-        m1.ai.pprint()
+        dump(m1.area)
+        dump(m1.FloodAct)
+        dump(m1.Flood)
+        dump(m1.ai)
         #m.ap.pprint()
-        m1.packfact.pprint()
-        m1.VelocityR.pprint()
-        m1.VelocityL.pprint()
-        m1.koga.pprint()
-        m1.packsize.pprint()
-        m1.PackCost.pprint()
-        m1.SpecAreaPacking.pprint()
-        m1.ReL.pprint()
-        m1.ReG.pprint()
-        m1.packVoid.pprint()
+        dump(m1.packfact)
+        dump(m1.VelocityR)
+        dump(m1.VelocityL)
+        dump(m1.koga)
+        dump(m1.packsize)
+        dump(m1.PackCost)
+        dump(m1.SpecAreaPacking)
+        dump(m1.ReL)
+        dump(m1.ReG)
+        dump(m1.packVoid)
         print("All inlet and outlet concs:")
         q = m1.FlowRm.value*(m1.cR0[1].value-m1.cRs[self.nfe,self.ncp].value)
         print("mass exchanged R:  ", q )
@@ -2084,8 +2233,8 @@ class mass_exchanger(object):
         #print("number of constraints", m1.nconstraints())
         
         #m.display()
-        print('=============================================================================================')
-        print(results)
+        log_message('=============================================================================================')
+        log_message(results)
         #m.load(results)
         #elif (results.solver.termination_condition == TerminationCondition.infeasible) or (results.solver.termination_condition == TerminationCondition.maxIterations):  
         #    print("The exchanger problem could not be solved")
@@ -2112,19 +2261,36 @@ class mass_exchanger(object):
             success_solve (bool): flag to tell whether we have a feasible exchanger
         """
         print("First trying to solve the exchanger with no initializations")
+        timings = []
+        def timed(name, t0):
+            timings.append({"phase": name, "nfe": self.nfe, "seconds": time.perf_counter() - t0})
         
+        t0 = time.perf_counter()
         ME5, ME5results, presolve_5, success = self.full_exchanger_model()
+        timed("full_exchanger_model", t0)
         
         if success == False:
+            t0 = time.perf_counter()
             ME1, success1, presolve_1 = self.Construct_pyomo_model()
+            timed("Construct_pyomo_model", t0)
+            t0 = time.perf_counter()
             ME2, success2, presolve_2 = self.Construct_pyomo_model_2(ME1, success1, presolve_1)
+            timed("Construct_pyomo_model_2", t0)
+            t0 = time.perf_counter()
             ME3, success3, presolve_3 = self.Construct_pyomo_model_3(ME2, success2, presolve_2)
+            timed("Construct_pyomo_model_3", t0)
+            t0 = time.perf_counter()
             ME4, success4, presolve_4 = self.Construct_pyomo_model_4(ME3, success3, presolve_3)
+            timed("Construct_pyomo_model_4", t0)
+            t0 = time.perf_counter()
             ME5, ME5results, presolve_5, success = self.Construct_pyomo_model_5(ME4, success4, presolve_4)
+            timed("Construct_pyomo_model_5", t0)
             
             if success == False:
                 print("5th NLP has failed for this match. Relaxing bounds on the L / D ratio")
+                t0 = time.perf_counter()
                 ME6, ME6results, presolve_6, success6 = self.Construct_pyomo_model_6(ME5, success, presolve_5)
+                timed("Construct_pyomo_model_6", t0)
                 
                 if success6 == True:
                     ME5 = ME6
@@ -2134,9 +2300,96 @@ class mass_exchanger(object):
                     success = False
         else:
             print("We found a solution to the exchanger on the first try with lazy inits!")
-            
+
+        #wall-clock time of each of the staged models, used by the iteration trace of the HybridStrategy
+        ME5.timings = timings
         return ME5, ME5results
 
+class ExchangerResult(object):
+    __slots__ = ("success", "AF", "koga", "diameter", "height", "PackCost", "SpecAreaPacking", "nfe", "warm_start",
+                 "timings", "Obj4", "status", "termination", "position", "cR", "cL", "flux")
+
+    def __init__(self, success, AF, koga, diameter, height, PackCost, SpecAreaPacking, nfe = None, warm_start = None,
+                 status = None, termination = None, position = None, cR = None, cL = None, flux = None):
+        """Compact numeric record of a solved mass exchanger design.
+
+        Holds the design values needed by the HybridStrategy to compute the real TAC and the
+        correction factors, the solver status and the concentration profiles as NumPy arrays. It is
+        extracted right after the solve so that the Pyomo model can be freed, and it can be sent between
+        processes. The attribute names mirror the components of the exchanger model so that value() can
+        be used on either a record or a model.
+
+        Args:
+            success (bool): whether the exchanger model solved
+            AF (float): annualization factor used in the exchanger model
+            koga (float): overall mass transfer coefficient
+            diameter (float): column diameter
+            height (float): column height
+            PackCost (float): packing cost per unit volume
+            SpecAreaPacking (float): specific surface area of the packing
+            nfe (int, optional): number of finite elements used in the solve
+            warm_start (dict, optional): profiles of the solve, as returned by extract_warm_start
+            status (str, optional): solver status of the last solve
+            termination (str, optional): termination condition of the last solve
+            position (numpy array, optional): normalized position of the profile points along the column
+            cR (numpy array, optional): rich stream concentration profile
+            cL (numpy array, optional): lean stream concentration profile
+            flux (numpy array, optional): mass flux profile at the collocation points
+
+        """
+        self.success = success
+        self.AF = AF
+        self.koga = koga
+        self.diameter = diameter
+        self.height = height
+        self.PackCost = PackCost
+        self.SpecAreaPacking = SpecAreaPacking
+        self.nfe = nfe
+        self.warm_start = warm_start
+        self.timings = []
+        self.status = status
+        self.termination = termination
+        self.position = position
+        self.cR = cR
+        self.cL = cL
+        self.flux = flux
+        # same expression as Obj4 in the exchanger models
+        if None in (AF, diameter, height, PackCost):
+            self.Obj4 = float('nan')
+        else:
+            self.Obj4 = AF*23805*(diameter**0.57)*1.15*height + AF*pi*(diameter**2)/4*height*PackCost
+
+    @classmethod
+    def from_model(cls, m, nfe = None, warm_start = None, results = None):
+        """Extracts the compact record from a solved exchanger model
+
+        The profiles are shared with the warm start when one is given, otherwise they are read from the model.
+
+        Args:
+            m (Concrete pyomo model): model returned by find_detailed_exchanger_design
+            nfe (int, optional): number of finite elements used in the solve
+            warm_start (dict, optional): profiles of the solve, as returned by extract_warm_start
+            results (optional): solver results returned with the model by find_detailed_exchanger_design
+
+        Returns:
+            ExchangerResult
+        """
+        if warm_start != None:
+            position, cR, cL, flux = warm_start["position"], warm_start["cR"], warm_start["cL"], warm_start["flux"]
+        else:
+            position, cR, cL, flux = exchanger_profiles(m)
+        status = None
+        termination = None
+        if isinstance(results, str):
+            status = results
+        elif results is not None and hasattr(results, "solver"):
+            status = str(results.solver.status)
+            termination = str(results.solver.termination_condition)
+        return cls(success = bool(m.success), AF = value(m.AF), koga = m.koga.value, diameter = m.diameter.value,
+                   height = m.height.value, PackCost = m.PackCost.value, SpecAreaPacking = m.SpecAreaPacking.value, nfe = nfe,
+                   warm_start = warm_start, status = status, termination = termination, position = position, cR = cR,
+                   cL = cL, flux = flux)
+
 '''
 CRin_Side = {}
 CRin_Side['R1'] = 0.07
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Portfolio of hybrid strategy runs with different settings for the same problem.
+
+Each configuration (e.g. cor_filter_size, tol, stages, superstruct, bin_cuts) is run in its own
+process. The best real TAC found by any of the runs is shared between them, so that a run whose
+best network is worse than the bound and has stopped improving can be stopped early.
+
+@author: mchlshort
+"""
+from __future__ import division
+import multiprocessing
+import queue
+import sys
+import time
+from library.HybridStrategy import *
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+def _run_configuration(n, configuration, common, bound, lock, patience, results, output_prefix):
+    """Runs the hybrid strategy for one configuration of the portfolio and puts its statistics in the results queue.
+
+    Args:
+        n (int): number of the configuration
+        configuration (dict): run_hybrid_strategy arguments of this configuration
+        common (dict): run_hybrid_strategy arguments shared by all the configurations (problem data)
+        bound (Value): best real TAC known in the portfolio
+        lock (Lock): lock protecting the bound
+        patience (int): iterations without improvement after which a run worse than the bound is stopped
+        results (Queue): queue the statistics are put in
+        output_prefix (str): if given, the output of the run is written to output_prefix + '_config<n>.txt'
+
+    returns:
+        None
+    """
+    if output_prefix != None:
+        sys.stdout = open(output_prefix + '_config' + str(n) + '.txt', 'w')
+    arguments = dict(common)
+    arguments.update(configuration)
+    arguments['exname'] = str(arguments.get('exname', '')) + '_config' + str(n)
+    stats = {'configuration': n, 'settings': configuration, 'best_objective_real': None, 'best_net_iter': None,
+             'iterations': 0, 'seconds': None, 'stopped_early': False, 'best_exchangers': None, 'error': None}
+    start = time.perf_counter()
+    try:
+        strategy = HybridStrategy()
+        strategy.shared_bound = (bound, lock)
+        strategy.portfolio_patience = patience
+        strategy.run_hybrid_strategy(**arguments)
+        stats['best_objective_real'] = strategy.best_objective_real
+        stats['best_net_iter'] = strategy.best_net_iter
+        stats['iterations'] = strategy.iter_count + 1
+        stats['stopped_early'] = strategy.stopped_by_portfolio
+        stats['best_exchangers'] = strategy.best_exchangers
+    except BaseException as e:
+        #a configuration that fails (including sys.exit in the strategy) must not stop the portfolio
+        stats['error'] = repr(e)
+    stats['seconds'] = time.perf_counter() - start
+    if output_prefix != None:
+        sys.stdout.close()
+    results.put(stats)
+
+def run_portfolio(configurations, max_workers = None, patience = 5, output_prefix = None, **common):
+    """Runs several configurations of the hybrid strategy for the same problem as parallel processes.
+
+    The best real TAC found so far is shared between the runs. A run whose best network is worse than this bound
+    and has not improved for 'patience' iterations is stopped.
+
+    Args:
+        configurations (list): dictionaries of run_hybrid_strategy arguments, one per configuration
+                                (e.g. [{'cor_filter_size':0.05, 'stages':3}, {'cor_filter_size':0.1, 'bin_cuts':True}])
+        max_workers (int, optional): number of configurations run at the same time. Default is the number of CPUs
+        patience (int, optional): iterations without improvement after which a run worse than the bound is stopped.
+                                None to never stop a run early. Default is 5
+        output_prefix (str, optional): if given, the output of every run is written to output_prefix + '_config<n>.txt'
+        common: run_hybrid_strategy arguments shared by all the configurations (rich_data, lean_data, parameter_data,
+                                stream_properties, exname, ...)
+
+    returns:
+        dict: 'best' the statistics of the configuration with the lowest real TAC (None if no run found a network)
+              and 'configurations' the statistics of every configuration, in order
+    """
+    if not isinstance(configurations, list) or len(configurations) == 0:
+        raise RuntimeError("configurations must be a non-empty list of dictionaries")
+    for configuration in configurations:
+        if not isinstance(configuration, dict):
+            raise RuntimeError("configurations must be a non-empty list of dictionaries")
+    if max_workers == None:
+        max_workers = multiprocessing.cpu_count()
+    elif not isinstance(max_workers, int) or max_workers < 1:
+        raise RuntimeError("max_workers must be a positive integer or left to default")
+    if patience != None and (not isinstance(patience, int) or patience < 1):
+        raise RuntimeError("patience must be a positive integer or None")
+
+    manager = multiprocessing.Manager()
+    bound = manager.Value('d', float('inf'))
+    lock = manager.Lock()
+    results = manager.Queue()
+
+    processes = dict()
+    stats = dict()
+    waiting = list(range(len(configurations)))
+    while waiting or processes:
+        while waiting and len(processes) < max_workers:
+            n = waiting.pop(0)
+            print("Starting configuration ", n, ": ", configurations[n])
+            processes[n] = multiprocessing.Process(target = _run_configuration, args = (n, configurations[n], common, bound, lock,
+                                                                                       patience, results, output_prefix))
+            processes[n].start()
+        try:
+            outcome = results.get(timeout = 10)
+        except queue.Empty:
+            #a process that died without sending its statistics (e.g. a crashed solver) is recorded as failed
+            for n in list(processes):
+                if not processes[n].is_alive() and processes[n].exitcode != 0:
+                    results.put({'configuration': n, 'settings': configurations[n], 'best_objective_real': None,
+                                 'best_net_iter': None, 'iterations': 0, 'seconds': None, 'stopped_early': False,
+                                 'best_exchangers': None, 'error': 'process exited with code ' + str(processes[n].exitcode)})
+            continue
+        n = outcome['configuration']
+        processes.pop(n).join()
+        stats[n] = outcome
+        print("Configuration ", n, " finished: TAC = ", outcome['best_objective_real'], ", iterations = ", outcome['iterations'],
+              ", stopped early = ", outcome['stopped_early'], ", error = ", outcome['error'])
+    manager.shutdown()
+
+    ordered = [stats[n] for n in range(len(configurations))]
+    solved = [s for s in ordered if s['best_objective_real'] != None]
+    best = None
+    if solved:
+        best = min(solved, key = lambda s: s['best_objective_real'])
+    print("=======================================================================")
+    print("                        PORTFOLIO SUMMARY                              ")
+    print("=======================================================================")
+    for s in ordered:
+        print("config ", s['configuration'], " | TAC ", s['best_objective_real'], " | best at iteration ", s['best_net_iter'],
+              " | iterations ", s['iterations'], " | time ", s['seconds'], " s | stopped early ", s['stopped_early'],
+              " | settings ", s['settings'])
+    if best != None:
+        print("Best network found by configuration ", best['configuration'], ": ", best['best_objective_real'])
+    else:
+        print("No configuration found a network")
+    return {'best': best, 'configurations': ordered}
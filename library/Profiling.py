@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Phase-level timing of the hybrid strategy iterations.
+
+Each iteration produces one record with the wall-clock time spent in every phase (NLP
+initialization, MINLP, recovery retries, suboptimization, exchanger solves and convergence
+checking). The records can be written as JSON lines.
+
+@author: mchlshort
+"""
+from __future__ import division
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+class IterationTrace(object):
+    def __init__(self, filename = None, max_records = 10):
+        """Collects the timing of the phases of each iteration of the hybrid strategy.
+
+        Args:
+            filename (str, optional): name of the JSON lines file the iteration records are appended to.
+                                        If None all the records are kept in memory in self.records
+            max_records (int, optional): number of the most recent records kept in self.records when the records
+                                        are written to filename. Default is 10
+
+        """
+        if not isinstance(max_records, int) or max_records < 0:
+            raise RuntimeError("max_records must be a non-negative integer")
+        self.filename = filename
+        if filename == None:
+            self.records = []
+        else:
+            #the file holds every record, only the last ones are kept for inspection during the run
+            self.records = deque(maxlen = max_records)
+        self._current = None
+        self._start = None
+
+    def start_iteration(self, iteration):
+        """Starts the record of a new iteration
+
+        Args:
+            iteration (int): iteration number
+
+        returns:
+            None
+        """
+        self._current = {"iteration": iteration, "phases": []}
+        self._start = time.perf_counter()
+
+    def add(self, phase, seconds, **info):
+        """Adds a timed phase to the record of the current iteration
+
+        Args:
+            phase (str): name of the phase
+            seconds (float): wall-clock time spent in the phase
+            info: any additional values to store with the phase (e.g. match, nfe)
+
+        returns:
+            None
+        """
+        if self._current == None:
+            return
+        entry = {"phase": phase, "seconds": seconds}
+        entry.update(info)
+        self._current["phases"].append(entry)
+
+    @contextmanager
+    def phase(self, phase, **info):
+        """Context manager that times the enclosed block and adds it to the current iteration
+
+        Args:
+            phase (str): name of the phase
+            info: any additional values to store with the phase
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - t0, **info)
+
+    def end_iteration(self, **info):
+        """Closes the record of the current iteration and writes it to the JSON lines file
+
+        Args:
+            info: any additional values to store with the iteration record (e.g. objective values)
+
+        returns:
+            dict: the iteration record
+        """
+        if self._current == None:
+            return None
+        record = self._current
+        record["seconds"] = time.perf_counter() - self._start
+        totals = dict()
+        for entry in record["phases"]:
+            totals[entry["phase"]] = totals.get(entry["phase"], 0) + entry["seconds"]
+        record["totals"] = totals
+        record.update(info)
+        self.records.append(record)
+        if self.filename != None:
+            with open(self.filename, "a") as f:
+                f.write(json.dumps(record, default = str) + "\n")
+        self._current = None
+        return record
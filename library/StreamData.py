@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Precompiled rich and lean stream data for the constraint rules of the MENS models.
+
+The rules of the NLP initialization, the MINLP and the suboptimization look up the flowrates and
+compositions of the streams for every index tuple. The DataFrames read from the csv files are
+converted here once into plain dictionaries keyed on the stream names, so that each lookup is a
+dictionary access instead of a pandas .at call.
+
+@author: mchlshort
+"""
+from __future__ import division
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+def _column(data, name):
+    """Converts one column of the stream data to a dictionary of floats keyed on the stream names
+
+    Args:
+        data (pandas DataFrame): rich or lean stream data
+        name (str): name of the column, i.e. F, Cin or Cout
+
+    returns:
+        dict: column values indexed by stream name
+    """
+    return dict((index, float(v)) for index, v in data[name].to_dict().items())
+
+class StreamData(object):
+    __slots__ = ['rich_F', 'rich_Cin', 'rich_Cout', 'rich_dC', 'rich_load',
+                 'lean_F', 'lean_Cin', 'lean_Cout', 'lean_dC']
+
+    def __init__(self, rich_data, lean_data):
+        """Flowrates, compositions and mass loads of the streams as dictionaries keyed on the stream names.
+
+        Args:
+            rich_data (pandas DataFrame): DataFrame of rich stream name, concentration in, concentration out and flowrates.
+            lean_data (pandas DataFrame): DataFrame of lean stream name, concentration in, concentration out and flowrates.
+
+        The attributes are rich_F, rich_Cin, rich_Cout, rich_dC (Cin - Cout), rich_load (total mass load F*(Cin - Cout)),
+        lean_F (upper bound on the flowrate), lean_Cin, lean_Cout and lean_dC (Cout - Cin).
+        """
+        self.rich_F = _column(rich_data, 'F')
+        self.rich_Cin = _column(rich_data, 'Cin')
+        self.rich_Cout = _column(rich_data, 'Cout')
+        self.rich_dC = dict((i, self.rich_Cin[i] - self.rich_Cout[i]) for i in self.rich_Cin)
+        self.rich_load = dict((i, self.rich_F[i]*self.rich_dC[i]) for i in self.rich_F)
+        self.lean_F = _column(lean_data, 'F')
+        self.lean_Cin = _column(lean_data, 'Cin')
+        self.lean_Cout = _column(lean_data, 'Cout')
+        self.lean_dC = dict((j, self.lean_Cout[j] - self.lean_Cin[j]) for j in self.lean_Cin)
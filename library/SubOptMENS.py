@@ -19,6 +19,8 @@ import inspect
 import numpy as np
 import sys
 from library.FeasibleSolver import *
+from library.Verbosity import *
+from library.StreamData import *
 
 __author__ = "Michael Short"
 __copyright__ = "Copyright 2020"
@@ -47,6 +49,8 @@ class SubOptMENS(object):
         #check that args are actually of the right types
 
         self.minlp = model
+        if not hasattr(model, '_streams'):
+            model._streams = StreamData(model._rich_data, model._lean_data)
         
     def run_suboptimization(self):
         """this method builds the NLP formulation that will form the NLP suboptimization that relaxes
@@ -69,14 +73,13 @@ class SubOptMENS(object):
                     y[i,j,k] = model.y[i,j,k].value
                    
         model.del_component(model.y)
-        model.del_component(model.y_index)
-        model.del_component(model.y_index_index_0)
+        #the implicit index sets are deleted by name, as Pyomo 6 no longer adds them to the model
+        model.del_component('y_index')
+        model.del_component('y_index_index_0')
         
         model.y = Param(model.i,model.j,model.k, initialize = y)
 
         model.del_component(model.y1)
-        model.del_component(model.y1_index)
-        model.del_component(model.y1_index_index_0)
         
         model.y1 = Param(model.i,model.j,model.k, initialize = y)
        
@@ -92,8 +95,8 @@ class SubOptMENS(object):
             else:
                 return (model.EMAC,None)
         model.del_component(model.dcin)
-        model.del_component(model.dcin_index)
-        model.del_component(model.dcin_index_index_0)
+        model.del_component('dcin_index')
+        model.del_component('dcin_index_index_0')
         
         dcoutinit ={}
         for i in model.i:
@@ -111,8 +114,8 @@ class SubOptMENS(object):
                 return (model.EMAC,None)
             
         model.del_component(model.dcout)
-        model.del_component(model.dcout_index)
-        model.del_component(model.dcout_index_index_0)
+        model.del_component('dcout_index')
+        model.del_component('dcout_index_index_0')
 
         model.dcin = Var(model.i,model.j,model.k, initialize=dcininit,bounds=dcin_bounds_rule)
         model.dcout= Var(model.i,model.j,model.k, initialize=dcoutinit,bounds=dcout_bounds_rule)
@@ -133,16 +136,16 @@ class SubOptMENS(object):
                 return (0.0,0.0)       
             
         model.del_component(model.M)
-        model.del_component(model.M_index)
-        model.del_component(model.M_index_index_0)  
+        model.del_component('M_index')
+        model.del_component('M_index_index_0')  
         
         model.M = Var(model.i,model.j,model.k, initialize=model.im, bounds = M_bounds)
 
 
         def L_bounds(model,j):
-            if model._lean_data.at[j,'F']>0:
+            if model._streams.lean_F[j]>0:
                 #print("LEAN DATA:   ",self._lean_data.at[j,'F'])
-                return (0.1,model._lean_data.at[j,'F'])
+                return (0.1,model._streams.lean_F[j])
         
             else:
                 #print("LEAN DATA:   ",0,2)
@@ -155,7 +158,6 @@ class SubOptMENS(object):
             #print(model.L[j].value)
         #print(l_init)
         model.del_component(model.L1)
-        model.del_component(model.L)
         
         model.L1 = Var(model.j, initialize=l_init,bounds = L_bounds)
         #model.L.pprint()
@@ -173,20 +175,20 @@ class SubOptMENS(object):
                 cr_init[i,k] = model.cr[i,k].value
 
         def cr_bounds(model,i,k):
-            lb = model._rich_data.at[i,'Cout']
-            ub = model._rich_data.at[i,'Cin']
+            lb = model._streams.rich_Cout[i]
+            ub = model._streams.rich_Cin[i]
             return (lb,ub)
 
         def cl_bounds(model,j,k):
-            lb = model._lean_data.at[j,'Cin']
-            ub = model._lean_data.at[j,'Cout']
+            lb = model._streams.lean_Cin[j]
+            ub = model._streams.lean_Cout[j]
             return (lb,ub)
         
         model.del_component(model.cr)
-        model.del_component(model.cr_index)
+        model.del_component('cr_index')
                 
         model.del_component(model.cl)
-        model.del_component(model.cl_index) 
+        model.del_component('cl_index') 
         
         model.cr = Var(model.i,model.k, initialize= cr_init, bounds = cr_bounds)
         model.cl = Var(model.j,model.k, initialize= cl_init, bounds = cl_bounds)
@@ -228,7 +230,7 @@ class SubOptMENS(object):
         #   Flowrate of splits for non iso-compositional mixing
         def Flrich_bounds(model,i,j,k):
             if model.y[i,j,k] ==1:
-                return (0, model._rich_data.at[i,'F'])
+                return (0, model._streams.rich_F[i])
             else:
                 return (0.000000,50)
     
@@ -284,17 +286,14 @@ class SubOptMENS(object):
                         #model.Flc[i,j,k].fix(0)
         #positive/negative tolerance
         model.del_component(model.pnhc)
-        model.del_component(model.pnhc_index)
-        model.del_component(model.pnhc_index_index_0)
         model.del_component(model.snhc)
-        model.del_component(model.snhc_index)
-        model.del_component(model.snhc_index_index_0)
 
         #mass transfer coefficient
         model.del_component(model.kya)
-        model.del_component(model.kya_index)
-        model.del_component(model.kya_index_index_0)
-        model.kya=Var(model.i,model.j,model.k, initialize = 1, bounds = (0.00, None))
+        #the matches of the suboptimization are the ones selected by the MINLP
+        model.del_component(model.match)
+        model.match = Set(dimen = 3, ordered = True, initialize = [(i,j,k) for i in model.i for j in model.j for k in model.k if model.y[i,j,k] == 1])
+        model.kya=Var(model.match, initialize = 1, bounds = (0.00, None))
         
         #height of column
         model.hi = {}
@@ -313,8 +312,8 @@ class SubOptMENS(object):
                 return (0.0,0)
 
         model.del_component(model.height)
-        model.del_component(model.height_index)
-        model.del_component(model.height_index_index_0)
+        model.del_component('height_index')
+        model.del_component('height_index_index_0')
         model.height =  Var(model.i,model.j,model.k, initialize=model.hi, bounds=height_bounds)
         
         
@@ -324,11 +323,11 @@ class SubOptMENS(object):
         #===============================================================================
         #===============================================================================
         model.del_component(model.CRichIn) 
-        model.del_component(model.CRichIn_index)
+        model.del_component('CRichIn_index')
 
         def CRichIn_(model, i,k):
             if model.first[k] == True:
-                return model.cr[i,k] == (model._rich_data.at[i,'Cin'])
+                return model.cr[i,k] == (model._streams.rich_Cin[i])
 
             else:
                 return Constraint.Skip
@@ -336,32 +335,32 @@ class SubOptMENS(object):
         model.CRichIn = Constraint(model.i,model.k, rule=CRichIn_)
         
         model.del_component(model.CLeanIn) 
-        model.del_component(model.CLeanIn_index)
+        model.del_component('CLeanIn_index')
         def CLeanIn_(model, j,k):
             if model.last[k] == True:
-                return model.cl[j,k] == float(model._lean_data.at[j,'Cin'])
+                return model.cl[j,k] == float(model._streams.lean_Cin[j])
             else:
                 return Constraint.Skip
 
         model.CLeanIn = Constraint(model.j, model.k, rule=CLeanIn_)
 
         model.del_component(model.CRichOut) 
-        model.del_component(model.CRichOut_index)
+        model.del_component('CRichOut_index')
         
         def CRichOut_(model, i,k):
             if (model.last[k])==True:
-                return model.cr[i,k] == float(model._rich_data.at[i,'Cout'])
+                return model.cr[i,k] == float(model._streams.rich_Cout[i])
             else:
                 return Constraint.Skip
 
         model.CRichOut = Constraint(model.i,model.k, rule=CRichOut_)
              
         model.del_component(model.CLeanOut) 
-        model.del_component(model.CLeanOut_index)
+        model.del_component('CLeanOut_index')
         
         def CLeanOut_(model, j,k):
             if model.first[k] == True:
-                return model.cl[j,k] == float(model._lean_data.at[j,'Cout'])        
+                return model.cl[j,k] == float(model._streams.lean_Cout[j])        
             else:
                 return Constraint.Skip
 
@@ -370,7 +369,7 @@ class SubOptMENS(object):
         #Available mass in lean stream j
         model.del_component(model.AvLean)
         def AvLean_(model,j):
-            a = (model._lean_data.at[j,'Cout'])-(model._lean_data.at[j,'Cin'])
+            a = model._streams.lean_dC[j]
             return model.avlean[j] == model.L1[j]*(a)
 
         model.AvLean = Constraint(model.j, rule=AvLean_)
@@ -387,7 +386,7 @@ class SubOptMENS(object):
         
         model.del_component(model.Total_Mass_Rich) 
         def Total_Mass_Rich_(model,i):   
-            f=(model._rich_data.at[i,'F'])*((model._rich_data.at[i,'Cin'])-(model._rich_data.at[i,'Cout'])) 
+            f=model._streams.rich_load[i] 
             return float(f)== sum(model.M[i,j,k] for j in model.j for k in model.k if model.y[i,j,k] == 1)                     
         
         model.Total_Mass_Rich = Constraint(model.i, rule = Total_Mass_Rich_)
@@ -397,24 +396,24 @@ class SubOptMENS(object):
         model.del_component(model.Total_Mass_Lean) 
       
         def Total_Mass_Lean_(model,j):
-            f=model.L1[j]*(((model._lean_data.at[j,'Cout'])-(model._lean_data.at[j,'Cin'])))
+            f=model.L1[j]*model._streams.lean_dC[j]
             c=f
-            return model.L1[j]*(((model._lean_data.at[j,'Cout'])-(model._lean_data.at[j,'Cin']))) == sum(model.M[i,j,k] for i in model.i for k in model.k if model.y[i,j,k] == 1)
+            return model.L1[j]*model._streams.lean_dC[j] == sum(model.M[i,j,k] for i in model.i for k in model.k if model.y[i,j,k] == 1)
             
         model.Total_Mass_Lean = Constraint(model.j, rule = Total_Mass_Lean_)
 
         # stage stream overall mass balance
         model.del_component(model.Stage_Mass_Rich) 
-        model.del_component(model.Stage_Mass_Rich_index)
+        model.del_component('Stage_Mass_Rich_index')
         def Stage_Mass_Rich_(model,i,k):
     
             if k == (model.nstages+1):
                 return Constraint.Skip
             elif model.r_exist[i,k] == 1:
     
-                f =(model._rich_data.at[i,'F'])
+                f =(model._streams.rich_F[i])
                 c=f
-                return float(model._rich_data.at[i,'F'])*(model.cr[i,k]-model.cr[i,(k+1)])== sum(model.M[i,j,k] for j in model.j if model.y[i,j,k] == 1)
+                return float(model._streams.rich_F[i])*(model.cr[i,k]-model.cr[i,(k+1)])== sum(model.M[i,j,k] for j in model.j if model.y[i,j,k] == 1)
 
             else:
                 return Constraint.Skip
@@ -422,7 +421,7 @@ class SubOptMENS(object):
         model.Stage_Mass_Rich = Constraint(model.i, model.k, rule = Stage_Mass_Rich_)
         
         model.del_component(model.Stage_Mass_Lean) 
-        model.del_component(model.Stage_Mass_Lean_index)
+        model.del_component('Stage_Mass_Lean_index')
         
         def Stage_Mass_Lean_(model,j,k):
     
@@ -440,7 +439,7 @@ class SubOptMENS(object):
 
 
         model.del_component(model.Monot_Rich) 
-        model.del_component(model.Monot_Rich_index)
+        model.del_component('Monot_Rich_index')
 
         # Checking that concentrations move in one direction
         def Monot_Rich_(model,i,k):
@@ -452,7 +451,7 @@ class SubOptMENS(object):
         model.Monot_Rich = Constraint(model.i, model.k, rule = Monot_Rich_)
 
         model.del_component(model.Monot_Lean) 
-        model.del_component(model.Monot_Lean_index)
+        model.del_component('Monot_Lean_index')
 
         def Monot_Lean_(model,j,k):
             if k == (model.nstages+1):
@@ -481,23 +480,17 @@ class SubOptMENS(object):
 
         # Binary variable relaxation strategy
         model.del_component(model.P) 
-        model.del_component(model.P_index)
-        model.del_component(model.P_index_index_0)
         
         
         model.del_component(model.S) 
-        model.del_component(model.S_index)
-        model.del_component(model.S_index_index_0) 
         
         model.del_component(model.N) 
-        model.del_component(model.N_index)
-        model.del_component(model.N_index_index_0)
 
         def mixing_rsub_(model, i, k):
             if k == (model.nstages+1):
                 return Constraint.Skip
             elif model.r_exist[i,k] == 1:
-                return float(model._rich_data.at[i,'F'])*model.cr[i, k+1] == sum(model.crin[i,j,k]*model.Flrich[i,j,k] for j in model.j)
+                return float(model._streams.rich_F[i])*model.cr[i, k+1] == sum(model.crin[i,j,k]*model.Flrich[i,j,k] for j in model.j)
             else:
                 return Constraint.Skip
             
@@ -522,7 +515,7 @@ class SubOptMENS(object):
                 #print("We do get here.")
                 #print(model._rich_data.at[i,'F'])
                 #print()
-                return float(model._rich_data.at[i,'F']) == sum(model.Flrich[i,j,k] for j in model.j)
+                return float(model._streams.rich_F[i]) == sum(model.Flrich[i,j,k] for j in model.j)
             else:
                 return Constraint.Skip
     
@@ -604,38 +597,26 @@ class SubOptMENS(object):
 
 
         model.del_component(model.Log_M_RPS_LPS) 
-        model.del_component(model.Log_M_RPS_LPS_index)
-        model.del_component(model.Log_M_RPS_LPS_index_index_0)
         
         def Log_M_RPS_LPS_(model,i,j,k):    
-            c = ((model._rich_data.at[i,'F'])*((model._rich_data.at[i,'Cin'])-(model._rich_data.at[i,'Cout'])))
+            c = model._streams.rich_load[i]
             c=(c)
-            d=(model.L1[j]*(((model._lean_data.at[j,'Cout'])-((model._lean_data.at[j,'Cin'])))))
-            if model.y[i,j,k] == 1:
-                #if value(c) >=value(d):
-                #    return model.M[i,j,k] <= (model.L1[j]*(((model._lean_data.at[j,'Cout'])-((model._lean_data.at[j,'Cin'])))))
-                #else:
-                return model.M[i,j,k] <= ((model._rich_data.at[i,'F'])*((model._rich_data.at[i,'Cin'])-(model._rich_data.at[i,'Cout'])))
-            else:
-                return Constraint.Skip
+            d=(model.L1[j]*model._streams.lean_dC[j])
+            #if value(c) >=value(d):
+            #    return model.M[i,j,k] <= (model.L1[j]*(((model._lean_data.at[j,'Cout'])-((model._lean_data.at[j,'Cin'])))))
+            #else:
+            return model.M[i,j,k] <= model._streams.rich_load[i]
     
-        model.Log_M_RPS_LPS = Constraint(model.i, model.j, model.k, rule = Log_M_RPS_LPS_)
+        model.Log_M_RPS_LPS = Constraint(model.match, rule = Log_M_RPS_LPS_)
         
         #LOGICAL CONSTRAINT ON RICH SIDE COMPOSITION DIFFERENCE BETWEEN RPS(I) AND LPS(J)
         model.del_component(model.Log_DC_RPS_LPS_RS)
-        model.del_component(model.Log_DC_RPS_LPS_RS_index)
-        model.del_component(model.Log_DC_RPS_LPS_RS_index_index_0)
         def Log_DC_RPS_LPS_RS_(model,i,j,k):
-            if model.y[i,j,k] == 1:
-                return model.dcin[i,j,k] == model.cr[i,k] - model.clin[i,j,k]
-            else:
-                return Constraint.Skip
+            return model.dcin[i,j,k] == model.cr[i,k] - model.clin[i,j,k]
 
-        model.Log_DC_RPS_LPS_RS = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_RS_)
+        model.Log_DC_RPS_LPS_RS = Constraint(model.match, rule = Log_DC_RPS_LPS_RS_)
 
         model.del_component(model.Log_DC_RPS_LPS_RS1)
-        model.del_component(model.Log_DC_RPS_LPS_RS1_index)
-        model.del_component(model.Log_DC_RPS_LPS_RS1_index_index_0)        
         #def Log_DC_RPS_LPS_RS1_(model,i,j,k):
         #    if k in model.stages and model.y[i,j,k] == 1:
         #        return model.dcin[i,j,k] >= model.cr[i,k] - model.clin[i,j,k]- model.omega[i,j]*(1-model.y[i,j,k])
@@ -645,20 +626,13 @@ class SubOptMENS(object):
 
         #LOGICAL CONSTRAINT ON Lean SIDE COMPOSITION DIFFERENCE BETWEEN RPS(I) AND LPS(J)
         model.del_component(model.Log_DC_RPS_LPS_LS)
-        model.del_component(model.Log_DC_RPS_LPS_LS_index)
-        model.del_component(model.Log_DC_RPS_LPS_LS_index_index_0)
-        model.stages.pprint()
-        model.k.pprint()
+        dump(model.stages)
+        dump(model.k)
         def Log_DC_RPS_LPS_LS_(model,i,j,k):
-            if model.y[i,j,(k)] == 1:
-                return model.dcout[i,j,(k+1)] == model.crin[i,j,(k)] - model.cl[j,(k+1)]
-            else:
-                return Constraint.Skip
-        model.Log_DC_RPS_LPS_LS = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_LS_)
+            return model.dcout[i,j,(k+1)] == model.crin[i,j,(k)] - model.cl[j,(k+1)]
+        model.Log_DC_RPS_LPS_LS = Constraint(model.match, rule = Log_DC_RPS_LPS_LS_)
         
         model.del_component(model.Log_DC_RPS_LPS_LS1)
-        model.del_component(model.Log_DC_RPS_LPS_LS1_index)
-        model.del_component(model.Log_DC_RPS_LPS_LS1_index_index_0)
         #def Log_DC_RPS_LPS_LS1_(model,i,j,k):
         #    if model.y[i,j,k] == 1:
         #        return model.dcout[i,j,(k+1)] >= model.crin[i,j,(k)] - model.cl[j,(k+1)] -\
@@ -669,28 +643,18 @@ class SubOptMENS(object):
         #model.Log_DC_RPS_LPS_LS1 = Constraint(model.i, model.j, model.k, rule = Log_DC_RPS_LPS_LS1_)        
         
         model.del_component(model.KYTransferMass)
-        model.del_component(model.KYTransferMass_index)
-        model.del_component(model.KYTransferMass_index_index_0)
         def KYTransferMass_(model, i,j,k):
-            if model.y[i,j,k]==1:
-                return model.kya[i,j,k]==model.kw*model.surfA[i,j,k]*model.surfAcor[i,j,k]*model.kwcor[i,j,k]
-            else:
-                return Constraint.Skip
+            return model.kya[i,j,k]==model.kw*model.surfA[i,j,k]*model.surfAcor[i,j,k]*model.kwcor[i,j,k]
     
-        model.KYTransferMass = Constraint(model.i, model.j, model.k, rule = KYTransferMass_) 
+        model.KYTransferMass = Constraint(model.match, rule = KYTransferMass_) 
         
         model.del_component(model.HeightColumn)
-        model.del_component(model.HeightColumn_index)
-        model.del_component(model.HeightColumn_index_index_0)
         def HeightColumn_(model,i,j,k):
-            if model.y[i,j,k] == 1:
-                return model.height[i,j,k] == model.M[i,j,k]/(((model.kya[i,j,k]*np.pi/4*((model.dia[i,j,k]*model.diacor[i,j,k])**2))) *\
-                                          (((model.dcin[i,j,k]*model.dcout[i,j,(k+1)])*\
-                                           (model.dcin[i,j,k]+model.dcout[i,j,(k+1)])*0.5)**(0.33333333)))
-            else:
-                return Constraint.Skip
+            return model.height[i,j,k] == model.M[i,j,k]/(((model.kya[i,j,k]*np.pi/4*((model.dia[i,j,k]*model.diacor[i,j,k])**2))) *\
+                                      (((model.dcin[i,j,k]*model.dcout[i,j,(k+1)])*\
+                                       (model.dcin[i,j,k]+model.dcout[i,j,(k+1)])*0.5)**(0.33333333)))
 
-        model.HeightColumn = Constraint(model.i, model.j, model.k, rule = HeightColumn_)
+        model.HeightColumn = Constraint(model.match, rule = HeightColumn_)
         
         #def massexchanger():
             #In here we will call the mass exchanger function and return the height
@@ -702,12 +666,10 @@ class SubOptMENS(object):
         model.del_component(model.TACeqn)
         def TACeq_(model):
             tac = 0
-            for i in model.i:
-                for j in model.j:
-                    for k in model.k:
-                        tac += model.AF*23805*((model.diacor[i,j,k]*model.dia[i,j,k])**0.57)*1.15*model.heightcor[i,j,k]*model.height[i,j,k]
-                        tac += model.AF*np.pi*((model.dia[i,j,k]*model.diacor[i,j,k])**2)/4*model.height[i,j,k]*model.heightcor[i,j,k]*model.packcost[i,j,k]*model.packcostcor[i,j,k]
-                        tac += model.fixcost*model.y[i,j,k]
+            for i,j,k in model.match:
+                tac += model.AF*23805*((model.diacor[i,j,k]*model.dia[i,j,k])**0.57)*1.15*model.heightcor[i,j,k]*model.height[i,j,k]
+                tac += model.AF*np.pi*((model.dia[i,j,k]*model.diacor[i,j,k])**2)/4*model.height[i,j,k]*model.heightcor[i,j,k]*model.packcost[i,j,k]*model.packcostcor[i,j,k]
+                tac += model.fixcost*model.y[i,j,k]
             for j in model.j:
                 tac += model.L1[j]*model.AC[j]                    
             return tac
@@ -720,9 +682,9 @@ class SubOptMENS(object):
         print ("BEGINNING THE NLP SUBOPTIMIZATION")
 
         results = solve_until_feas_NLP(model)
-        model.pprint()
-        print(results)
-        print(model.TACeqn())
+        dump(model)
+        log_message(results)
+        log_message(model.TACeqn())
 
         if results == "Failed epically":
             print("The NLP suboptimization problem could not be solved")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Precomputed stage-wise (SWS) or stream-based (SBS) superstructure of the MENS models.
+
+The composition intervals of the SBS and the existence of every rich stream, lean stream and match
+in each stage only depend on the stream data. They are computed here once with NumPy, and the model
+builders of MENS reuse them for the NLP initialization and the MINLP of every iteration.
+
+@author: mchlshort
+"""
+from __future__ import division
+import numpy
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+class Superstructure(object):
+    def __init__(self, streams, superstruct = 'SBS', stages = None):
+        """Stages and existence masks of the superstructure.
+
+        Args:
+            streams (StreamData): precompiled stream data
+            superstruct (str, optional): either SBS or SWS. Default is SBS
+            stages (int, optional): number of stages of the SWS. Default is the larger of the number of rich and lean streams
+
+        The attributes are the stream names rich and lean, the stage numbers k (1 to nstages+1), nstages, the interval
+        compositions ck (SBS only, indexed by k) and the arrays r_exist (rich x k), l_exist (lean x k), ckr_first,
+        ckl_first and arex (rich x lean x k).
+        """
+        self.rich = list(streams.rich_Cin)
+        self.lean = list(streams.lean_Cin)
+        self.superstructure = superstruct
+        rich_Cin = numpy.array([streams.rich_Cin[i] for i in self.rich])
+        lean_Cin = numpy.array([streams.lean_Cin[j] for j in self.lean])
+
+        if superstruct == 'SBS':
+            #the interval boundaries are the distinct supply compositions of all the streams, in decreasing order
+            ck = numpy.unique(numpy.concatenate((rich_Cin, lean_Cin)))[::-1]
+            nk = len(ck)
+            self.nstages = nk - 1
+            self.ck = ck
+            boundary = numpy.arange(1, nk + 1) == nk
+            self.ckr_first = numpy.where(ck[None,:] == rich_Cin[:,None], ck[None,:], 0.0)
+            self.ckl_first = numpy.where(ck[None,:] == lean_Cin[:,None], ck[None,:], 0.0)
+            self.r_exist = (ck[None,:] <= rich_Cin[:,None]) & ~boundary[None,:]
+            #the lean streams exist in the first interval and in every interval above their supply composition
+            first = numpy.arange(1, nk + 1) == 1
+            self.l_exist = (first[None,:] | (ck[None,:] > lean_Cin[:,None])) & ~boundary[None,:]
+        elif superstruct == 'SWS':
+            if stages == None:
+                #if we do not have explicitly defined stages we just use Yee and Grossmann's heuristic
+                stages = max(len(self.lean), len(self.rich))
+            self.nstages = stages
+            self.ck = None
+            nk = stages + 1
+            boundary = numpy.arange(1, nk + 1) == nk
+            self.r_exist = numpy.tile(~boundary, (len(self.rich), 1))
+            self.l_exist = numpy.tile(~boundary, (len(self.lean), 1))
+            self.ckr_first = numpy.tile((numpy.arange(1, nk + 1) == 1).astype(float), (len(self.rich), 1))
+            self.ckl_first = numpy.tile(boundary.astype(float), (len(self.lean), 1))
+        else:
+            raise RuntimeError("Superstructure not SWS or SBS")
+        self.k = list(range(1, nk + 1))
+        self.arex = self.r_exist[:,None,:] & self.l_exist[None,:,:]
+        #dictionaries used to initialize the Pyomo parameters, built on first use
+        self._dicts = dict()
+
+    def as_dict(self, name):
+        """Returns one of the arrays of the superstructure as a dictionary keyed on the stream names and stages
+
+        The dictionaries are built once and shared by all the models, which copy them into their parameters.
+
+        Args:
+            name (str): ck (indexed by k), r_exist or ckr_first (indexed by (i,k)), l_exist or ckl_first
+                        (indexed by (j,k)), or arex (1 or 0 indexed by (i,j,k))
+
+        returns:
+            dict
+        """
+        if name not in self._dicts:
+            if name not in ('ck', 'r_exist', 'ckr_first', 'l_exist', 'ckl_first', 'arex'):
+                raise RuntimeError("unknown superstructure array " + str(name))
+            array = getattr(self, name)
+            if name == 'ck':
+                values = dict((k, float(array[n])) for n, k in enumerate(self.k))
+            elif name in ('r_exist', 'ckr_first'):
+                values = dict(((i, k), float(array[a, n])) for a, i in enumerate(self.rich) for n, k in enumerate(self.k))
+            elif name in ('l_exist', 'ckl_first'):
+                values = dict(((j, k), float(array[b, n])) for b, j in enumerate(self.lean) for n, k in enumerate(self.k))
+            elif name == 'arex':
+                values = dict(((i, j, k), int(array[a, b, n])) for a, i in enumerate(self.rich)
+                              for b, j in enumerate(self.lean) for n, k in enumerate(self.k))
+            self._dicts[name] = values
+        return self._dicts[name]
+
+    def matches(self):
+        """Returns the (i,j,k) of the matches that exist in the superstructure, in the order of the superstructure
+        """
+        return [(self.rich[a], self.lean[b], self.k[n]) for a, b, n in zip(*numpy.nonzero(self.arex))]
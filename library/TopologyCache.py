@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+In-run memoization of the evaluated networks of the hybrid strategy.
+
+The MINLP often returns a topology it has already returned in an earlier iteration. The real TAC
+and exchanger designs obtained for that network are stored here, keyed on the selected
+matches and a coarse signature of the stage compositions, so that the suboptimization and the
+exchanger solves of a revisit can be skipped. Only networks evaluated as the MINLP are stored, since the
+designs of a suboptimized network are sized for the suboptimization and not for the MINLP of a revisit.
+
+@author: mchlshort
+"""
+from __future__ import division
+from collections import OrderedDict
+from library.CacheKeys import round_to_tolerance
+from pyomo.environ import value
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+class TopologyCache(object):
+    def __init__(self, rel_tol = 1e-2, max_size = 64):
+        """Least recently used cache of evaluated networks keyed on the binary match vector.
+
+        Args:
+            rel_tol (float, optional): relative tolerance used to round the stage compositions in the key. Two networks
+                                        with the same matches whose compositions round to the same bins are treated
+                                        as the same network, see round_to_tolerance. Default is 1e-2
+            max_size (int, optional): maximum number of networks kept. Default is 64
+
+        """
+        if not isinstance(rel_tol, (int, float)) or rel_tol <= 0:
+            raise RuntimeError("rel_tol must be a positive number")
+        if not isinstance(max_size, int) or max_size < 1:
+            raise RuntimeError("max_size must be a positive integer")
+        self.rel_tol = rel_tol
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.revisits = dict()
+        self._networks = OrderedDict()
+
+    def make_key(self, MENS_model):
+        """Builds the cache key of a solved MINLP network.
+
+        Args:
+            MENS_model (pyomo model): solved MINLP model from MENS_MINLP
+
+        returns:
+            tuple: (y bitset, composition signature)
+        """
+        bits = 0
+        n = 0
+        for i in MENS_model.i:
+            for j in MENS_model.j:
+                for k in MENS_model.k:
+                    if value(MENS_model.y[i,j,k]) >= 0.99:
+                        bits |= 1 << n
+                    n += 1
+        signature = []
+        for index in MENS_model.cr:
+            signature.append(round_to_tolerance(value(MENS_model.cr[index]), self.rel_tol))
+        for index in MENS_model.cl:
+            signature.append(round_to_tolerance(value(MENS_model.cl[index]), self.rel_tol))
+        return (bits, tuple(signature))
+
+    def get(self, key):
+        """Returns the stored evaluation of a network, or None if it has not been evaluated yet.
+
+        Args:
+            key (tuple): key built with make_key
+
+        returns:
+            dict or None
+        """
+        if key in self._networks:
+            self._networks.move_to_end(key)
+            self.hits += 1
+            self.revisits[key[0]] = self.revisits.get(key[0], 0) + 1
+            return self._networks[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, evaluation):
+        """Stores the evaluation of a network.
+
+        Args:
+            key (tuple): key built with make_key
+            evaluation (dict): real TAC, costs and exchanger results of the network
+
+        returns:
+            None
+        """
+        self._networks[key] = evaluation
+        self._networks.move_to_end(key)
+        while len(self._networks) > self.max_size:
+            self._networks.popitem(last = False)
+
+    def report(self):
+        """Prints how often the MINLP revisited a topology that was already evaluated
+        """
+        print("Topology cache: ", self.hits, " revisits, ", self.misses, " new networks, ", len(self._networks), " stored")
+        for bits, count in sorted(self.revisits.items(), key = lambda item: -item[1]):
+            print("    topology ", bin(bits), " revisited ", count, " times")
+
+    def __len__(self):
+        return len(self._networks)
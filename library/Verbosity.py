@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Leveled output of the Pyomo component dumps.
+
+The values of the model components (heights, flows, concentrations, binaries and whole models),
+the solver results and the logs printed at the end of a run are written through the "MExNetS"
+logger at the DEBUG level. They are only formatted when that level is enabled, so in the quiet
+mode no time is spent building the text.
+
+@author: mchlshort
+"""
+from __future__ import division
+import logging
+import sys
+from io import StringIO
+
+__author__ = "Michael Short"
+__copyright__ = "Copyright 2020"
+__credits__ = ["Michael Short, Lorenz T. Biegler, Adeniyi J. Isafiade"]
+__license__ = "GPL-3"
+__version__ = "0.9"
+__maintainer__ =  "Michael Short"
+__email__ = "m.short@surrey.ac.uk"
+__status__ = "Development"
+
+verbosity_levels = {'quiet': logging.WARNING, 'info': logging.INFO, 'debug': logging.DEBUG}
+
+class _StdoutHandler(logging.StreamHandler):
+    """Stream handler that always writes to the current sys.stdout, so that the dumps follow the
+    examples when they redirect sys.stdout to a file after the library is imported.
+    """
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+logger = logging.getLogger("MExNetS")
+if not logger.handlers:
+    _handler = _StdoutHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.propagate = False
+    #the dumps are shown by default, as they were before the logger was added
+    logger.setLevel(logging.DEBUG)
+
+def set_verbosity(level):
+    """Sets the level of the MExNetS logger.
+
+    Args:
+        level (str or int): 'quiet' (no component dumps), 'info' or 'debug' (all the dumps), or a logging level
+
+    returns:
+        None
+    """
+    if isinstance(level, str):
+        if level not in verbosity_levels:
+            raise RuntimeError("verbosity must be 'quiet', 'info' or 'debug'")
+        level = verbosity_levels[level]
+    elif not isinstance(level, int):
+        raise RuntimeError("verbosity must be 'quiet', 'info', 'debug' or a logging level")
+    logger.setLevel(level)
+
+def get_verbosity():
+    """Returns the logging level of the MExNetS logger
+    """
+    return logger.level
+
+def dump(component, display = False, level = logging.DEBUG):
+    """Writes a Pyomo component (or model) to the log, formatting it only if the level is enabled.
+
+    Args:
+        component (Pyomo component or model): the component to be written
+        display (bool, optional): if True the display() output (values only) is written instead of pprint()
+        level (int, optional): logging level of the dump. Default is DEBUG
+
+    returns:
+        None
+    """
+    if not logger.isEnabledFor(level):
+        return
+    buffer = StringIO()
+    if display:
+        component.display(ostream = buffer)
+    else:
+        component.pprint(ostream = buffer)
+    logger.log(level, buffer.getvalue().rstrip("\n"))
+
+def log_message(*args, **kwargs):
+    """Writes the arguments to the log as print would, formatting them only if the level is enabled.
+
+    Args:
+        args: values to be written, separated by spaces
+        level (int, optional): logging level of the message. Default is DEBUG
+
+    returns:
+        None
+    """
+    level = kwargs.get('level', logging.DEBUG)
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, " ".join(str(arg) for arg in args))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the acceleration of the fixed-point iteration on the correction factors and of its safeguards
+
+@author: mchlshort
+"""
+from __future__ import division
+import pytest
+from library.HybridStrategy import HybridStrategy
+
+key = (0, 'kwcor')
+
+def G(x):
+    """A contraction with fixed point 1.2
+    """
+    return 1.2 + 0.5*(x - 1.2)
+
+def strategy(method, band = 0.1, memory = 3):
+    s = HybridStrategy()
+    s.cor_acceleration = method
+    s.cor_acceleration_memory = memory
+    s.cor_filter_size = band
+    return s
+
+def step(s, x, g = None, it = 0):
+    s.iter_count = it
+    if g == None:
+        g = G(x)
+    return s._accelerate_corrections({key: x}, {key: g})[key]
+
+def test_short_history_returns_the_filtered_update():
+    s = strategy('aitken')
+    assert step(s, 1.0) == G(1.0)
+    assert s.acceleration_log[0] == 'filtered'
+
+def test_aitken_reaches_the_fixed_point():
+    s = strategy('aitken')
+    x = 1.0
+    for it in range(2):
+        x = step(s, x, it = it)
+    assert s.acceleration_log[1] == 'filtered'
+    assert step(s, x, it = 2) == pytest.approx(1.2)
+    assert s.acceleration_log[2] == 'aitken'
+
+def test_anderson_reaches_the_fixed_point():
+    s = strategy('anderson')
+    x = step(s, 1.0, it = 0)
+    assert step(s, x, it = 1) == pytest.approx(1.2)
+    assert s.acceleration_log[1] == 'anderson'
+
+def test_growing_residual_resets_the_history():
+    s = strategy('anderson')
+    x = step(s, 1.0, it = 0)
+    #the residual grows from 0.1 to 0.3
+    assert step(s, x, g = x + 0.3, it = 1) == pytest.approx(x + 0.3)
+    assert len(s._cor_history) == 1
+    assert s.acceleration_log[1] == 'filtered'
+
+def test_anderson_step_outside_the_band_is_rejected():
+    #the accelerated value 1.2 is 9% above x = 1.1, outside a 5% band
+    s = strategy('anderson', band = 0.05)
+    x = step(s, 1.0, it = 0)
+    assert step(s, x, it = 1) == pytest.approx(G(x))
+    assert s.acceleration_log[1] == 'filtered'
+
+def test_aitken_falls_back_per_correction():
+    s = strategy('aitken', band = 0.1)
+    other = (1, 'diacor')
+    xs = {key: 1.0, other: 1.0}
+    for it, gs in enumerate([{key: 1.1, other: 1.0}, {key: 1.15, other: 1.05}, {key: 1.175, other: 1.06}]):
+        s.iter_count = it
+        result = s._accelerate_corrections(xs, gs)
+        xs = gs
+    #for 'diacor' the extrapolation 1.06 - 0.01**2/(-0.04) = 1.0625 is within the band, for 'kwcor' 1.2 as well
+    assert result[key] == pytest.approx(1.2)
+    assert result[other] == pytest.approx(1.0625)
+    #with a 2% band the 'kwcor' step (4% above x) keeps its filtered value and the 'diacor' step (1.2%) is accelerated
+    s = strategy('aitken', band = 0.02)
+    xs = {key: 1.0, other: 1.0}
+    for it, gs in enumerate([{key: 1.1, other: 1.0}, {key: 1.15, other: 1.05}, {key: 1.175, other: 1.06}]):
+        s.iter_count = it
+        result = s._accelerate_corrections(xs, gs)
+        xs = gs
+    assert result[key] == pytest.approx(1.175)
+    assert result[other] == pytest.approx(1.0625)
+
+def test_changed_corrections_reset_the_history():
+    s = strategy('anderson')
+    x = step(s, 1.0, it = 0)
+    s.iter_count = 1
+    result = s._accelerate_corrections({(5, 'kwcor'): x}, {(5, 'kwcor'): G(x)})
+    assert result[(5, 'kwcor')] == pytest.approx(G(x))
+    assert len(s._cor_history) == 1
+
+def test_non_positive_step_is_rejected():
+    s = strategy('aitken', band = 10)
+    #the residuals -1, -0.7, -0.25 decrease, and g = 1.0, 0.3, 0.05 extrapolates to 0.05 - 0.25**2/0.45 < 0
+    xs = 2.0
+    for it, g in enumerate([1.0, 0.3, 0.05]):
+        result = step(s, xs, g = g, it = it)
+        xs = g
+    assert len(s._cor_history) == 3
+    assert result == pytest.approx(0.05)
+
+def test_ill_conditioned_anderson_step_is_rejected():
+    s = strategy('anderson', band = 1)
+    #the residual hardly changes (0.1, then 0.09999), so the mixing coefficient is about -1e4
+    x = step(s, 1.0, g = 1.1, it = 0)
+    assert step(s, x, g = x + 0.09999, it = 1) == pytest.approx(x + 0.09999)
+    assert s.acceleration_log[1] == 'filtered'
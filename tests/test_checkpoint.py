@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the JSON encoding and the save/load round-trip of the checkpoints
+
+@author: mchlshort
+"""
+from __future__ import division
+import json
+import numpy
+import pytest
+from library.Checkpoint import _encode, _decode, save_checkpoint, load_checkpoint
+from library.HybridStrategy import HybridStrategy
+from library.MassExchanger import ExchangerResult
+
+def round_trip(obj):
+    return _decode(json.loads(json.dumps(_encode(obj))))
+
+def test_encode_decode_round_trip():
+    state = {(0, 'kwcor'): 1.05, (3, 'heightcor'): 0.97, 'name': 'Example1', 4: None, 'flag': True,
+             'cut': {('R1', 'L1', 2): 1, ('R2', 'L1', 1): 0}, 'history': [(1, 2.5), [3, 4.0]], 'nested': {1: {2: (3.0,)}}}
+    assert round_trip(state) == state
+
+def test_types_are_kept():
+    decoded = round_trip({'n': 3, 'x': numpy.float64(0.25), 't': (1, 'a'), 'b': False})
+    assert isinstance(decoded['n'], int)
+    assert isinstance(decoded['x'], float) and decoded['x'] == 0.25
+    assert decoded['t'] == (1, 'a')
+    assert decoded['b'] is False
+
+@pytest.mark.parametrize("array", [numpy.arange(6.0).reshape(2, 3), numpy.array([1.5]), numpy.zeros((0, 2))])
+def test_arrays(array):
+    decoded = round_trip({'history': [(array, array*2)]})
+    x, g = decoded['history'][0]
+    assert isinstance(x, numpy.ndarray)
+    assert x.shape == array.shape
+    numpy.testing.assert_array_equal(x, array)
+    numpy.testing.assert_array_equal(g, array*2)
+
+def test_save_and_load(tmp_path):
+    filename = str(tmp_path / "run.json")
+    strategy = HybridStrategy()
+    strategy.iter_count = 4
+    strategy.corrections = {(0, 'kwcor'): 1.1, (0, 'diacor'): 0.9}
+    strategy.binary_cuts = {2: {('R1', 'L1', 1): 1}}
+    strategy.best_objective_real = 12345.6
+    strategy.best_net_iter = 3
+    strategy.filter_bands = {(0, 'kwcor'): 0.1}
+    keys = sorted(strategy.corrections)
+    strategy._cor_history = [(keys, numpy.array([1.0, 1.0]), numpy.array([0.9, 1.1]))]
+    strategy.best_exchangers = {0: ExchangerResult(True, 0.2, 0.05, 0.3, 4.5, 1800.0, 450.0, nfe = 50), 1: None}
+    save_checkpoint(filename, strategy)
+
+    restored = HybridStrategy()
+    assert load_checkpoint(filename, restored) == 4
+    assert restored.corrections == strategy.corrections
+    assert restored.binary_cuts == strategy.binary_cuts
+    assert restored.best_objective_real == 12345.6
+    assert restored.filter_bands == strategy.filter_bands
+    #the restored acceleration history is used by the next update, as the keys compare equal
+    assert restored._cor_history[0][0] == keys
+    numpy.testing.assert_array_equal(restored._cor_history[0][2], strategy._cor_history[0][2])
+    restored.cor_filter_size = 0.5
+    restored._accelerate_corrections(restored.corrections, {(0, 'kwcor'): 1.12, (0, 'diacor'): 0.91})
+    assert len(restored._cor_history) == 2
+    assert restored.best_exchangers[1] is None
+    assert restored.best_exchangers[0].height == 4.5
+    assert restored.best_exchangers[0].nfe == 50
+    assert restored.best_network_MINLP is None
+
+def test_missing_checkpoint(tmp_path):
+    with pytest.raises(RuntimeError):
+        load_checkpoint(str(tmp_path / "missing.json"), HybridStrategy())
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the in-run memoization of the exchanger designs
+
+@author: mchlshort
+"""
+from __future__ import division
+import pytest
+from library.DesignCache import ExchangerDesignCache
+from library.MassExchanger import ExchangerResult
+
+def match_spec(i = 'R1', j = 'L1', scale = 1.0):
+    return {'i': i, 'j': j, 'k': 1, 'rich_in_side': {i: 0.07*scale, j: 0.001}, 'rich_out_side': {i: 0.02, j: 0.04},
+            'flowrates': {i: 0.9, j: 1.2}, 'me_inits': {'kw': 0.05, 'surfarea': 450.0, 'diameter': 0.3, 'packcost': 1800.0}}
+
+def design(height = 5.0, success = True):
+    return ExchangerResult(success, 0.2, 0.05, 0.3, height, 1800.0, 450.0)
+
+def test_miss_then_hit():
+    cache = ExchangerDesignCache()
+    assert cache.get(match_spec()) is None
+    stored = design()
+    cache.put(match_spec(), stored)
+    assert cache.get(match_spec()) is stored
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+def test_key_tolerance():
+    cache = ExchangerDesignCache(rel_tol = 1e-4)
+    cache.put(match_spec(), design())
+    #within the tolerance the design is shared, outside it is not
+    assert cache.get(match_spec(scale = 1 + 1e-7)) is not None
+    assert cache.get(match_spec(scale = 1.01)) is None
+    assert cache.get(match_spec(j = 'L2')) is None
+
+def test_failed_designs_are_not_stored():
+    cache = ExchangerDesignCache()
+    cache.put(match_spec(), design(success = False))
+    cache.put(match_spec(), None)
+    assert len(cache) == 0
+
+def test_least_recently_used_is_evicted():
+    cache = ExchangerDesignCache(max_size = 2)
+    specs = [match_spec(scale = s) for s in (1.0, 1.1, 1.2)]
+    cache.put(specs[0], design(1.0))
+    cache.put(specs[1], design(2.0))
+    #using the first design makes the second the least recently used
+    assert cache.get(specs[0]).height == 1.0
+    cache.put(specs[2], design(3.0))
+    assert len(cache) == 2
+    assert cache.get(specs[1]) is None
+    assert cache.get(specs[0]).height == 1.0
+    assert cache.get(specs[2]).height == 3.0
+
+@pytest.mark.parametrize("kwargs", [{'rel_tol': 0}, {'rel_tol': 'a'}, {'max_size': 0}, {'max_size': 1.5}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(RuntimeError):
+        ExchangerDesignCache(**kwargs)
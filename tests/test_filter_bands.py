@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the fixed and adaptive filters of the correction factors
+
+@author: mchlshort
+"""
+from __future__ import division
+import pytest
+from library.HybridStrategy import HybridStrategy
+
+key = (0, 'kwcor')
+
+def adaptive(size = 0.1, bounds = (0.025, 0.4)):
+    s = HybridStrategy()
+    s.cor_filter = 'adaptive'
+    s.cor_filter_size = size
+    s.cor_filter_bounds = bounds
+    return s
+
+def iterate(s, ic, raw, real_TAC):
+    """Runs the filter of one iteration on the unfiltered correction raw and returns the band used
+    """
+    band = s.filter_bands.get(key, s.cor_filter_size)
+    s._apply_cor_filter(raw, key)
+    s.solution_log[ic] = real_TAC
+    s._update_filter_bands(ic)
+    return band
+
+def test_fixed_filter_clips_to_the_band():
+    s = HybridStrategy()
+    s.cor_filter_size = 0.1
+    assert s._apply_cor_filter(1.5, key) == pytest.approx(1.1)
+    assert s._apply_cor_filter(0.5, key) == pytest.approx(0.9)
+    assert s._apply_cor_filter(1.05, key) == 1.05
+    assert s._raw_corrections == {}
+
+def test_band_widens_while_the_direction_holds_and_the_TAC_improves():
+    s = adaptive()
+    iterate(s, 0, 1.5, 100.0)
+    assert s.filter_bands[key] == pytest.approx(0.1)
+    iterate(s, 1, 1.5, 90.0)
+    assert s.filter_bands[key] == pytest.approx(0.15)
+    assert s._apply_cor_filter(1.5, key) == pytest.approx(1.15)
+    for ic in range(2, 10):
+        iterate(s, ic, 1.5, 90.0 - ic)
+    assert s.filter_bands[key] == pytest.approx(0.4)
+
+def test_band_is_kept_when_the_TAC_does_not_improve():
+    s = adaptive()
+    iterate(s, 0, 1.5, 100.0)
+    iterate(s, 1, 1.5, 110.0)
+    assert s.filter_bands[key] == pytest.approx(0.1)
+
+def test_band_narrows_when_the_correction_oscillates():
+    s = adaptive()
+    iterate(s, 0, 1.5, 100.0)
+    iterate(s, 1, 0.5, 90.0)
+    assert s.filter_bands[key] == pytest.approx(0.05)
+    for ic in range(2, 8):
+        iterate(s, ic, 1.5 if ic % 2 == 0 else 0.5, 90.0)
+    assert s.filter_bands[key] == pytest.approx(0.025)
+    assert s.cor_directions[key] == -1
+
+def test_unchanged_correction_keeps_the_band():
+    s = adaptive()
+    iterate(s, 0, 1.5, 100.0)
+    iterate(s, 1, 1.0, 90.0)
+    iterate(s, 2, 0.5, 80.0)
+    #a correction of exactly 1 has no direction, so neither step changes the band
+    assert s.filter_bands[key] == pytest.approx(0.1)
+
+def test_band_log_and_reset():
+    s = adaptive()
+    s._apply_cor_filter(1.5, key)
+    s._apply_cor_filter(0.5, (1, 'diacor'))
+    s.solution_log[0] = 100.0
+    s._update_filter_bands(0)
+    assert s.filter_band_log[0] == {'min': pytest.approx(0.1), 'mean': pytest.approx(0.1), 'max': pytest.approx(0.1)}
+    assert s._raw_corrections == {}
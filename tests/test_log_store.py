@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the SQLite store of the iteration logs
+
+@author: mchlshort
+"""
+from __future__ import division
+import numpy
+import pandas as pd
+import pytest
+from library.HybridStrategy import HybridStrategy
+from library.LogStore import IterationLogStore, read_runs, read_iterations, read_corrections, read_topology, export_csv, correction_names
+
+def logged_strategy(scale):
+    s = HybridStrategy()
+    for it in range(2):
+        s.MINLP_TAC_log[it] = 100.0*scale + it
+        s.solution_log[it] = 110.0*scale + it
+        s.capcost_log_MINLP[it] = 50.0
+        s.capcost_log_nlp[it] = 55.0
+        s.utility_cost[it] = 20.0
+        s.exchanger_log[it] = 2
+        s.failed_exchanger[it] = False
+        s.diff_NLP_MINLP_log[it] = 9.0
+        s.correction_log[it] = dict(((m, name), scale + 0.01*it + 0.1*m) for m in (0, 3) for name in correction_names)
+    #one correction of the second iteration is missing
+    del s.correction_log[1][3, 'surfAcor']
+    return s
+
+def write_run(filename, name, scale):
+    s = logged_strategy(scale)
+    store = IterationLogStore(filename, run_name = name)
+    for it in range(2):
+        store.log_iteration(s, it, topology = '1001' if it == 0 else '0101', seconds = 1.5)
+    store.close()
+    store.close()
+    return store.run_id
+
+def test_write_and_read(tmp_path):
+    filename = str(tmp_path / "logs.db")
+    first = write_run(filename, 'Example1', 1.0)
+    second = write_run(filename, 'Example2', 2.0)
+
+    runs = read_runs(filename)
+    assert list(runs['run_id']) == [first, second]
+    assert list(runs['name']) == ['Example1', 'Example2']
+
+    iterations = read_iterations(filename, [second])
+    assert list(iterations['iteration']) == [0, 1]
+    assert list(iterations['MINLP_TAC']) == [200.0, 201.0]
+    assert list(iterations['real_TAC']) == [220.0, 221.0]
+    assert list(iterations['failed']) == [0.0, 0.0]
+    assert list(iterations['seconds']) == [1.5, 1.5]
+    assert len(read_iterations(filename)) == 4
+
+    topology = read_topology(filename, [first])
+    assert list(topology['y']) == ['1001', '0101']
+
+def test_corrections_across_runs(tmp_path):
+    filename = str(tmp_path / "logs.db")
+    first = write_run(filename, 'Example1', 1.0)
+    second = write_run(filename, 'Example2', 2.0)
+    rows, matches, array = read_corrections(filename)
+    assert list(zip(rows['run_id'], rows['iteration'])) == [(first, 0), (first, 1), (second, 0), (second, 1)]
+    assert matches == [0, 3]
+    assert array.shape == (4, 2, len(correction_names))
+    assert array[3, 1, correction_names.index('kwcor')] == pytest.approx(2.0 + 0.01 + 0.3)
+    assert numpy.isnan(array[1, 1, correction_names.index('surfAcor')])
+    rows, matches, array = read_corrections(filename, [first])
+    assert list(rows['run_id']) == [first, first]
+    assert array[0, 0, 0] == pytest.approx(1.0)
+
+def test_export_csv(tmp_path, monkeypatch):
+    filename = str(tmp_path / "logs.db")
+    run_id = write_run(filename, 'Example1', 1.0)
+    monkeypatch.chdir(tmp_path)
+    export_csv(filename, run_id, 'Ex1')
+    solution = pd.read_csv(tmp_path / 'solution_logEx1.csv', index_col = 0)
+    assert list(solution['0']) == [110.0, 111.0]
+    #the (match, correction) columns are written as two header rows, as write_to_csv does with the correction log
+    corrections = pd.read_csv(tmp_path / 'correction_logEx1.csv', index_col = 0, header = [0, 1])
+    assert list(corrections.index) == [0, 1]
+    assert corrections.shape[1] == 2*len(correction_names)
+    assert corrections.loc[1, ('3', 'kwcor')] == pytest.approx(1.31)
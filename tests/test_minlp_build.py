@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the MINLP built from the NLP initialization
+
+@author: mchlshort
+"""
+from __future__ import division
+import os
+import pytest
+from pyomo.core.expr.visitor import identify_variables
+from library.MENS_MINLP import MENS, read_stream_data
+
+dataDirectory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example_data')
+
+def example1():
+    rich, lean, parameters, properties = [read_stream_data(os.path.join(dataDirectory, f)) for f in
+                                          ('Rich_Ex_1.csv', 'Lean_Ex_1.csv', 'problem_parameters.csv', 'stream_properties.csv')]
+    return MENS(rich, lean, parameters, properties, stages = 2, superstruct = 'SWS')
+
+def uses_lean_flow(model, index):
+    return any(var.parent_component() is model.L1 for var in identify_variables(model.Log_M_RPS_LPS[index].body))
+
+@pytest.mark.parametrize("L1, lean_bound", [(0.5, True), (1.5862, False)])
+def test_big_m_of_the_mass_exchanged_follows_the_nlp_flowrates(L1, lean_bound):
+    mens = example1()
+    nlp = mens._build_model()
+    nlp.L['L1'].value = L1
+    minlp = mens._build_model(nlp = nlp, arex = dict(nlp.arex))
+    #R1 exchanges 0.9*(0.07 - 0.0003) = 0.0627, L1 can take L1*(0.04495 - 0.00087), so with L1 = 0.5 the lean side
+    #is the smaller bound, as in the MINLP built from the solved NLP flowrates
+    assert minlp.L1['L1'].value == L1
+    assert uses_lean_flow(minlp, ('R1', 'L1', 1)) == lean_bound
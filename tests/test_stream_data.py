@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of StreamData against the pandas .at lookups the constraint rules used before
+
+@author: mchlshort
+"""
+from __future__ import division
+import os
+import pytest
+from library.MENS_MINLP import read_stream_data
+from library.StreamData import StreamData
+
+dataDirectory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example_data')
+
+def example(rich_file, lean_file):
+    return read_stream_data(os.path.join(dataDirectory, rich_file)), read_stream_data(os.path.join(dataDirectory, lean_file))
+
+cases = [example('Rich_Ex_1.csv', 'Lean_Ex_1.csv'), example('Rich_Ex_2.csv', 'Lean_Ex_2.csv')]
+
+@pytest.mark.parametrize("rich, lean", cases)
+def test_stream_data_matches_dataframes(rich, lean):
+    streams = StreamData(rich, lean)
+    for i in rich.index:
+        assert streams.rich_F[i] == rich.at[i,'F']
+        assert streams.rich_Cin[i] == rich.at[i,'Cin']
+        assert streams.rich_Cout[i] == rich.at[i,'Cout']
+        assert streams.rich_dC[i] == rich.at[i,'Cin'] - rich.at[i,'Cout']
+        assert streams.rich_load[i] == rich.at[i,'F']*(rich.at[i,'Cin'] - rich.at[i,'Cout'])
+    for j in lean.index:
+        assert streams.lean_F[j] == lean.at[j,'F']
+        assert streams.lean_Cin[j] == lean.at[j,'Cin']
+        assert streams.lean_Cout[j] == lean.at[j,'Cout']
+        assert streams.lean_dC[j] == lean.at[j,'Cout'] - lean.at[j,'Cin']
+
+def test_stream_data_is_independent_of_the_dataframes():
+    rich, lean = cases[0]
+    rich = rich.copy()
+    streams = StreamData(rich, lean)
+    F = streams.rich_F['R1']
+    rich.at['R1','F'] = 2*F
+    assert streams.rich_F['R1'] == F
+    assert isinstance(streams.lean_Cin['L1'], float)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of Superstructure against the pandas loops the models used before they were precompiled
+
+@author: mchlshort
+"""
+from __future__ import division
+import os
+import pandas as pd
+import pytest
+from library.MENS_MINLP import read_stream_data
+from library.StreamData import StreamData
+from library.Superstructure import Superstructure
+
+dataDirectory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example_data')
+
+def example(rich_file, lean_file):
+    return read_stream_data(os.path.join(dataDirectory, rich_file)), read_stream_data(os.path.join(dataDirectory, lean_file))
+
+def repeated_compositions():
+    #a rich and a lean stream share a supply composition, and two lean streams share another
+    rich = pd.DataFrame({'Cin': [0.05, 0.03], 'Cout': [0.001, 0.002], 'F': [1.0, 2.0]}, index = ['R1', 'R2'])
+    lean = pd.DataFrame({'Cin': [0.03, 0.001, 0.001], 'Cout': [0.06, 0.04, 0.02], 'F': [1.0, 0.5, 3.0]}, index = ['L1', 'L2', 'L3'])
+    return rich, lean
+
+cases = [example('Rich_Ex_1.csv', 'Lean_Ex_1.csv'), example('Rich_Ex_2.csv', 'Lean_Ex_2.csv'), repeated_compositions()]
+
+def baseline_sbs(rich, lean):
+    """The SBS superstructure as it was built from the DataFrames in _build_NLP_model
+    """
+    supply = []
+    for i in rich.index:
+        if rich.at[i,'Cin'] not in supply:
+            supply.append(rich.at[i,'Cin'])
+    for j in lean.index:
+        if lean.at[j,'Cin'] not in supply:
+            supply.append(lean.at[j,'Cin'])
+    vals = sorted(supply, reverse = True)
+    ck = dict((k + 1, v) for k, v in enumerate(vals))
+    nstages = len(ck) - 1
+    ckr_first = dict(((i, k), ck[k] if ck[k] == rich.at[i,'Cin'] else 0.0) for i in rich.index for k in ck)
+    ckl_first = dict(((j, k), ck[k] if ck[k] == lean.at[j,'Cin'] else 0.0) for j in lean.index for k in ck)
+    r_exist = dict()
+    for i in rich.index:
+        for k in ck:
+            if k == nstages + 1:
+                r_exist[i,k] = 0
+            elif ck[k] <= rich.at[i,'Cin']:
+                r_exist[i,k] = 1
+            else:
+                r_exist[i,k] = 0
+    l_exist = dict()
+    for j in lean.index:
+        for k in ck:
+            l_exist[j,k] = 0
+            if k == nstages + 1:
+                l_exist[j,k] = 0
+            elif k == 1:
+                l_exist[j,k] = 1
+            elif ck[k] == lean.at[j,'Cin']:
+                l_exist[j,k] = 0
+            elif ck[k] >= lean.at[j,'Cin']:
+                l_exist[j,k] = 1
+    arex = dict(((i, j, k), 1 if l_exist[j,k] == 1 and r_exist[i,k] == 1 else 0) for i in rich.index for j in lean.index for k in ck)
+    return {'nstages': nstages, 'ck': ck, 'ckr_first': ckr_first, 'ckl_first': ckl_first, 'r_exist': r_exist,
+            'l_exist': l_exist, 'arex': arex}
+
+def baseline_sws(rich, lean, stages):
+    """The SWS superstructure as it was built in _build_NLP_model
+    """
+    ks = range(1, stages + 2)
+    return {'r_exist': dict(((i, k), 1 if k != stages + 1 else 0) for i in rich.index for k in ks),
+            'l_exist': dict(((j, k), 1 if k != stages + 1 else 0) for j in lean.index for k in ks),
+            'ckr_first': dict(((i, k), 1 if k == 1 else 0) for i in rich.index for k in ks),
+            'ckl_first': dict(((j, k), 1 if k == stages + 1 else 0) for j in lean.index for k in ks),
+            'arex': dict(((i, j, k), 1 if k != stages + 1 else 0) for i in rich.index for j in lean.index for k in ks)}
+
+@pytest.mark.parametrize("rich, lean", cases)
+def test_sbs_masks_match_baseline(rich, lean):
+    expected = baseline_sbs(rich, lean)
+    superstructure = Superstructure(StreamData(rich, lean), 'SBS')
+    assert superstructure.nstages == expected['nstages']
+    assert superstructure.k == list(expected['ck'])
+    for name in ['ck', 'ckr_first', 'ckl_first', 'r_exist', 'l_exist', 'arex']:
+        assert superstructure.as_dict(name) == expected[name], name
+    assert superstructure.matches() == [index for index, v in expected['arex'].items() if v == 1]
+
+@pytest.mark.parametrize("rich, lean", cases)
+@pytest.mark.parametrize("stages", [None, 1, 4])
+def test_sws_masks_match_baseline(rich, lean, stages):
+    superstructure = Superstructure(StreamData(rich, lean), 'SWS', stages = stages)
+    if stages == None:
+        stages = max(len(rich.index), len(lean.index))
+    expected = baseline_sws(rich, lean, stages)
+    assert superstructure.nstages == stages
+    assert superstructure.k == list(range(1, stages + 2))
+    for name in ['ckr_first', 'ckl_first', 'r_exist', 'l_exist', 'arex']:
+        assert superstructure.as_dict(name) == expected[name], name
+
+def test_unknown_superstructure():
+    rich, lean = repeated_compositions()
+    with pytest.raises(RuntimeError):
+        Superstructure(StreamData(rich, lean), 'XYZ')
+    with pytest.raises(RuntimeError):
+        Superstructure(StreamData(rich, lean), 'SBS').as_dict('height')
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the big-M of the logical constraints computed by MENS.tight_omega
+
+@author: mchlshort
+"""
+from __future__ import division
+import os
+import pytest
+from pyomo.environ import value
+from library.MENS_MINLP import MENS, read_stream_data
+
+dataDirectory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example_data')
+
+examples = [('Rich_Ex_1.csv', 'Lean_Ex_1.csv', 'problem_parameters.csv', 'stream_properties.csv'),
+            ('Rich_Ex_2.csv', 'Lean_Ex_2.csv', 'problem_parameters2.csv', 'stream_properties2.csv')]
+
+def build_mens(files, **kwargs):
+    rich, lean, parameters, properties = [read_stream_data(os.path.join(dataDirectory, f)) for f in files]
+    return MENS(rich, lean, parameters, properties, **kwargs), rich, lean
+
+def feasible(omega, dc_lo, dc_hi, cr, cl):
+    """True if some dcin in [dc_lo, dc_hi] satisfies the logical constraints with y = 0
+    """
+    return max(cr - cl - omega, dc_lo) <= min(cr - cl + omega, dc_hi)
+
+@pytest.mark.parametrize("files", examples)
+def test_tight_omega_is_valid_and_smallest(files):
+    mens, rich, lean = build_mens(files)
+    EMAC = mens.get_parameter('EMAC')
+    omega = mens.tight_omega()
+    assert set(omega) == set((i, j) for i in rich.index for j in lean.index)
+    for (i, j), om in omega.items():
+        assert om >= 0
+        corners = [(cr, cl) for cr in (rich.at[i,'Cout'], rich.at[i,'Cin']) for cl in (lean.at[j,'Cin'], lean.at[j,'Cout'])]
+        #the constraints are linear in cr and cl, so no composition within the bounds is cut off if no corner is
+        for cr, cl in corners:
+            assert feasible(om + 1e-15, EMAC, 1.0, cr, cl)
+        if om > 0:
+            assert not all(feasible(om*(1 - 1e-6), EMAC, 1.0, cr, cl) for cr, cl in corners)
+
+def test_tight_omega_example1():
+    mens, rich, lean = build_mens(examples[0])
+    omega = mens.tight_omega()
+    #R1 leaves at 0.0003 and L1 at 0.04495, so cr - cl can be as low as 0.0003 - 0.04495 and dcin >= EMAC needs
+    #omega >= EMAC - (0.0003 - 0.04495)
+    assert omega['R1','L1'] == pytest.approx(1e-9 - (0.0003 - lean.at['L1','Cout']))
+    for (i, j), om in omega.items():
+        assert om == pytest.approx(max(1e-9 - (rich.at[i,'Cout'] - lean.at[j,'Cout']), rich.at[i,'Cin'] - lean.at[j,'Cin'] - 1, 0.0))
+
+def test_tight_omega_is_cached():
+    mens, rich, lean = build_mens(examples[0])
+    assert mens.tight_omega() is mens.tight_omega()
+
+def test_auto_omega_sets_the_model_omega():
+    mens, rich, lean = build_mens(examples[0], stages = 2, superstruct = 'SWS', auto_omega = True)
+    model = mens._build_model()
+    omega = mens.tight_omega()
+    for i in model.i:
+        for j in model.j:
+            assert value(model.omega[i,j]) == pytest.approx(omega[i,j])
+    plain, rich, lean = build_mens(examples[0], stages = 2, superstruct = 'SWS')
+    model = plain._build_model()
+    for index in model.omega:
+        assert value(model.omega[index]) == plain.get_parameter('omega')
+
+def test_get_parameter():
+    mens, rich, lean = build_mens(examples[0])
+    assert mens.get_parameter('EMAC') == 1e-9
+    with pytest.raises(RuntimeError):
+        mens.get_parameter('not_a_parameter')
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the in-run memoization of the evaluated networks and of the shared key rounding
+
+@author: mchlshort
+"""
+from __future__ import division
+import pytest
+from pyomo.environ import ConcreteModel, Set, RangeSet, Var, Binary
+from library.CacheKeys import round_to_tolerance
+from library.TopologyCache import TopologyCache
+
+def network(selected, cr = 0.05, cl = 0.01):
+    """A solved network reduced to the components used in the key: one rich, two lean streams and two stages
+    """
+    m = ConcreteModel()
+    m.i = Set(initialize = ['R1'])
+    m.j = Set(initialize = ['L1', 'L2'])
+    m.k = RangeSet(2)
+    m.y = Var(m.i, m.j, m.k, within = Binary, initialize = 0)
+    m.cr = Var(m.i, m.k, initialize = cr)
+    m.cl = Var(m.j, m.k, initialize = cl)
+    for index in selected:
+        m.y[index] = 1
+    return m
+
+def test_round_to_tolerance():
+    assert round_to_tolerance(0, 1e-2) == (0, 0)
+    assert round_to_tolerance(0.0123, 1e-2) == round_to_tolerance(0.01231, 1e-2)
+    assert round_to_tolerance(0.0123, 1e-2) != round_to_tolerance(0.0125, 1e-2)
+    assert round_to_tolerance(-0.5, 1e-2) == (-1, round_to_tolerance(0.5, 1e-2)[1])
+    assert round_to_tolerance(0.5, 1e-2)[0] == 1
+    #a decade boundary does not split the values next to it
+    assert round_to_tolerance(0.99999, 1e-3) == round_to_tolerance(1.00001, 1e-3) == (1, 0)
+    assert round_to_tolerance(9.9999e-3, 1e-3) == round_to_tolerance(1.00001e-2, 1e-3)
+
+def test_key_depends_on_matches_and_compositions():
+    cache = TopologyCache(rel_tol = 1e-2)
+    key = cache.make_key(network([('R1','L1',1)]))
+    assert key == cache.make_key(network([('R1','L1',1)], cr = 0.05*(1 + 1e-5)))
+    assert key != cache.make_key(network([('R1','L2',1)]))
+    assert key != cache.make_key(network([('R1','L1',1)], cl = 0.02))
+    assert key[0] == 1
+
+def test_hit_miss_and_revisits():
+    cache = TopologyCache()
+    key = cache.make_key(network([('R1','L1',1), ('R1','L2',2)]))
+    assert cache.get(key) is None
+    evaluation = {'iteration': 0, 'real_TAC': 1.0}
+    cache.put(key, evaluation)
+    assert cache.get(key) is evaluation
+    assert cache.get(key) is evaluation
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 1)
+    assert cache.revisits == {key[0]: 2}
+
+def test_least_recently_used_is_evicted():
+    cache = TopologyCache(max_size = 2)
+    keys = [cache.make_key(network(selected)) for selected in ([('R1','L1',1)], [('R1','L2',1)], [('R1','L1',2)])]
+    for n, key in enumerate(keys[:2]):
+        cache.put(key, {'iteration': n})
+    cache.get(keys[0])
+    cache.put(keys[2], {'iteration': 2})
+    assert len(cache) == 2
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0])['iteration'] == 0
+
+@pytest.mark.parametrize("kwargs", [{'rel_tol': -1}, {'max_size': 0}])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(RuntimeError):
+        TopologyCache(**kwargs)
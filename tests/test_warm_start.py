@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the interpolation of a stored exchanger solve onto the grid of a new exchanger model
+
+@author: mchlshort
+"""
+from __future__ import division
+import numpy as np
+import pytest
+from library.MassExchanger import mass_exchanger, radau_points
+
+def grid(nfe, ncp = 3):
+    tau = radau_points[ncp]
+    return np.array([0.0] + [(ii - 1 + tau[jj - 1])/nfe for ii in range(1, nfe + 1) for jj in range(1, ncp + 1)])
+
+def stored_solve(nfe = 4, rich = (0.07, 0.01), lean = (0.04, 0.001), FlowRm = 0.9, flux = -0.02, height = 6.0):
+    """Warm start of a solve with linear concentration profiles and a uniform flux, in the format of extract_warm_start
+    """
+    position = grid(nfe)
+    return {"position": position, "cR": rich[0] + (rich[1] - rich[0])*position, "cL": lean[0] + (lean[1] - lean[0])*position,
+            "flux": np.full(len(position) - 1, flux), "rich_in": rich[0], "rich_out": rich[1], "lean_in": lean[0],
+            "lean_out": lean[1], "FlowRm": FlowRm, "design": {"height": height}}
+
+def exchanger(warm_start, nfe = 10, rich = (0.07, 0.01), lean = (0.04, 0.001), flows = (0.9, 1.5)):
+    return mass_exchanger('R1', 'L1', {'R1': rich[0], 'L1': lean[0]}, {'R1': rich[1], 'L1': lean[1]},
+                          {'R1': flows[0], 'L1': flows[1]}, {}, None, ncp = 3, nfe = nfe, warm_start = warm_start)
+
+def test_same_conditions_reproduce_the_profiles():
+    ws = stored_solve()
+    inits = exchanger(ws, nfe = 4)._interpolate_warm_start()
+    points = [(ii, jj) for ii in range(1, 5) for jj in range(1, 4)]
+    assert [inits["cRs"][p] for p in points] == pytest.approx(list(ws["cR"][1:]))
+    assert [inits["cLs"][p] for p in points] == pytest.approx(list(ws["cL"][1:]))
+    assert [inits["flux"][p] for p in points] == pytest.approx(list(ws["flux"]))
+    assert inits["cR0"][1] == pytest.approx(0.07)
+    assert inits["h0"][1] == 0
+
+def test_profiles_are_rescaled_to_the_new_boundaries():
+    ws = stored_solve()
+    rich = (0.05, 0.02)
+    lean = (0.03, 0.002)
+    flows = (1.2, 2.0)
+    inits = exchanger(ws, nfe = 10, rich = rich, lean = lean, flows = flows)._interpolate_warm_start()
+    positions = grid(10)
+    n = 1
+    for ii in range(1, 11):
+        assert inits["cR0"][ii] == pytest.approx(rich[0] + (rich[1] - rich[0])*(ii - 1)/10)
+        assert inits["h0"][ii] == pytest.approx(6.0*(ii - 1)/10)
+        for jj in range(1, 4):
+            assert inits["cRs"][ii,jj] == pytest.approx(rich[0] + (rich[1] - rich[0])*positions[n])
+            assert inits["cLs"][ii,jj] == pytest.approx(lean[0] + (lean[1] - lean[0])*positions[n])
+            assert inits["hs"][ii,jj] == pytest.approx(6.0*positions[n])
+            n += 1
+    #the flux is scaled with the mass exchanged, 1.2*0.03 against 0.9*0.06
+    scale = (1.2*0.03)/(0.9*0.06)
+    assert inits["flux"][5,2] == pytest.approx(-0.02*scale)
+    assert inits["cdotR"][5,2] == pytest.approx(-0.02*scale/1.2)
+    assert inits["cdotL"][5,2] == pytest.approx(-0.02*scale/2.0)
+    assert len(inits["cRs"]) == 30
+
+def test_values_are_clipped():
+    ws = stored_solve(flux = 0.01)
+    ws["cL"] = ws["cL"] - 0.05
+    inits = exchanger(ws, nfe = 4)._interpolate_warm_start()
+    assert min(inits["cLs"].values()) == 0
+    assert min(inits["cL0"].values()) == 0
+    assert max(inits["flux"].values()) == 0
+
+def test_constant_profile_is_shifted():
+    ws = stored_solve(lean = (0.01, 0.01))
+    ws["cL"] = ws["cL"] + 0.001*np.sin(np.pi*ws["position"])
+    inits = exchanger(ws, nfe = 4, lean = (0.02, 0.001))._interpolate_warm_start()
+    #without a change over the stored profile the shape is kept and moved to the new inlet value
+    assert inits["cL0"][1] == pytest.approx(0.02)
+    assert inits["cLs"][2,3] == pytest.approx(0.02 + 0.001*np.sin(np.pi*0.5))